@@ -25,6 +25,9 @@ class BaseAgent(abc.ABC):
         self.index = index
         self.kwargs = kwargs
 
+        # Set by the game before each call into the agent, see getMoveDeadline().
+        self._moveDeadline = None
+
     @abc.abstractmethod
     def getAction(self, state):
         """
@@ -34,6 +37,19 @@ class BaseAgent(abc.ABC):
 
         pass
 
+    def getMoveDeadline(self):
+        """
+        Get the time (in the same terms as `time.time()`) by which the current
+        `BaseAgent.getAction` (or `BaseAgent.registerInitialState`) call should return,
+        or None if no game has set one.
+        Taking longer than this counts against the agent when a game enforces timeouts.
+        """
+
+        return self._moveDeadline
+
+    def setMoveDeadline(self, deadline):
+        self._moveDeadline = deadline
+
     def registerInitialState(self, state):
         """
         Inspect the starting state.
@@ -13,6 +13,10 @@ class ReflexCaptureAgent(CaptureAgent):
     def __init__(self, index, **kwargs):
         super().__init__(index, **kwargs)
 
+        # The successors of the state currently being evaluated, keyed by action.
+        self._successorsState = None
+        self._successors = {}
+
     def chooseAction(self, gameState):
         """
         Picks among the actions with the highest return from `ReflexCaptureAgent.evaluate`.
@@ -21,9 +25,17 @@ class ReflexCaptureAgent(CaptureAgent):
         actions = gameState.getLegalActions(self.index)
 
         start = time.time()
+
+        # Generate all the successors at once, `ReflexCaptureAgent.getSuccessor` will use them.
+        self._successorsState = gameState
+        self._successors = dict(gameState.generateSuccessors(self.index, actions))
+
         values = [self.evaluate(gameState, a) for a in actions]
         logging.debug('evaluate() time for agent %d: %.4f' % (self.index, time.time() - start))
 
+        self._successorsState = None
+        self._successors = {}
+
         maxValue = max(values)
         bestActions = [a for a, v in zip(actions, values) if v == maxValue]
 
@@ -34,7 +46,11 @@ class ReflexCaptureAgent(CaptureAgent):
         Finds the next successor which is a grid position (location tuple).
         """
 
-        successor = gameState.generateSuccessor(self.index, action)
+        if (gameState is self._successorsState and action in self._successors):
+            successor = self._successors[action]
+        else:
+            successor = gameState.generateSuccessor(self.index, action)
+
         pos = successor.getAgentState(self.index).getPosition()
 
         if (pos != util.nearestPoint(pos)):
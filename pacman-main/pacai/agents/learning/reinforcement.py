@@ -27,7 +27,7 @@ class ReinforcementAgent(ValueEstimationAgent):
         super().__init__(index, **kwargs)
 
         if (actionFn is None):
-            actionFn = lambda state: state.getLegalActions()
+            actionFn = _getLegalActions
 
         self.actionFn = actionFn
         self.episodesSoFar = 0
@@ -181,3 +181,11 @@ class ReinforcementAgent(ValueEstimationAgent):
         if (self.episodesSoFar == self.numTraining):
             msg = 'Training Done (turning off epsilon and alpha)'
             logging.debug('%s\n%s' % (msg, '-' * len(msg)))
+
+def _getLegalActions(state):
+    """
+    The default action function.
+    This is a module-level function (instead of a lambda) so agents stay picklable.
+    """
+
+    return state.getLegalActions()
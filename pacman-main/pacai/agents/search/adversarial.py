@@ -0,0 +1,324 @@
+"""
+A reusable adversarial (minimax, alpha-beta, expectimax) search engine
+backed by a transposition table.
+"""
+
+import collections
+import logging
+import time
+
+from pacai.agents.search.multiagent import MultiAgentSearchAgent
+
+MODE_MINIMAX = 'minimax'
+MODE_ALPHA_BETA = 'alphabeta'
+MODE_EXPECTIMAX = 'expectimax'
+MODES = [MODE_MINIMAX, MODE_ALPHA_BETA, MODE_EXPECTIMAX]
+
+DEFAULT_TABLE_SIZE = 50000
+
+# Check the deadline every this many (power of two) nodes.
+DEADLINE_CHECK_INTERVAL = 256
+
+# How a stored value relates to the true value of a state (alpha-beta only stores bounds).
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+class TranspositionTable(object):
+    """
+    A bounded map from (state, agent to move) to a search result:
+    (depth searched, value, bound type, best action).
+
+    When the table is full, the least recently used entry is evicted.
+    When a result for the same key is stored twice,
+    the one that came from the deeper search is kept,
+    unless only the newer one is an exact value (and not just a bound).
+    """
+
+    def __init__(self, capacity = DEFAULT_TABLE_SIZE):
+        self._capacity = int(capacity)
+        self._entries = collections.OrderedDict()
+
+    def clear(self):
+        self._entries.clear()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if (entry is not None):
+            self._entries.move_to_end(key)
+
+        return entry
+
+    def put(self, key, depth, value, bound, action):
+        oldEntry = self._entries.get(key)
+        if (oldEntry is not None and oldEntry[0] > depth
+                and (oldEntry[2] == EXACT or bound != EXACT)):
+            # Depth-preferred, keep the deeper result.
+            self._entries.move_to_end(key)
+            return
+
+        self._entries[key] = (depth, value, bound, action)
+        self._entries.move_to_end(key)
+
+        if (len(self._entries) > self._capacity):
+            self._entries.popitem(last = False)
+
+    def __len__(self):
+        return len(self._entries)
+
+class AdversarialSearch(object):
+    """
+    An iterative deepening adversarial search over a `pacai.core.gamestate.AbstractGameState`.
+
+    Depth is measured in plies, where one ply is every agent moving once.
+    Agents in `maximizers` pick the move with the highest value.
+    All other agents pick the lowest value (minimax and alpha-beta)
+    or choose uniformly at random (expectimax).
+
+    Each iteration searches one ply deeper than the last,
+    and tries the best moves found by the previous iterations (kept in the transposition table) first.
+    With alpha-beta, this ordering is what makes the deeper iterations cheap.
+
+    A search may also be given a deadline,
+    in which case an unfinished iteration is abandoned at the deadline
+    and the result of the deepest finished iteration is used.
+    """
+
+    def __init__(self, evaluationFunction, mode = MODE_ALPHA_BETA,
+            tableSize = DEFAULT_TABLE_SIZE):
+        if (mode not in MODES):
+            raise ValueError("Unknown search mode '%s', expected one of: %s." % (mode, MODES))
+
+        self._evaluationFunction = evaluationFunction
+        self._mode = mode
+        self._table = TranspositionTable(tableSize)
+
+        self._maximizers = set()
+        self._deadline = None
+
+        # Set when the current iteration stopped short of a terminal state somewhere.
+        self._depthLimited = False
+
+        # Instrumentation, reset on every search.
+        self._numNodes = 0
+        self._numTableHits = 0
+        self._completedDepth = 0
+
+    def getCompletedDepth(self):
+        """
+        Get the deepest iteration finished by the last search.
+        """
+
+        return self._completedDepth
+
+    def getNodeCount(self):
+        """
+        Get the number of states visited by the last search.
+        """
+
+        return self._numNodes
+
+    def getTable(self):
+        return self._table
+
+    def getTableHits(self):
+        """
+        Get the number of times the last search reused a stored value instead of searching.
+        """
+
+        return self._numTableHits
+
+    def search(self, state, agentIndex, depth, maximizers = None, deadline = None):
+        """
+        Search from the state (with agentIndex to move) up to the given depth.
+        Returns the best (value, action) for agentIndex.
+        If maximizers is not supplied, only agentIndex maximizes.
+
+        If a deadline (in the same terms as `time.time()`) is supplied,
+        then the search stops at the deadline (the first iteration always finishes).
+        If the depth is None, then the search keeps deepening until the deadline
+        or until a deeper search could not change the result.
+        """
+
+        if (depth is None and deadline is None):
+            raise ValueError('A search needs a depth, a deadline, or both.')
+
+        if (maximizers is None):
+            maximizers = [agentIndex]
+
+        self._maximizers = set(maximizers)
+        self._numNodes = 0
+        self._numTableHits = 0
+        self._completedDepth = 0
+
+        startTime = time.time()
+
+        result = (self._evaluationFunction(state), None)
+        iterationDepth = 0
+
+        while (depth is None or iterationDepth < int(depth)):
+            iterationDepth += 1
+
+            self._depthLimited = False
+            self._deadline = None
+            if (iterationDepth > 1):
+                self._deadline = deadline
+
+            try:
+                result = self._searchRoot(state, agentIndex, iterationDepth)
+            except _SearchTimeout:
+                break
+
+            self._completedDepth = iterationDepth
+
+            # Every line of play ended before the depth limit, so searching deeper is pointless.
+            if (not self._depthLimited):
+                break
+
+            if (deadline is not None and time.time() >= deadline):
+                break
+
+        self._deadline = None
+
+        logging.debug('Searched to depth %d: %d nodes, %d table hits, %d entries, %.3f seconds.' %
+                (self._completedDepth, self._numNodes, self._numTableHits, len(self._table),
+                time.time() - startTime))
+
+        return result
+
+    def _searchRoot(self, state, agentIndex, depth):
+        remaining = depth * state.getNumAgents()
+        return self._value(state, agentIndex, remaining, float('-inf'), float('inf'))
+
+    def _value(self, state, agentIndex, remaining, alpha, beta):
+        """
+        Get the (value, best action) of a state with agentIndex to move
+        and `remaining` agent moves left.
+        The action is None when the state was not expanded (or no single move is best).
+        """
+
+        self._numNodes += 1
+
+        if (self._deadline is not None
+                and self._numNodes % DEADLINE_CHECK_INTERVAL == 0
+                and time.time() >= self._deadline):
+            raise _SearchTimeout()
+
+        if (state.isOver()):
+            return (self._evaluationFunction(state), None)
+
+        if (remaining <= 0):
+            self._depthLimited = True
+            return (self._evaluationFunction(state), None)
+
+        key = (state, agentIndex)
+        bestAction = None
+
+        entry = self._table.get(key)
+        if (entry is not None):
+            (entryDepth, entryValue, entryBound, bestAction) = entry
+
+            if (entryDepth >= remaining):
+                if ((entryBound == EXACT)
+                        or (entryBound == LOWER_BOUND and entryValue >= beta)
+                        or (entryBound == UPPER_BOUND and entryValue <= alpha)):
+                    # The stored search may have been cut off by its own depth limit.
+                    self._depthLimited = True
+                    self._numTableHits += 1
+                    return (entryValue, bestAction)
+
+        successors = state.generateSuccessors(agentIndex)
+        if (len(successors) == 0):
+            return (self._evaluationFunction(state), None)
+
+        # Try the best move from a previous search first.
+        if (bestAction is not None):
+            successors.sort(key = lambda successor: successor[0] != bestAction)
+
+        nextAgent = (agentIndex + 1) % state.getNumAgents()
+        pruning = (self._mode == MODE_ALPHA_BETA)
+        originalAlpha = alpha
+        originalBeta = beta
+
+        if (agentIndex in self._maximizers):
+            value = float('-inf')
+            for (action, successor) in successors:
+                childValue = self._value(successor, nextAgent, remaining - 1, alpha, beta)[0]
+                if (childValue > value):
+                    value = childValue
+                    bestAction = action
+
+                if (pruning):
+                    alpha = max(alpha, value)
+                    if (alpha >= beta):
+                        break
+        elif (self._mode == MODE_EXPECTIMAX):
+            value = 0.0
+            for (action, successor) in successors:
+                value += self._value(successor, nextAgent, remaining - 1, alpha, beta)[0]
+
+            value /= len(successors)
+            bestAction = None
+        else:
+            value = float('inf')
+            for (action, successor) in successors:
+                childValue = self._value(successor, nextAgent, remaining - 1, alpha, beta)[0]
+                if (childValue < value):
+                    value = childValue
+                    bestAction = action
+
+                if (pruning):
+                    beta = min(beta, value)
+                    if (alpha >= beta):
+                        break
+
+        bound = EXACT
+        if (pruning):
+            if (value <= originalAlpha):
+                bound = UPPER_BOUND
+            elif (value >= originalBeta):
+                bound = LOWER_BOUND
+
+        self._table.put(key, remaining, value, bound, bestAction)
+
+        # The action found here, the table may have kept a deeper entry for this state.
+        return (value, bestAction)
+
+class _SearchTimeout(Exception):
+    """
+    Raised inside a search to abandon an iteration at the deadline.
+    """
+
+    pass
+
+class AdversarialSearchAgent(MultiAgentSearchAgent):
+    """
+    A `pacai.agents.search.multiagent.MultiAgentSearchAgent` that uses `AdversarialSearch`.
+
+    The transposition table is kept between moves (up to `tableSize` entries),
+    so work from the previous move is reused.
+    In anytime mode, the tree depth is ignored and each move searches as deep as time allows.
+
+    Example:
+    ```
+    python3 -m pacai.bin.pacman -p AdversarialSearchAgent --agent-args mode=expectimax,depth=3
+    python3 -m pacai.bin.pacman -p AdversarialSearchAgent --agent-args anytime,moveTime=0.5
+    ```
+    """
+
+    def __init__(self, index, mode = MODE_ALPHA_BETA, tableSize = DEFAULT_TABLE_SIZE, **kwargs):
+        super().__init__(index, **kwargs)
+
+        self._search = AdversarialSearch(self.getEvaluationFunction(), mode, int(tableSize))
+
+    def getAction(self, state):
+        if (self.isAnytime()):
+            value, action = self._search.search(state, self.index, None,
+                    deadline = self.getSearchDeadline())
+        else:
+            value, action = self._search.search(state, self.index, self.getTreeDepth())
+
+        return action
+
+    def getSearch(self):
+        return self._search
@@ -68,6 +68,10 @@ class SearchAgent(BaseAgent):
         self._actions = self.searchFunction(problem)  # Find a path.
         self._actionIndex = 0
 
+        # Search functions that do not record their own time get timed as a whole.
+        if (problem.getSearchTime() == 0.0):
+            problem.addSearchTime(time.time() - starttime)
+
         totalCost = problem.actionsCost(self._actions)
 
         state.setHighlightLocations(problem.getVisitHistory())
@@ -75,7 +79,12 @@ class SearchAgent(BaseAgent):
         logging.info('Path found with total cost of %d in %.1f seconds' %
                 (totalCost, time.time() - starttime))
 
-        logging.info('Search nodes expanded: %d' % problem.getExpandedCount())
+        expansionRate = problem.getExpansionRate()
+        if (expansionRate is None):
+            logging.info('Search nodes expanded: %d' % problem.getExpandedCount())
+        else:
+            logging.info('Search nodes expanded: %d (%.0f per second)' %
+                    (problem.getExpandedCount(), expansionRate))
 
     def getAction(self, state):
         """
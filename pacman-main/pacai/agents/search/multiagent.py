@@ -1,19 +1,56 @@
+import time
+
 from pacai.agents.base import BaseAgent
 from pacai.util import reflection
 
+# The longest an anytime search will run for a single move (in seconds).
+DEFAULT_MOVE_TIME = 1.0
+
+# How long before the game's deadline an anytime search should try to finish (in seconds).
+DEFAULT_TIME_MARGIN = 0.1
+
 class MultiAgentSearchAgent(BaseAgent):
     """
     A common class for all multi-agent searchers.
+
+    By default, searchers look a fixed depth ahead.
+    In anytime mode (the `anytime` option), searchers should instead keep searching deeper
+    until `MultiAgentSearchAgent.getSearchDeadline` and use their best completed result.
     """
 
-    def __init__(self, index, evalFn = 'pacai.core.eval.score', depth = 2, **kwargs):
+    def __init__(self, index, evalFn = 'pacai.core.eval.score', depth = 2,
+            anytime = False, moveTime = DEFAULT_MOVE_TIME, timeMargin = DEFAULT_TIME_MARGIN,
+            **kwargs):
         super().__init__(index, **kwargs)
 
         self._evaluationFunction = reflection.qualifiedImport(evalFn)
         self._treeDepth = int(depth)
 
+        self._anytime = (str(anytime).lower() in ['1', 'true'])
+        self._moveTime = float(moveTime)
+        self._timeMargin = float(timeMargin)
+
     def getEvaluationFunction(self):
         return self._evaluationFunction
 
+    def getSearchDeadline(self):
+        """
+        Get the time (in the same terms as `time.time()`) that an anytime search
+        for the current move should finish by.
+        This is `moveTime` from now,
+        or a safety margin before the game's deadline for the move (whichever is first).
+        """
+
+        deadline = time.time() + self._moveTime
+
+        moveDeadline = self.getMoveDeadline()
+        if (moveDeadline is not None):
+            deadline = min(deadline, moveDeadline - self._timeMargin)
+
+        return deadline
+
     def getTreeDepth(self):
         return self._treeDepth
+
+    def isAnytime(self):
+        return self._anytime
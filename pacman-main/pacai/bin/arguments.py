@@ -1,6 +1,7 @@
 import argparse
 import textwrap
 
+from pacai.core.distanceCalculator import DEFAULT_CACHE_DIR
 from pacai.ui import view
 
 def getParser(description, name):
@@ -19,10 +20,20 @@ def getParser(description, name):
             action = 'store', type = int, default = 1,
             help = 'play the specified number of games (default: %(default)s)')
 
+    parser.add_argument('-j', '--jobs', dest = 'jobs',
+            action = 'store', type = int, default = 1,
+            help = 'play non-training games across this many processes, requires --null-graphics\n'
+                + '(training games are always played first in this process) (default: %(default)s)')
+
     parser.add_argument('-q', '--quiet', dest = 'quiet',
             action = 'store_true', default = False,
             help = 'set logging level to warning (default: %(default)s)')
 
+    parser.add_argument('--distance-cache', dest = 'distanceCache',
+            action = 'store', type = str, nargs = '?', default = None, const = DEFAULT_CACHE_DIR,
+            help = 'keep maze distance tables in this directory between runs,\n'
+                + 'without a directory they are kept in \'%(const)s\' (default: %(default)s)')
+
     parser.add_argument('-s', '--seed', dest = 'seed',
             action = 'store', type = int, default = None,
             help = 'Enter seed value to randomize the game')
@@ -38,7 +49,19 @@ def getParser(description, name):
 
     parser.add_argument('--gif', dest = 'gif',
             action = 'store', type = str, default = None,
-            help = 'save the game as a gif to the specified path (default: %(default)s)')
+            help = 'save the game as a gif to the specified path,\n'
+                + 'a .png/.apng path saves an animated png instead\n'
+                + 'and a directory (or a path ending in a separator) saves each frame as a png\n'
+                + '(default: %(default)s)')
+
+    parser.add_argument('--gif-background', dest = 'gifBackground',
+            action = 'store_true', default = False,
+            help = 'render and save the gif on a background thread (default: %(default)s)')
+
+    parser.add_argument('--gif-workers', dest = 'gifWorkers',
+            action = 'store', type = int, default = 0,
+            help = 'render the gif with this many worker processes,\n'
+                + 'zero renders it in this process (default: %(default)s)')
 
     parser.add_argument('--gif-fps', dest = 'gifFPS',
             action = 'store', type = int, default = view.DEFAULT_GIF_FPS,
@@ -58,11 +81,20 @@ def getParser(description, name):
 
     parser.add_argument('--record', dest = 'record',
             action = 'store', type = str, default = None,
-            help = 'writes the moves of a game to the named pickle file (default: %(default)s)')
+            help = 'writes the moves of every game to the named replay file (default: %(default)s)')
 
     parser.add_argument('--replay', dest = 'replay',
             action = 'store', type = str, default = None,
-            help = 'load a recorded pickle game file to replay (default: %(default)s)')
+            help = 'load a recorded replay file to replay (default: %(default)s)')
+
+    parser.add_argument('--replay-game', dest = 'replayIndex',
+            action = 'store', type = int, default = -1,
+            help = 'the game to replay from a replay file with many games\n'
+                + '(0 is the first game, -1 is the last) (default: %(default)s)')
+
+    parser.add_argument('--replay-start', dest = 'replayStart',
+            action = 'store', type = int, default = 0,
+            help = 'start the replay from this ply (move) of the game (default: %(default)s)')
 
     parser.add_argument('--sprites', dest = 'spritesPath',
             action = 'store', type = str, default = view.DEFAULT_SPRITES,
@@ -0,0 +1,176 @@
+"""
+Benchmarks for the game engine.
+
+Each game benchmark plays the same seeded games twice:
+once with the display seeing every move (how games were always run),
+and once as a simulation (see `pacai.core.game.Game`),
+and reports the games played per second for each.
+
+The value iteration benchmark instead counts how many (single state) backups
+each of the value iteration agents needs to converge on each of the gridworlds.
+"""
+
+import argparse
+import logging
+import random
+import sys
+import textwrap
+import time
+
+from pacai.agents.ghost.random import RandomGhost
+from pacai.agents.greedy import GreedyAgent
+from pacai.bin import capture
+from pacai.bin import gridworld
+from pacai.bin import pacman
+from pacai.core import valueIteration
+from pacai.core.layout import getLayout
+from pacai.ui.capture.null import CaptureNullView
+from pacai.ui.pacman.null import PacmanNullView
+from pacai.util.logs import initLogging
+from pacai.util.logs import updateLoggingLevel
+
+DEFAULT_NUM_GAMES = 10
+DEFAULT_SEED = 0
+
+PACMAN_LAYOUT = 'mediumClassic'
+CAPTURE_LAYOUT = 'defaultCapture'
+CAPTURE_TEAM = 'pacai.core.baselineTeam'
+
+VALUE_ITERATION = 'valueIteration'
+VALUE_ITERATION_GRIDS = ['BookGrid', 'BridgeGrid', 'CliffGrid', 'Cliff2Grid',
+        'DiscountGrid', 'MazeGrid']
+VALUE_ITERATION_DISCOUNT = 0.9
+
+def newPacmanGame(simulate):
+    layout = getLayout(PACMAN_LAYOUT)
+    ghosts = [RandomGhost(i + 1) for i in range(layout.getNumGhosts())]
+
+    rules = pacman.ClassicGameRules()
+    game = rules.newGame(layout, GreedyAgent(pacman.PACMAN_AGENT_INDEX), ghosts,
+            PacmanNullView())
+    game.simulate = simulate
+
+    return game
+
+def newCaptureGame(simulate):
+    redAgents = capture.loadAgents(True, CAPTURE_TEAM, True, {})
+    blueAgents = capture.loadAgents(False, CAPTURE_TEAM, True, {})
+    agents = sum([list(agents) for agents in zip(redAgents, blueAgents)], [])
+
+    rules = capture.CaptureRules()
+    game = rules.newGame(getLayout(CAPTURE_LAYOUT), agents, CaptureNullView(),
+            capture.DEFAULT_MAX_MOVES, False)
+    game.simulate = simulate
+
+    return game
+
+BENCHMARKS = {
+    PACMAN_LAYOUT: newPacmanGame,
+    CAPTURE_LAYOUT: newCaptureGame,
+}
+
+def benchmarkGames(newGame, numGames, seed, simulate):
+    """
+    Play numGames (seeded) games and return the number of games played per second.
+    """
+
+    random.seed(seed)
+
+    startTime = time.time()
+    for i in range(numGames):
+        newGame(simulate).run()
+
+    return numGames / (time.time() - startTime)
+
+def benchmarkValueIteration(tolerance = valueIteration.DEFAULT_TOLERANCE):
+    """
+    Solve each gridworld with each of the value iteration agents (until converged).
+    Returns: {grid: {agent: backups, ...}, ...}.
+    """
+
+    results = {}
+
+    for gridName in VALUE_ITERATION_GRIDS:
+        mdp = gridworld._getGridWorld(gridName)
+
+        results[gridName] = {}
+        for (agentName, agentClass) in gridworld.VALUE_AGENTS.items():
+            agent = agentClass(0, mdp, VALUE_ITERATION_DISCOUNT, None, tolerance = tolerance)
+            results[gridName][agentName] = agent.numBackups
+
+    return results
+
+def main(argv):
+    """
+    Entry point for the benchmarks.
+    The args are a blind pass of `sys.argv` with the executable stripped.
+    """
+
+    initLogging()
+
+    description = """
+    DESCRIPTION:
+        Measure how many games per second the engine can play,
+        with the display seeing every move and as a simulation.
+
+    EXAMPLES:
+        (1) python3 -m pacai.bin.benchmark
+            - Run all the benchmarks.
+        (2) python3 -m pacai.bin.benchmark --num-games 20 mediumClassic
+            - Play 20 games of just the mediumClassic benchmark.
+        (3) python3 -m pacai.bin.benchmark valueIteration
+            - Compare the backups the value iteration agents need on each gridworld.
+    """
+
+    parser = argparse.ArgumentParser(description = textwrap.dedent(description),
+            prog = 'benchmark', formatter_class = argparse.RawTextHelpFormatter)
+
+    names = list(BENCHMARKS.keys()) + [VALUE_ITERATION]
+
+    parser.add_argument('benchmarks', metavar = 'BENCHMARK',
+            nargs = '*', default = names,
+            help = 'the benchmarks to run, from: %s (default: all)' % (names))
+
+    parser.add_argument('-n', '--num-games', dest = 'numGames',
+            action = 'store', type = int, default = DEFAULT_NUM_GAMES,
+            help = 'play the specified number of games per run (default: %(default)s)')
+
+    parser.add_argument('-s', '--seed', dest = 'seed',
+            action = 'store', type = int, default = DEFAULT_SEED,
+            help = 'the seed that each run starts from (default: %(default)s)')
+
+    options = parser.parse_args(argv)
+
+    for name in options.benchmarks:
+        if (name not in names):
+            raise ValueError("Unknown benchmark '%s', expected one of: %s." % (name, names))
+
+    results = {}
+    for name in options.benchmarks:
+        if (name == VALUE_ITERATION):
+            results[name] = benchmarkValueIteration()
+
+            for (gridName, backups) in results[name].items():
+                logging.info('%s: backups to converge: %s.' % (gridName,
+                        ', '.join(['%s %d' % (agentName, count)
+                                for (agentName, count) in backups.items()])))
+
+            continue
+
+        # The games themselves are noisy.
+        updateLoggingLevel(logging.WARNING)
+
+        displayRate = benchmarkGames(BENCHMARKS[name], options.numGames, options.seed, False)
+        simulateRate = benchmarkGames(BENCHMARKS[name], options.numGames, options.seed, True)
+
+        updateLoggingLevel(logging.INFO)
+
+        logging.info('%s: %.2f games/s with display updates, %.2f games/s simulated (%.2fx).' %
+                (name, displayRate, simulateRate, simulateRate / displayRate))
+
+        results[name] = (displayRate, simulateRate)
+
+    return results
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -7,30 +7,37 @@ On your opponents side of the map, you are a pacman and can eat food and capsule
 
 import logging
 import os
-import pickle
 import random
 import sys
 
 from pacai.agents import keyboard
 from pacai.agents.capture.dummy import DummyAgent
 from pacai.bin.arguments import getParser
+from pacai.core import distanceCalculator
 from pacai.core.actions import Actions
 from pacai.core.distance import manhattan
 from pacai.core.game import Game
 from pacai.core.gamestate import AbstractGameState
-from pacai.core.grid import Grid
+from pacai.core.grid import BitGrid
 from pacai.core.layout import Layout
 from pacai.core.layout import getLayout
+from pacai.core.replay import ReplayReader
+from pacai.core.replay import ReplaySeeker
+from pacai.core.replay import ReplayWriter
 from pacai.ui.capture.null import CaptureNullView
 from pacai.ui.capture.text import CaptureTextView
 from pacai.util import reflection
 from pacai.util.logs import initLogging
 from pacai.util.logs import updateLoggingLevel
 from pacai.util.mazeGenerator import generateMaze
+from pacai.util.parallel import getGameSeeds
+from pacai.util.parallel import runGamesInParallel
 from pacai.util.util import nearestPoint
 
 COLLISION_TOLERANCE = 0.7  # How close ghosts must be to Pacman to kill
 
+DEFAULT_MAX_MOVES = 1200
+
 KILL_POINTS = 0
 FOOD_POINTS = 1  # Points for eating food.
 
@@ -78,18 +85,15 @@ class CaptureGameState(AbstractGameState):
             else:
                 self._blueCapsules.append(capsule)
 
-        self._redFood = Grid(self._food.getWidth(), self._food.getHeight(), initialValue = False)
-        self._blueFood = Grid(self._food.getWidth(), self._food.getHeight(), initialValue = False)
-
-        for x in range(self._food.getWidth()):
-            for y in range(self._food.getHeight()):
-                if (not self._food[x][y]):
-                    continue
+        # Food is stored column-major, and red has the left half of the columns.
+        # So, red's food is just the low bits of the food bitboard.
+        width = self._food.getWidth()
+        height = self._food.getHeight()
+        foodBits = BitGrid.fromGrid(self._food).getBits()
+        redMask = (1 << (int(self._layout.width / 2) * height)) - 1
 
-                if (self.isOnRedSide((x, y))):
-                    self._redFood[x][y] = True
-                else:
-                    self._blueFood[x][y] = True
+        self._redFood = BitGrid.fromBits(width, height, foodBits & redMask)
+        self._blueFood = BitGrid.fromBits(width, height, foodBits & ~redMask)
 
     # Override
     def generateSuccessor(self, agentIndex, action):
@@ -131,9 +135,9 @@ class CaptureGameState(AbstractGameState):
         super().eatFood(x, y)
 
         if (self.isOnRedSide((x, y))):
-            self._redFood[x][y] = False
+            self._redFood.set(x, y, False)
         else:
-            self._blueFood[x][y] = False
+            self._blueFood.set(x, y, False)
 
     def getBlueCapsules(self):
         """
@@ -224,15 +228,16 @@ class CaptureGameState(AbstractGameState):
 
         return self._teams[agentIndex]
 
-    def _applySuccessorAction(self, agentIndex, action):
+    # Override
+    def _applySuccessorAction(self, agentIndex, action, checkLegal = True):
         """
         Apply the action to the context state (self).
         """
 
         # Find appropriate rules for the agent.
-        AgentRules.applyAction(self, action, agentIndex)
+        AgentRules.applyAction(self, action, agentIndex, checkLegal)
         AgentRules.checkDeath(self, agentIndex)
-        AgentRules.decrementTimer(self.getAgentState(agentIndex))
+        AgentRules.decrementTimer(self.getMutableAgentState(agentIndex))
 
         # Book keeping.
         self._lastAgentMoved = agentIndex
@@ -346,16 +351,15 @@ class AgentRules:
                 state.getWalls())
 
     @staticmethod
-    def applyAction(state, action, agentIndex):
+    def applyAction(state, action, agentIndex, checkLegal = True):
         """
         Edits the state to reflect the results of the action.
         """
 
-        legal = AgentRules.getLegalActions(state, agentIndex)
-        if (action not in legal):
+        if (checkLegal and action not in AgentRules.getLegalActions(state, agentIndex)):
             raise ValueError('Illegal action: ' + str(action))
 
-        agentState = state.getAgentState(agentIndex)
+        agentState = state.getMutableAgentState(agentIndex)
 
         # Update position.
         vector = Actions.directionToVector(action, AgentRules.AGENT_SPEED)
@@ -414,7 +418,7 @@ class AgentRules:
                 otherTeam = state.getRedTeamIndices()
 
             for agentIndex in otherTeam:
-                state.getAgentState(agentIndex).setScaredTimer(SCARED_TIME)
+                state.getMutableAgentState(agentIndex).setScaredTimer(SCARED_TIME)
 
     @staticmethod
     def decrementTimer(agentState):
@@ -428,7 +432,7 @@ class AgentRules:
 
     @staticmethod
     def checkDeath(state, agentIndex):
-        agentState = state.getAgentState(agentIndex)
+        agentState = state.getMutableAgentState(agentIndex)
 
         if (state.isOnRedTeam(agentIndex)):
             teamPointModifier = 1
@@ -455,10 +459,10 @@ class AgentRules:
             # Otherwise, we are being eatten.
             if (agentState.isBraveGhost() or otherAgentState.isScaredGhost()):
                 state.addScore(teamPointModifier * KILL_POINTS)
-                otherAgentState.respawn()
+                state.getMutableAgentState(otherAgentIndex).respawn()
             else:
                 state.addScore(teamPointModifier * -KILL_POINTS)
-                agentState.respawn()
+                state.getMutableAgentState(agentIndex).respawn()
 
 #############################
 # FRAMEWORK TO START A GAME #
@@ -536,7 +540,7 @@ def readCommand(argv):
             help = 'make agent 3 (second blue player) a keyboard agent (default: %(default)s)')
 
     parser.add_argument('--max-moves', dest = 'maxMoves',
-            action = 'store', type = int, default = 1200,
+            action = 'store', type = int, default = DEFAULT_MAX_MOVES,
             help = 'set maximum number of moves in a game (default: %(default)s)')
 
     parser.add_argument('--red-args', dest = 'redArgs',
@@ -559,9 +563,17 @@ def readCommand(argv):
     elif options.debug:
         updateLoggingLevel(logging.DEBUG)
 
+    if (options.jobs < 1):
+        raise ValueError('The number of jobs must be at least 1.')
+
+    if (options.jobs > 1 and not options.nullGraphics):
+        raise ValueError('Playing games in parallel (--jobs) requires --null-graphics.')
+
     viewOptions = {
+        'gifBackground': options.gifBackground,
         'gifFPS': options.gifFPS,
         'gifPath': options.gif,
+        'gifWorkers': options.gifWorkers,
         'skipFrames': options.gifSkipFrames,
         'spritesPath': options.spritesPath,
     }
@@ -588,6 +600,9 @@ def readCommand(argv):
     random.seed(seed)
     logging.debug('Seed value: ' + str(seed))
 
+    # The disk cache for maze distances is only used when asked for.
+    distanceCalculator.setCacheDir(options.distanceCache)
+
     # Choose a pacman agent.
     redArgs = parseAgentArgs(options.redArgs)
     blueArgs = parseAgentArgs(options.blueArgs)
@@ -639,6 +654,9 @@ def readCommand(argv):
     args['record'] = options.record
     args['catchExceptions'] = options.catchExceptions
     args['replay'] = options.replay
+    args['replayIndex'] = options.replayIndex
+    args['replayStart'] = options.replayStart
+    args['jobs'] = options.jobs
 
     return args
 
@@ -660,18 +678,21 @@ def loadAgents(isRed, agentModule, textgraphics, args):
 
     return createTeamFunction(indices[0], indices[1], isRed, **args)
 
-def replayGame(layout, agents, actions, display, length, redTeamName, blueTeamName):
+def replayGame(layout, agents, actions, display, length, redTeamName, blueTeamName, start = 0):
+    """
+    Show a recorded game, starting from the given ply.
+    """
+
     agents = [DummyAgent(index) for index in range(len(agents))]
     rules = CaptureRules()
     game = rules.newGame(layout, agents, display, length, False)
-    state = game.state
     display.redTeam = redTeamName
     display.blueTeam = blueTeamName
-    display.initialize(state)
 
-    for action in actions:
-        # Execute the action
-        state = state.generateSuccessor(*action)
+    states = ReplaySeeker(game.state, actions).iterStates(start)
+    display.initialize(next(states))
+
+    for state in states:
         # Change the display
         display.update(state)
         # Allow for game specific conditions (winning, losing, etc.)
@@ -680,50 +701,78 @@ def replayGame(layout, agents, actions, display, length, redTeamName, blueTeamNa
     display.finish()
 
 def runGames(layout, agents, display, length, numGames, record, numTraining,
-        redTeamName, blueTeamName, catchExceptions = False, **kwargs):
+        redTeamName, blueTeamName, catchExceptions = False, jobs = 1, **kwargs):
     rules = CaptureRules()
     games = []
 
+    replayWriter = None
+    replayInfo = {
+        'agents': [agent.__class__.__name__ for agent in agents],
+        'length': length,
+        'redTeamName': redTeamName,
+        'blueTeamName': blueTeamName,
+    }
+
+    if (record):
+        replayWriter = _openReplay(record)
+
     nullView = None
     if (numTraining > 0):
         logging.info('Playing %d training games.' % numTraining)
         nullView = CaptureNullView()
 
-    for i in range(numGames):
-        isTraining = (i < numTraining)
+    # Training games build on each other, so they are always played (in order) in this process.
+    # Only the remaining games are handed out to other processes, each with a snapshot of the agents.
+    numSerialGames = numGames
+    if (jobs > 1):
+        numSerialGames = min(numGames, numTraining)
 
-        if (isTraining):
-            # Suppress graphics for training.
-            gameDisplay = nullView
-        else:
-            gameDisplay = display
+    # Every game is seeded the same way no matter where it is played.
+    seeds = getGameSeeds(numGames)
+
+    # A game that raises still leaves the replay closed, with only its finished games.
+    try:
+        for i in range(numSerialGames):
+            isTraining = (i < numTraining)
+
+            if (isTraining):
+                # Suppress graphics for training.
+                gameDisplay = nullView
+            else:
+                gameDisplay = display
+
+            random.seed(seeds[i])
+
+            g = rules.newGame(layout, agents, gameDisplay, length, catchExceptions)
+
+            if (replayWriter is not None):
+                replayWriter.startGame(layout, replayInfo)
+                g.replayWriter = replayWriter
+
+            g.run()
 
-        g = rules.newGame(layout, agents, gameDisplay, length, catchExceptions)
-        g.run()
+            if (replayWriter is not None):
+                replayWriter.endGame()
 
-        if (not isTraining):
-            games.append(g)
+            if (not isTraining):
+                games.append(g)
 
-        g.record = None
-        if record:
-            components = {
-                'layout': layout,
-                'agents': [agent.__class__.__name__ for agent in agents],
-                'actions': g.moveHistory,
-                'length': length,
-                'redTeamName': redTeamName,
-                'blueTeamName': blueTeamName
-            }
+        if (numSerialGames < numGames):
+            gameArgs = (layout, agents, length, catchExceptions)
+            parallelGames = runGamesInParallel(_playGame, gameArgs, seeds[numSerialGames:], jobs)
 
-            path = 'replay'
-            if (isinstance(record, str)):
-                path = record
+            # Games played in other processes are recorded once they are done.
+            if (replayWriter is not None):
+                for g in parallelGames:
+                    replayWriter.writeGame(layout, replayInfo, g.moveHistory)
 
-            g.record = pickle.dumps(components)
-            with open(path, 'wb') as file:
-                file.write(g.record)
+            games += parallelGames
+    finally:
+        if (replayWriter is not None):
+            replayWriter.close()
 
-            logging.info("Game recorded to: '%s'." % (path))
+    if (replayWriter is not None):
+        logging.info("Games recorded to: '%s'." % (replayWriter.getPath()))
 
     if (numGames > 0):
         scores = [game.state.getScore() for game in games]
@@ -740,6 +789,24 @@ def runGames(layout, agents, display, length, numGames, record, numTraining,
 
     return games
 
+def _playGame(layout, agents, length, catchExceptions):
+    """
+    Play a single game without graphics.
+    Used by `pacai.util.parallel.runGamesInParallel`.
+    """
+
+    rules = CaptureRules()
+    game = rules.newGame(layout, agents, CaptureNullView(), length, catchExceptions)
+    game.run()
+
+    return game
+
+def _openReplay(record):
+    path = 'replay'
+    if (isinstance(record, str)):
+        path = record
+
+    return ReplayWriter(path)
 
 def main(argv):
     """
@@ -756,11 +823,13 @@ def main(argv):
     if (options['replay'] is not None):
         logging.info('Replaying recorded game %s.' % options['replay'])
 
-        recorded = None
-        with open(options['replay'], 'rb') as file:
-            recorded = pickle.load(file)
+        with ReplayReader(options['replay']) as reader:
+            recorded = reader.getInfo(options['replayIndex'])
+            recorded['layout'] = reader.getLayout(options['replayIndex'])
+            recorded['actions'] = reader.getMoves(options['replayIndex'])
 
         recorded['display'] = options['display']
+        recorded['start'] = options['replayStart']
         replayGame(**recorded)
 
         return
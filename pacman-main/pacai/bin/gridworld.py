@@ -7,15 +7,27 @@ import textwrap
 
 from pacai.agents.learning.reinforcement import ReinforcementAgent
 from pacai.core.environment import Environment
+from pacai.core.mdp import CachedMDP
 from pacai.core.mdp import MarkovDecisionProcess
 from pacai.student.qlearningAgents import QLearningAgent
+from pacai.student.valueIterationAgent import AsynchronousValueIterationAgent
+from pacai.student.valueIterationAgent import PrioritizedSweepingValueIterationAgent
 from pacai.student.valueIterationAgent import ValueIterationAgent
 from pacai.ui.gridworld.text import TextGridworldDisplay
 from pacai.util.logs import initLogging
 from pacai.util.logs import updateLoggingLevel
 
+# The agents that solve the MDP up front (by --agent name).
+VALUE_AGENTS = {
+    'value': ValueIterationAgent,
+    'async': AsynchronousValueIterationAgent,
+    'prioritized': PrioritizedSweepingValueIterationAgent,
+}
+
 class Gridworld(MarkovDecisionProcess):
     def __init__(self, grid):
+        super().__init__()
+
         # layout
         if (isinstance(grid, list)):
             grid = makeGrid(grid)
@@ -36,6 +48,7 @@ class Gridworld(MarkovDecisionProcess):
         """
 
         self.livingReward = reward
+        self.markChanged()
 
     def setNoise(self, noise):
         """
@@ -43,6 +56,7 @@ class Gridworld(MarkovDecisionProcess):
         """
 
         self.noise = noise
+        self.markChanged()
 
     def getPossibleActions(self, state):
         """
@@ -387,7 +401,8 @@ def parseOptions(argv):
 
     parser.add_argument('-a', '--agent', dest = 'agent',
             action = 'store', type = str, default = 'random',
-            help = 'agent type (options are \'random\', \'value\' and \'q\', default %(default)s)')
+            help = 'agent type (options are \'random\', \'value\', \'async\', \'prioritized\''
+                + ' and \'q\', default %(default)s)')
 
     parser.add_argument('-d', '--debug', dest = 'debug',
             action = 'store_true', default = False,
@@ -433,6 +448,11 @@ def parseOptions(argv):
             action = 'store', type = float, default = 1.0,
             help = 'speed of animation, S>1.0 is faster, 0<S<1 is slower (default %(default)s)')
 
+    parser.add_argument('-t', '--tolerance', dest = 'tolerance',
+            action = 'store', type = float, default = None,
+            help = 'stop value iteration early once no value changes by more than this\n'
+                + '(default %(default)s)')
+
     parser.add_argument('-v', '--value-steps', dest = 'valueSteps',
             action = 'store_true', default = False,
             help = 'display each step of value iteration (default %(default)s)')
@@ -498,7 +518,8 @@ def main(argv):
     # GET THE GRIDWORLD
     ###########################
 
-    mdp = _getGridWorld(opts.grid)
+    # Transitions are asked for over and over (by agents and the environment), so remember them.
+    mdp = CachedMDP(_getGridWorld(opts.grid))
     mdp.setLivingReward(opts.livingReward)
     mdp.setNoise(opts.noise)
     env = GridworldEnvironment(mdp)
@@ -519,8 +540,15 @@ def main(argv):
     ###########################
 
     a = None
-    if (opts.agent == 'value'):
-        a = ValueIterationAgent(0, mdp, opts.discount, opts.iters)
+    valueArgs = {}
+    if (opts.tolerance is not None):
+        valueArgs['tolerance'] = opts.tolerance
+
+    if (opts.agent in VALUE_AGENTS):
+        a = VALUE_AGENTS[opts.agent](0, mdp, opts.discount, opts.iters, **valueArgs)
+        if (a.numIterations < opts.iters):
+            logging.info('Value iteration converged after %d iterations (%d backups).' %
+                    (a.numIterations, a.numBackups))
     elif (opts.agent == 'q'):
         qLearnOpts = {
             'gamma': opts.discount,
@@ -561,16 +589,17 @@ def main(argv):
     ###########################
 
     # Display q/v values before simulation of episodes.
-    if (not opts.manual and opts.agent == 'value'):
+    if (not opts.manual and opts.agent in VALUE_AGENTS):
         if (opts.valueSteps):
             for i in range(opts.iters):
-                tempAgent = ValueIterationAgent(0, mdp, opts.discount, i)
+                tempAgent = VALUE_AGENTS[opts.agent](0, mdp, opts.discount, i, **valueArgs)
                 display.displayValues(tempAgent, message = 'VALUES AFTER ' + str(i) + ' ITERATIONS')
                 display.pause()
 
-        display.displayValues(a, message = 'VALUES AFTER ' + str(opts.iters) + ' ITERATIONS')
+        display.displayValues(a, message = 'VALUES AFTER ' + str(a.numIterations) + ' ITERATIONS')
         display.pause()
-        display.displayQValues(a, message = 'Q-VALUES AFTER ' + str(opts.iters) + ' ITERATIONS')
+        display.displayQValues(a,
+                message = 'Q-VALUES AFTER ' + str(a.numIterations) + ' ITERATIONS')
         display.pause()
 
     # Figure out what to display each time step (if anything).
@@ -581,7 +610,7 @@ def main(argv):
         else:
             if (opts.agent == 'random'):
                 displayCallback = lambda state: display.displayValues(a, state, 'CURRENT VALUES')
-            elif (opts.agent == 'value'):
+            elif (opts.agent in VALUE_AGENTS):
                 displayCallback = lambda state: display.displayValues(a, state, 'CURRENT VALUES')
             elif (opts.agent == 'q'):
                 displayCallback = lambda state: display.displayQValues(a, state, 'CURRENT Q-VALUES')
@@ -9,7 +9,6 @@ Have fun!
 
 import logging
 import os
-import pickle
 import random
 import sys
 
@@ -17,16 +16,22 @@ from pacai.agents.base import BaseAgent
 from pacai.agents.ghost.random import RandomGhost
 from pacai.agents.greedy import GreedyAgent
 from pacai.bin.arguments import getParser
+from pacai.core import distanceCalculator
 from pacai.core.actions import Actions
 from pacai.core.directions import Directions
 from pacai.core.distance import manhattan
 from pacai.core.game import Game
 from pacai.core.gamestate import AbstractGameState
 from pacai.core.layout import getLayout
+from pacai.core.replay import ReplayReader
+from pacai.core.replay import ReplaySeeker
+from pacai.core.replay import ReplayWriter
 from pacai.ui.pacman.null import PacmanNullView
 from pacai.ui.pacman.text import PacmanTextView
 from pacai.util.logs import initLogging
 from pacai.util.logs import updateLoggingLevel
+from pacai.util.parallel import getGameSeeds
+from pacai.util.parallel import runGamesInParallel
 from pacai.util.util import nearestPoint
 
 PACMAN_AGENT_INDEX = 0
@@ -118,23 +123,24 @@ class PacmanGameState(AbstractGameState):
 
         return self._agentStates[PACMAN_AGENT_INDEX]
 
-    def _applySuccessorAction(self, agentIndex, action):
+    # Override
+    def _applySuccessorAction(self, agentIndex, action, checkLegal = True):
         """
         Apply the action to the context state (self).
         """
 
         # Let the agent's logic deal with its action's effects on the board.
         if (agentIndex == PACMAN_AGENT_INDEX):
-            PacmanRules.applyAction(self, action)
+            PacmanRules.applyAction(self, action, checkLegal)
         else:
-            GhostRules.applyAction(self, action, agentIndex)
+            GhostRules.applyAction(self, action, agentIndex, checkLegal)
 
         # Time passes.
         if (agentIndex == PACMAN_AGENT_INDEX):
             # Penalty for waiting around.
             self.addScore(-TIME_PENALTY)
         else:
-            GhostRules.decrementTimer(self.getAgentState(agentIndex))
+            GhostRules.decrementTimer(self.getMutableAgentState(agentIndex))
 
         # Resolve multi-agent effects.
         GhostRules.checkDeath(self, agentIndex)
@@ -221,16 +227,15 @@ class PacmanRules:
                 state.getWalls())
 
     @staticmethod
-    def applyAction(state, action):
+    def applyAction(state, action, checkLegal = True):
         """
         Edits the state to reflect the results of the action.
         """
 
-        legal = PacmanRules.getLegalActions(state)
-        if (action not in legal):
+        if (checkLegal and action not in PacmanRules.getLegalActions(state)):
             raise ValueError('Illegal pacman action: ' + str(action))
 
-        pacmanState = state.getPacmanState()
+        pacmanState = state.getMutableAgentState(PACMAN_AGENT_INDEX)
 
         # Update position.
         vector = Actions.directionToVector(action, PacmanRules.PACMAN_SPEED)
@@ -260,8 +265,8 @@ class PacmanRules:
             state.eatCapsule(x, y)
 
             # Reset all ghosts' scared timers.
-            for ghostState in state.getGhostStates():
-                ghostState.setScaredTimer(SCARED_TIME)
+            for ghostIndex in state.getGhostIndexes():
+                state.getMutableAgentState(ghostIndex).setScaredTimer(SCARED_TIME)
 
 class GhostRules:
     """
@@ -291,12 +296,11 @@ class GhostRules:
         return possibleActions
 
     @staticmethod
-    def applyAction(state, action, ghostIndex):
-        legal = GhostRules.getLegalActions(state, ghostIndex)
-        if (action not in legal):
+    def applyAction(state, action, ghostIndex, checkLegal = True):
+        if (checkLegal and action not in GhostRules.getLegalActions(state, ghostIndex)):
             raise ValueError('Illegal ghost action: ' + str(action))
 
-        ghostState = state.getGhostState(ghostIndex)
+        ghostState = state.getMutableAgentState(ghostIndex)
         speed = GhostRules.GHOST_SPEED
         if (ghostState.isScared()):
             speed /= 2.0
@@ -341,7 +345,7 @@ class GhostRules:
         if (ghostState.isScared()):
             # Pacman ate a ghost.
             state.addScore(GHOST_POINTS)
-            ghostState.respawn()
+            state.getMutableAgentState(agentIndex).respawn()
         elif (not state.isOver()):
             # A ghost ate pacman.
             state.addScore(LOSE_POINTS)
@@ -437,6 +441,15 @@ def readCommand(argv):
     random.seed(seed)
     logging.debug('Seed value: ' + str(seed))
 
+    # The disk cache for maze distances is only used when asked for.
+    distanceCalculator.setCacheDir(options.distanceCache)
+
+    if (options.jobs < 1):
+        raise ValueError('The number of jobs must be at least 1.')
+
+    if (options.jobs > 1 and not options.nullGraphics):
+        raise ValueError('Playing games in parallel (--jobs) requires --null-graphics.')
+
     # Choose a layout.
     args['layout'] = getLayout(options.layout, maxGhosts = options.numGhosts)
     if (args['layout'] is None):
@@ -459,8 +472,10 @@ def readCommand(argv):
         options.numIgnore = int(agentOpts['numTrain'])
 
     viewOptions = {
+        'gifBackground': options.gifBackground,
         'gifFPS': options.gifFPS,
         'gifPath': options.gif,
+        'gifWorkers': options.gifWorkers,
         'skipFrames': options.gifSkipFrames,
         'spritesPath': options.spritesPath,
     }
@@ -480,15 +495,22 @@ def readCommand(argv):
 
     args['catchExceptions'] = options.catchExceptions
     args['gameToReplay'] = options.replay
+    args['jobs'] = options.jobs
     args['ghosts'] = [BaseAgent.loadAgent(options.ghost, i + 1) for i in range(options.numGhosts)]
     args['numGames'] = options.numGames
     args['pacman'] = BaseAgent.loadAgent(options.pacman, PACMAN_AGENT_INDEX, agentOpts)
     args['record'] = options.record
+    args['replayIndex'] = options.replayIndex
+    args['replayStart'] = options.replayStart
     args['timeout'] = options.timeout
 
     return args
 
-def replayGame(layout, actions, display):
+def replayGame(layout, actions, display, start = 0):
+    """
+    Show a recorded game, starting from the given ply.
+    """
+
     rules = ClassicGameRules()
 
     agents = []
@@ -496,13 +518,11 @@ def replayGame(layout, actions, display):
     agents += [RandomGhost(i + 1) for i in range(layout.getNumGhosts())]
 
     game = rules.newGame(layout, agents[PACMAN_AGENT_INDEX], agents[1:], display)
-    state = game.state
-    display.initialize(state)
 
-    for action in actions:
-        # Execute the action
-        state = state.generateSuccessor(*action)
+    states = ReplaySeeker(game.state, actions).iterStates(start)
+    display.initialize(next(states))
 
+    for state in states:
         # Change the display
         display.update(state)
 
@@ -512,38 +532,71 @@ def replayGame(layout, actions, display):
     display.finish()
 
 def runGames(layout, pacman, ghosts, display, numGames, record = None, numTraining = 0,
-        catchExceptions = False, timeout = 30, **kwargs):
+        catchExceptions = False, timeout = 30, jobs = 1, **kwargs):
     rules = ClassicGameRules(timeout)
     games = []
 
+    replayWriter = None
+    if (record):
+        replayWriter = _openReplay(record)
+
     nullView = None
     if (numTraining > 0):
         logging.info('Playing %d training games.' % numTraining)
         nullView = PacmanNullView()
 
-    for i in range(numGames):
-        isTraining = (i < numTraining)
+    # Training games build on each other, so they are always played (in order) in this process.
+    # Only the remaining games are handed out to other processes, each with a snapshot of the agents.
+    numSerialGames = numGames
+    if (jobs > 1):
+        numSerialGames = min(numGames, numTraining)
 
-        if (isTraining):
-            # Suppress graphics for training.
-            gameDisplay = nullView
-        else:
-            gameDisplay = display
+    # Every game is seeded the same way no matter where it is played.
+    seeds = getGameSeeds(numGames)
+
+    # A game that raises still leaves the replay closed, with only its finished games.
+    try:
+        for i in range(numSerialGames):
+            isTraining = (i < numTraining)
+
+            if (isTraining):
+                # Suppress graphics for training.
+                gameDisplay = nullView
+            else:
+                gameDisplay = display
+
+            random.seed(seeds[i])
+
+            game = rules.newGame(layout, pacman, ghosts, gameDisplay, catchExceptions)
 
-        game = rules.newGame(layout, pacman, ghosts, gameDisplay, catchExceptions)
-        game.run()
+            if (replayWriter is not None):
+                replayWriter.startGame(layout)
+                game.replayWriter = replayWriter
 
-        if (not isTraining):
-            games.append(game)
+            game.run()
 
-        if (record):
-            path = 'pacman.replay'
-            if (isinstance(record, str)):
-                path = record
+            if (replayWriter is not None):
+                replayWriter.endGame()
 
-            components = {'layout': layout, 'actions': game.moveHistory}
-            with open(path, 'wb') as file:
-                pickle.dump(components, file)
+            if (not isTraining):
+                games.append(game)
+
+        if (numSerialGames < numGames):
+            gameArgs = (layout, pacman, ghosts, catchExceptions, timeout)
+            parallelGames = runGamesInParallel(_playGame, gameArgs, seeds[numSerialGames:], jobs)
+
+            # Games played in other processes are recorded once they are done.
+            if (replayWriter is not None):
+                for game in parallelGames:
+                    replayWriter.writeGame(layout, {}, game.moveHistory)
+
+            games += parallelGames
+    finally:
+        if (replayWriter is not None):
+            replayWriter.close()
+
+    if (replayWriter is not None):
+        logging.info("Games recorded to: '%s'." % (replayWriter.getPath()))
 
     if ((numGames - numTraining) > 0):
         scores = [game.state.getScore() for game in games]
@@ -556,6 +609,25 @@ def runGames(layout, pacman, ghosts, display, numGames, record = None, numTraini
 
     return games
 
+def _playGame(layout, pacman, ghosts, catchExceptions, timeout):
+    """
+    Play a single game without graphics.
+    Used by `pacai.util.parallel.runGamesInParallel`.
+    """
+
+    rules = ClassicGameRules(timeout)
+    game = rules.newGame(layout, pacman, ghosts, PacmanNullView(), catchExceptions)
+    game.run()
+
+    return game
+
+def _openReplay(record):
+    path = 'pacman.replay'
+    if (isinstance(record, str)):
+        path = record
+
+    return ReplayWriter(path)
+
 def main(argv):
     """
     Entry point for a pacman game.
@@ -571,12 +643,11 @@ def main(argv):
     if (args['gameToReplay'] is not None):
         logging.info('Replaying recorded game %s.' % args['gameToReplay'])
 
-        recorded = None
-        with open(args['gameToReplay'], 'rb') as file:
-            recorded = pickle.load(file)
+        with ReplayReader(args['gameToReplay']) as reader:
+            layout = reader.getLayout(args['replayIndex'])
+            actions = reader.getMoves(args['replayIndex'])
 
-        recorded['display'] = args['display']
-        replayGame(**recorded)
+        replayGame(layout, actions, args['display'], args['replayStart'])
 
         return
 
@@ -1,10 +1,23 @@
+import array
+import hashlib
+import logging
+import mmap
+import os
 import sys
+import tempfile
 
 from pacai.core.distance import manhattan
-from pacai.util import priorityQueue
+from pacai.util.gridCache import GridCache
 
 DEFAULT_DISTANCE = 10000
 
+# The disk cache is off unless it is turned on (see `setCacheDir`).
+# This is where the command line puts it when no directory is given.
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'pacai-distances')
+
+CACHE_FILE_MAGIC = b'PACD0001'
+CACHE_FILE_EXTENSION = '.dist'
+
 class Distancer(object):
     """
     A class for computing and caching the shortest path between any two points in a given maze.
@@ -16,9 +29,16 @@ class Distancer(object):
     ```
     """
 
-    def __init__(self, layout):
+    def __init__(self, layout, cacheDir = None):
+        """
+        Args:
+            layout: The `pacai.core.layout.Layout` to compute distances on.
+            cacheDir: Where to keep distance tables between runs,
+                None uses the directory set with `setCacheDir` (if any).
+        """
+
         self._distances = None
-        self.dc = DistanceCalculator(layout, self)
+        self.dc = DistanceCalculator(layout, self, cacheDir)
 
     def getMazeDistances(self):
         self.dc.run()
@@ -48,11 +68,11 @@ class Distancer(object):
         return bestDistance
 
     def getDistanceOnGrid(self, pos1, pos2):
-        key = (pos1, pos2)
-        if key in self._distances:
-            return self._distances[key]
+        distance = self._distances.get(pos1, pos2)
+        if (distance is not None):
+            return distance
 
-        raise Exception("Position not in grid: " + str(key))
+        raise Exception("Position not in grid: " + str((pos1, pos2)))
 
     def isReadyForMazeDistance(self):
         return (self._distances is not None)
@@ -78,75 +98,194 @@ def getGrids1D(x):
 # MACHINERY FOR COMPUTING MAZE DISTANCES #
 ##########################################
 
-distanceMap = {}
+class DistanceTable(object):
+    """
+    All-pairs maze distances for a layout.
+
+    Every open (non-wall) cell is given an id (in `pacai.core.grid.Grid.asList` order),
+    and the distances are kept in a flat row-major matrix of unsigned ints indexed by those ids.
+    The matrix may either be an in-memory array or a read-only memory-mapped cache file.
+
+    For compatibility, lookups may also be done like a dict keyed by `(pos1, pos2)`.
+    """
+
+    def __init__(self, positions, distances, unreachable):
+        self._positions = positions
+        self._ids = {position: id for (id, position) in enumerate(positions)}
+        self._numCells = len(positions)
+        self._distances = distances
+        self._unreachable = unreachable
+
+    def get(self, pos1, pos2, default = None):
+        """
+        Get the maze distance between two grid positions,
+        or the default if either position is not an open cell.
+        Unreachable pairs have a distance of `sys.maxsize`.
+        """
+
+        id1 = self._ids.get(pos1)
+        id2 = self._ids.get(pos2)
+        if (id1 is None or id2 is None):
+            return default
+
+        distance = self._distances[id1 * self._numCells + id2]
+        if (distance == self._unreachable):
+            return sys.maxsize
+
+        return distance
+
+    def getCellId(self, position):
+        """
+        Get the id of an open cell, or None if the position is not an open cell.
+        """
+
+        return self._ids.get(position)
+
+    def getPositions(self):
+        """
+        Get the open cells, ordered by id.
+        """
+
+        return self._positions
+
+    def __contains__(self, key):
+        pos1, pos2 = key
+        return pos1 in self._ids and pos2 in self._ids
+
+    def __getitem__(self, key):
+        distance = self.get(*key)
+        if (distance is None):
+            raise KeyError(key)
+
+        return distance
+
+    def __len__(self):
+        return self._numCells * self._numCells
+
+# Distance tables shared by every Distancer in this process (all agents in all games), keyed by walls.
+# Tables are read-only once built.
+# Tables loaded from the disk cache are memory-mapped,
+# so other processes using the same cache file also share the same physical pages.
+distanceMap = GridCache()
+
+# Where distance tables are kept between runs, None when the disk cache is off.
+_cacheDir = None
+
+def getCacheDir():
+    return _cacheDir
+
+def setCacheDir(cacheDir):
+    """
+    Set the directory that distance tables are cached in for this process,
+    or turn the disk cache off with None (the default).
+    """
+
+    global _cacheDir
+    _cacheDir = cacheDir
 
 class DistanceCalculator:
-    def __init__(self, layout, distancer):
+    def __init__(self, layout, distancer, cacheDir = None):
         self.layout = layout
         self.distancer = distancer
-        self.cache = {}
+        self.cacheDir = cacheDir
+        self.cache = distanceMap
 
     def run(self):
-        if self.layout.walls not in self.cache:
-            self.cache[self.layout.walls] = computeDistances(self.layout)
-
-        self.distancer._distances = self.cache[self.layout.walls]
+        self.distancer._distances = getDistanceTable(self.layout, self.cacheDir)
 
 def computeDistances(layout):
     """
-    Runs UCS to all other positions from each position.
+    Runs BFS to all other positions from each position.
+    Returns a `DistanceTable`.
     """
 
-    distances = {}
-    allNodes = layout.walls.asList(False)
+    positions = layout.walls.asList(False)
+    numCells = len(positions)
+    typecode, unreachable = _getTypecode(numCells)
+
+    ids = {position: id for (id, position) in enumerate(positions)}
 
-    for source in allNodes:
-        dist = {}
-        closed = {}
+    # Adjacency lists by cell id.
+    neighbors = []
+    for (x, y) in positions:
+        adjacent = []
+        for other in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+            if (other in ids):
+                adjacent.append(ids[other])
 
-        for node in allNodes:
-            dist[node] = sys.maxsize
+        neighbors.append(adjacent)
 
-        queue = priorityQueue.PriorityQueue()
-        queue.push(source, 0)
-        dist[source] = 0
+    distances = array.array(typecode, [unreachable]) * (numCells * numCells)
 
-        while not queue.isEmpty():
-            node = queue.pop()
-            if node in closed:
-                continue
+    for source in range(numCells):
+        offset = source * numCells
+        distances[offset + source] = 0
 
-            closed[node] = True
-            nodeDist = dist[node]
-            adjacent = []
-            x, y = node
+        frontier = [source]
+        depth = 0
 
-            if not layout.isWall((x, y + 1)):
-                adjacent.append((x, y + 1))
+        while (len(frontier) > 0):
+            depth += 1
+            nextFrontier = []
 
-            if not layout.isWall((x, y - 1)):
-                adjacent.append((x, y - 1))
+            for node in frontier:
+                for other in neighbors[node]:
+                    if (distances[offset + other] == unreachable):
+                        distances[offset + other] = depth
+                        nextFrontier.append(other)
 
-            if not layout.isWall((x + 1, y)):
-                adjacent.append((x + 1, y))
+            frontier = nextFrontier
 
-            if not layout.isWall((x - 1, y)):
-                adjacent.append((x - 1, y))
+    return DistanceTable(positions, distances, unreachable)
 
-            for other in adjacent:
-                if other not in dist:
-                    continue
+def getDistanceTable(layout, cacheDir = None):
+    """
+    Get the `DistanceTable` for a layout, shared with every other user of the same walls.
+    The table is only loaded (see `loadDistances`) the first time a set of walls is seen.
+    A None cacheDir uses the directory set with `setCacheDir` (if any).
+    """
 
-                oldDist = dist[other]
-                newDist = nodeDist + 1
-                if newDist < oldDist:
-                    dist[other] = newDist
-                    queue.push(other, newDist)
+    if (cacheDir is None):
+        cacheDir = _cacheDir
+
+    return distanceMap.get(layout.walls, lambda: loadDistances(layout, cacheDir))
+
+def loadDistances(layout, cacheDir = None):
+    """
+    Get the `DistanceTable` for a layout.
+    Without a cacheDir, the distances are just computed.
+    Otherwise, if a cache file for the layout's walls exists, it will be memory-mapped
+    instead of recomputed, and if not the computed distances will be written to the cache.
+    """
 
-        for target in allNodes:
-            distances[(target, source)] = dist[target]
+    if (cacheDir is None):
+        return computeDistances(layout)
+
+    path = os.path.join(cacheDir, getWallsKey(layout) + CACHE_FILE_EXTENSION)
+    positions = layout.walls.asList(False)
+
+    if (os.path.isfile(path)):
+        try:
+            return _readDistances(path, positions)
+        except (OSError, ValueError) as ex:
+            logging.warning("Unable to read distance cache '%s', recomputing. -- %s" % (path, ex))
+
+    table = computeDistances(layout)
+
+    try:
+        _writeDistances(path, table)
+    except OSError as ex:
+        logging.warning("Unable to write distance cache '%s'. -- %s" % (path, ex))
+
+    return table
+
+def getWallsKey(layout):
+    """
+    Get a stable (across processes) key that identifies a layout's walls.
+    """
 
-    return distances
+    text = '%dx%d\n%s' % (layout.walls.getWidth(), layout.walls.getHeight(), str(layout.walls))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
 
 def getDistanceOnGrid(distances, pos1, pos2):
     key = (pos1, pos2)
@@ -154,3 +293,52 @@ def getDistanceOnGrid(distances, pos1, pos2):
         return distances[key]
 
     return DEFAULT_DISTANCE
+
+def _getTypecode(numCells):
+    """
+    Get the smallest array typecode that can hold every distance (and the unreachable marker).
+    """
+
+    for typecode in ['H', 'I', 'L']:
+        unreachable = (1 << (8 * array.array(typecode).itemsize)) - 1
+        if (numCells < unreachable):
+            return typecode, unreachable
+
+    raise ValueError('Layout is too large to compute distances on: %d cells.' % (numCells))
+
+def _getHeader(numCells, typecode):
+    header = CACHE_FILE_MAGIC + ('%s %s %d\n' % (sys.byteorder, typecode, numCells)).encode('ascii')
+
+    # Pad the header so the distances that follow are aligned.
+    return header + (b'\0' * (-len(header) % 8))
+
+def _readDistances(path, positions):
+    numCells = len(positions)
+    typecode, unreachable = _getTypecode(numCells)
+    header = _getHeader(numCells, typecode)
+
+    with open(path, 'rb') as file:
+        if (file.read(len(header)) != header):
+            raise ValueError('Cache file header does not match the layout.')
+
+        data = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+
+    distances = memoryview(data)[len(header):].cast(typecode)
+    if (len(distances) != numCells * numCells):
+        raise ValueError('Cache file is truncated.')
+
+    return DistanceTable(positions, distances, unreachable)
+
+def _writeDistances(path, table):
+    numCells = len(table.getPositions())
+    typecode = table._distances.typecode
+
+    os.makedirs(os.path.dirname(path), exist_ok = True)
+
+    # Write to a temp file and move it into place so concurrent runs never see a partial file.
+    tempPath = '%s.%d.tmp' % (path, os.getpid())
+    with open(tempPath, 'wb') as file:
+        file.write(_getHeader(numCells, typecode))
+        table._distances.tofile(file)
+
+    os.replace(tempPath, path)
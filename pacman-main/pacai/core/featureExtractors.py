@@ -1,8 +1,13 @@
 """
 Feature extractors for game states.
+
+Extractors return features as a dict (see `FeatureExtractor`).
+Extractors with a fixed set of features can also return them as dense vectors
+(see `VectorFeatureExtractor`), where each feature is always at the same index.
 """
 
 import abc
+from array import array
 
 from pacai.core.actions import Actions
 from pacai.core.search import search
@@ -24,6 +29,85 @@ class FeatureExtractor(abc.ABC):
 
         pass
 
+class FeatureSchema(object):
+    """
+    A fixed, ordered set of feature names,
+    mapping each feature to its index in a feature vector.
+    """
+
+    def __init__(self, names):
+        self._names = tuple(names)
+        self._indexes = {name: index for (index, name) in enumerate(self._names)}
+
+        if (len(self._indexes) != len(self._names)):
+            raise ValueError('Feature names must be unique: %s.' % (self._names,))
+
+    def getIndex(self, name):
+        return self._indexes[name]
+
+    def getNames(self):
+        return self._names
+
+    def newVector(self):
+        """
+        Get a vector of all zeros.
+        """
+
+        return array('d', [0.0]) * len(self._names)
+
+    def toDict(self, vector):
+        return {name: vector[index] for (index, name) in enumerate(self._names)}
+
+    def toVector(self, features):
+        """
+        Get the vector for a dict of features (features not in the dict are zero).
+        """
+
+        vector = self.newVector()
+        for (name, value) in features.items():
+            vector[self._indexes[name]] = value
+
+        return vector
+
+    def __len__(self):
+        return len(self._names)
+
+class VectorFeatureExtractor(FeatureExtractor):
+    """
+    An extractor with a fixed set of features (its schema),
+    that can return the features of a state as dense vectors
+    (`array('d')`, indexed by `VectorFeatureExtractor.getSchema`).
+
+    Children list their features in FEATURES
+    and implement `VectorFeatureExtractor.getFeatureVectors`,
+    which gets the vectors for all of a state's actions at once
+    (so work that only depends on the state is only done once).
+    """
+
+    FEATURES = []
+
+    @classmethod
+    def getSchema(cls):
+        # Each extractor class builds its schema once.
+        if ('_schema' not in cls.__dict__):
+            cls._schema = FeatureSchema(cls.FEATURES)
+
+        return cls._schema
+
+    @abc.abstractmethod
+    def getFeatureVectors(self, state, actions):
+        """
+        Returns a list with the feature vector for each of the actions.
+        """
+
+        pass
+
+    def getFeatureVector(self, state, action):
+        return self.getFeatureVectors(state, [action])[0]
+
+    def getFeatures(self, state, action):
+        return self.getSchema().toDict(self.getFeatureVector(state, action))
+
 class IdentityExtractor(FeatureExtractor):
     def getFeatures(self, state, action):
         feats = {}
@@ -31,40 +115,66 @@ class IdentityExtractor(FeatureExtractor):
 
         return feats
 
-class SimpleExtractor(FeatureExtractor):
+class SimpleExtractor(VectorFeatureExtractor):
     """
     Returns simple features for a basic reflex Pacman.
     """
 
+    FEATURES = [
+        'bias',
+        '#-of-ghosts-1-step-away',
+        'eats-food',
+        'closest-food',
+    ]
+
     def getFeatures(self, state, action):
-        # Extract the grid of food and wall locations and get the ghost locations.
-        food = state.getFood()
-        walls = state.getWalls()
-        ghosts = state.getGhostPositions()
+        return self._getFeatureDicts(state, [action])[0]
 
-        features = {}
-        features["bias"] = 1.0
+    def getFeatureVectors(self, state, actions):
+        schema = self.getSchema()
+        return [schema.toVector(features) for features in self._getFeatureDicts(state, actions)]
+
+    def _getFeatureDicts(self, state, actions):
+        """
+        Get the features (as a dict, which only has eats-food when food is eaten)
+        for each of the actions.
+        """
+
+        # Extract the wall locations and how many ghosts are 1-step away from every location.
+        walls = state.getWalls()
+        ghostNeighbors = {}
+        for ghost in state.getGhostPositions():
+            for neighbor in Actions.getLegalNeighbors(ghost, walls):
+                ghostNeighbors[neighbor] = ghostNeighbors.get(neighbor, 0) + 1
 
-        # Compute the location of pacman after he takes the action.
         x, y = state.getPacmanPosition()
-        dx, dy = Actions.directionToVector(action)
-        next_x, next_y = int(x + dx), int(y + dy)
+        area = walls.getWidth() * walls.getHeight()
+
+        featureDicts = []
+        for action in actions:
+            features = {}
+            features["bias"] = 1.0
+
+            # Compute the location of pacman after he takes the action.
+            dx, dy = Actions.directionToVector(action)
+            next_x, next_y = int(x + dx), int(y + dy)
+
+            # Count the number of ghosts 1-step away.
+            features["#-of-ghosts-1-step-away"] = ghostNeighbors.get((next_x, next_y), 0)
 
-        # Count the number of ghosts 1-step away.
-        features["#-of-ghosts-1-step-away"] = sum((next_x, next_y) in
-                Actions.getLegalNeighbors(g, walls) for g in ghosts)
+            # If there is no danger of ghosts then add the food feature.
+            if not features["#-of-ghosts-1-step-away"] and state.hasFood(next_x, next_y):
+                features["eats-food"] = 1.0
 
-        # If there is no danger of ghosts then add the food feature.
-        if not features["#-of-ghosts-1-step-away"] and food[next_x][next_y]:
-            features["eats-food"] = 1.0
+            prob = AnyFoodSearchProblem(state, start = (next_x, next_y))
+            dist = len(search.bfs(prob))
+            if dist is not None:
+                # Make the distance a number less than one otherwise the update will diverge wildly.
+                features["closest-food"] = float(dist) / area
 
-        prob = AnyFoodSearchProblem(state, start = (next_x, next_y))
-        dist = len(search.bfs(prob))
-        if dist is not None:
-            # Make the distance a number less than one otherwise the update will diverge wildly.
-            features["closest-food"] = float(dist) / (walls.getWidth() * walls.getHeight())
+            for key in features:
+                features[key] /= 10.0
 
-        for key in features:
-            features[key] /= 10.0
+            featureDicts.append(features)
 
-        return features
+        return featureDicts
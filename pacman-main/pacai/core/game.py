@@ -8,9 +8,20 @@ import time
 class Game:
     """
     The Game manages the control flow, soliciting actions from agents.
+
+    If the display does not need to see every move (see `pacai.ui.view.AbstractView.needsUpdates`),
+    then the game is run as a simulation:
+    the display is only shown the first and last states,
+    and moves are only timed when timeouts are enforced
+    (so agents will not get a move deadline, see `pacai.agents.base.BaseAgent.getMoveDeadline`).
+    Set `simulate` to force this on (True) or off (False).
+
+    If `replayWriter` is set to a started `pacai.core.replay.ReplayWriter`,
+    then each move is recorded to it as it is made.
     """
 
-    def __init__(self, agents, display, rules, startingIndex = 0, catchExceptions = False):
+    def __init__(self, agents, display, rules, startingIndex = 0, catchExceptions = False,
+            simulate = None):
         self.agentCrashed = False
         self.agents = agents
         self.display = display
@@ -25,6 +36,9 @@ class Game:
         self.enforceTimeouts = catchExceptions
         self.catchExceptions = catchExceptions
 
+        self.simulate = simulate
+        self.replayWriter = None
+
     def run(self):
         """
         Main control loop for game play.
@@ -35,11 +49,22 @@ class Game:
         agentIndex = self.startingIndex
         numAgents = len(self.agents)
 
+        simulate = self.simulate
+        if (simulate is None):
+            simulate = not self.display.needsUpdates()
+
+        # Moves only need to be timed if something is watching the clock.
+        timeMoves = (self.enforceTimeouts or not simulate)
+
         self.display.initialize(self.state)
 
         if (not self._registerInitialState()):
             return False
 
+        if (not timeMoves):
+            for agent in self.agents:
+                agent.setMoveDeadline(None)
+
         # Draw the initial frame.
         self.display.update(self.state)
 
@@ -48,7 +73,12 @@ class Game:
             agent = self.agents[agentIndex]
 
             action = None
-            startTime = time.time()
+
+            if (timeMoves):
+                startTime = time.time()
+
+                # Let the agent know how long it has to move.
+                agent.setMoveDeadline(self._getMoveDeadline(agentIndex, startTime))
 
             # Get an action from the agent.
             try:
@@ -61,14 +91,14 @@ class Game:
                 self._agentCrash(agentIndex, ex)
                 return False
 
-            timeTaken = time.time() - startTime
-            self.totalAgentTimes[agentIndex] += timeTaken
+            if (timeMoves):
+                timeTaken = time.time() - startTime
+                self.totalAgentTimes[agentIndex] += timeTaken
 
-            if (self._checkForTimeouts(agentIndex, timeTaken)):
-                return False
+                if (self._checkForTimeouts(agentIndex, timeTaken)):
+                    return False
 
             # Execute the action.
-            self.moveHistory.append((agentIndex, action))
             try:
                 self.state = self.state.generateSuccessor(agentIndex, action)
             except Exception as ex:
@@ -78,8 +108,14 @@ class Game:
                 self._agentCrash(agentIndex, ex)
                 return False
 
+            # Only moves that were actually made are kept, so a replay never holds an illegal move.
+            self.moveHistory.append((agentIndex, action))
+            if (self.replayWriter is not None):
+                self.replayWriter.recordMove(agentIndex, action)
+
             # Update the display.
-            self.display.update(self.state)
+            if (not simulate):
+                self.display.update(self.state)
 
             # Allow for game specific conditions (winning, losing, etc.).
             self.rules.process(self.state, self)
@@ -91,6 +127,10 @@ class Game:
             # Next agent.
             agentIndex = (agentIndex + 1) % numAgents
 
+        # Draw the final frame.
+        if (simulate):
+            self.display.update(self.state)
+
         if (not self._registerFinalState()):
             return False
 
@@ -108,6 +148,18 @@ class Game:
         self.agentCrashed = True
         self.rules.agentCrash(self, agentIndex)
 
+    def _getMoveDeadline(self, agentIndex, startTime):
+        """
+        Get the time by which the agent should return its move.
+        This is the time before a move gets a timeout warning,
+        or when the agent would run out of total time (whichever is first).
+        """
+
+        moveTime = self.rules.getMoveWarningTime(agentIndex)
+        remainingTime = self.rules.getMaxTotalTime(agentIndex) - self.totalAgentTimes[agentIndex]
+
+        return startTime + max(0, min(moveTime, remainingTime))
+
     def _checkForTimeouts(self, agentIndex, timeTaken):
         """
         Check if an agent timed out.
@@ -167,6 +219,8 @@ class Game:
             maxStartupTime = int(self.rules.getMaxStartupTime(agentIndex))
             startTime = time.time()
 
+            agent.setMoveDeadline(startTime + maxStartupTime)
+
             try:
                 agent.registerInitialState(self.state)
             except Exception as ex:
@@ -4,6 +4,7 @@ import copy
 from pacai.core.agentstate import AgentState
 from pacai.core.directions import Directions
 from pacai.util import util
+from pacai.util import zobrist
 
 class AbstractGameState(abc.ABC):
     """
@@ -37,13 +38,23 @@ class AbstractGameState(abc.ABC):
         self._capsules = layout.capsules.copy()
         self._lastCapsuleEaten = None
 
+        # A Zobrist hash of the food and capsules.
+        # Eating food or a capsule just XORs out that item's key,
+        # so hashing a successor never needs to look at the whole board.
+        self._boardHash = (zobrist.hashPositions(zobrist.FOOD, self._food.asList())
+                ^ zobrist.hashPositions(zobrist.CAPSULE, self._capsules))
+
         # An ordered list of locations that this state considers special.
         # A view may choose to specially represent these locations.
         self._highlightLocations = []
 
+        # Agent states are shared with the parent state until they are modified.
+        # Matches indexes with _agentStates, True if the agent state is owned by this state.
         self._agentStates = []
+        self._agentStatesCopied = []
         for (isPacman, position) in layout.agentPositions:
             self._agentStates.append(AgentState(position, Directions.STOP, isPacman))
+            self._agentStatesCopied.append(True)
 
         self._score = 0
 
@@ -64,6 +75,36 @@ class AbstractGameState(abc.ABC):
 
         pass
 
+    def generateSuccessors(self, agentIndex, actions = None):
+        """
+        Returns a list of (action, successor) pairs for the specified agent,
+        one for each of the given actions (all of the agent's legal actions by default).
+
+        This gives the same successors as calling generateSuccessor() for each action,
+        but the legal actions are only computed once for all of the children
+        instead of once per child.
+        """
+
+        if (self.isOver()):
+            raise RuntimeError("Can't generate successors of a terminal state.")
+
+        legalActions = self.getLegalActions(agentIndex)
+
+        if (actions is None):
+            actions = legalActions
+        else:
+            for action in actions:
+                if (action not in legalActions):
+                    raise ValueError('Illegal action: ' + str(action))
+
+        successors = []
+        for action in actions:
+            successor = self._initSuccessor()
+            successor._applySuccessorAction(agentIndex, action, checkLegal = False)
+            successors.append((action, successor))
+
+        return successors
+
     def addScore(self, score):
         self._hash = None
         self._score += score
@@ -82,6 +123,7 @@ class AbstractGameState(abc.ABC):
 
         self._capsules.remove((x, y))
         self._lastCapsuleEaten = (x, y)
+        self._boardHash ^= zobrist.getKey(zobrist.CAPSULE, x, y)
 
         self._hash = None
         return True
@@ -98,8 +140,9 @@ class AbstractGameState(abc.ABC):
             self._food = self._food.copy()
             self._foodCopied = True
 
-        self._food[x][y] = False
+        self._food.set(x, y, False)
         self._lastFoodEaten = (x, y)
+        self._boardHash ^= zobrist.getKey(zobrist.FOOD, x, y)
 
         self._hash = None
         return True
@@ -125,6 +168,11 @@ class AbstractGameState(abc.ABC):
         return tuple(int(pos) for pos in position)
 
     def getAgentState(self, index):
+        """
+        Get the state of an agent.
+        The returned state may be shared with other game states and should not be modified.
+        """
+
         return self._agentStates[index]
 
     def getAgentStates(self):
@@ -149,6 +197,15 @@ class AbstractGameState(abc.ABC):
 
         return self._food.copy()
 
+    def getFoodBits(self):
+        """
+        Get the food as a packed integer (see `pacai.core.grid.BitGrid`) without copying the grid.
+        Two states on the same layout have food in different places
+        wherever the bits of their food differ.
+        """
+
+        return self._food.getBits()
+
     def getHighlightLocations(self):
         return self._highlightLocations
 
@@ -173,6 +230,27 @@ class AbstractGameState(abc.ABC):
     def getLastFoodEaten(self):
         return self._lastFoodEaten
 
+    def getMazeGraph(self):
+        """
+        Get the `pacai.core.mazeGraph.MazeGraph` of the board,
+        which can tell how deep into a dead end or along a corridor any position is.
+        """
+
+        return self._layout.getMazeGraph()
+
+    def getMutableAgentState(self, index):
+        """
+        Get the state of an agent that can be modified without affecting any other game state.
+        This is meant for the game rules when applying actions,
+        the agent state will be copied the first time this is called on a successor.
+        """
+
+        if (not self._agentStatesCopied[index]):
+            self._agentStates[index] = self._agentStates[index].copy()
+            self._agentStatesCopied[index] = True
+
+        return self._agentStates[index]
+
     def getNumAgents(self):
         return len(self._agentStates)
 
@@ -217,7 +295,7 @@ class AbstractGameState(abc.ABC):
         Returns true if the location (x, y) has food.
         """
 
-        return self._food[x][y]
+        return self._food.get(x, y)
 
     def hasWall(self, x, y):
         """
@@ -242,6 +320,15 @@ class AbstractGameState(abc.ABC):
         self._score = score
         self._hash = None
 
+    @abc.abstractmethod
+    def _applySuccessorAction(self, agentIndex, action, checkLegal = True):
+        """
+        Apply the action to the context state (self).
+        If checkLegal is False, the caller has already verified that the action is legal.
+        """
+
+        pass
+
     def _initSuccessor(self):
         """
         Get a state that will eventually serve as a successor.
@@ -256,8 +343,9 @@ class AbstractGameState(abc.ABC):
         successor._foodCopied = False
         successor._capsulesCopied = False
 
-        # Agent states need to be deep copied.
-        successor._agentStates = [agentState.copy() for agentState in self._agentStates]
+        # Share the agent states, they will be copied on write (see getMutableAgentState()).
+        successor._agentStates = self._agentStates.copy()
+        successor._agentStatesCopied = [False] * len(self._agentStates)
 
         return successor
 
@@ -289,7 +377,13 @@ class AbstractGameState(abc.ABC):
 
     def __hash__(self):
         if (self._hash is None):
-            self._hash = util.buildHash(self._score, self._gameover, self._win, *self._capsules,
-                self._food, *self._agentStates, self._layout)
+            # Agents keep their own hash up-to-date, so this is constant time for a fixed
+            # number of agents.
+            agentsHash = 0
+            for (index, agentState) in enumerate(self._agentStates):
+                agentsHash ^= hash((index, agentState))
+
+            self._hash = util.buildHash(self._score, self._gameover, self._win,
+                self._boardHash, agentsHash, self._layout)
 
         return self._hash
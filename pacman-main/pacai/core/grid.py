@@ -34,12 +34,18 @@ class Grid:
     def deepCopy(self):
         return self.copy()
 
+    def get(self, x, y):
+        return self._data[x][y]
+
     def getHeight(self):
         return self._height
 
     def getWidth(self):
         return self._width
 
+    def set(self, x, y, value):
+        self._data[x][y] = value
+
     def shallowCopy(self):
         grid = Grid(self._width, self._height)
         grid._data = self._data
@@ -55,6 +61,9 @@ class Grid:
         if (other is None):
             return False
 
+        if (isinstance(other, BitGrid)):
+            return other == self
+
         return self._data == other._data
 
     def __getitem__(self, i):
@@ -82,3 +91,196 @@ class Grid:
         out = [[str(self._data[x][y])[0] for x in range(self._width)] for y in range(self._height)]
         out.reverse()
         return '\n'.join([''.join(x) for x in out])
+
+class BitGrid:
+    """
+    A 2-dimensional array of booleans packed into a single integer (a bitboard).
+    This has the same interface as `Grid` (data is accessed via grid[x][y]),
+    but counting, copying, hashing, and comparing are all done on a single int
+    instead of walking every cell.
+
+    The cell (x, y) is stored in bit (x * height + y).
+    This is the same order that `Grid.__hash__` uses,
+    so a BitGrid will hash the same as a Grid with the same contents.
+    """
+
+    def __init__(self, width, height, initialValue = False):
+        if (not isinstance(initialValue, bool)):
+            raise ValueError('Grids can only contain booleans')
+
+        self._width = width
+        self._height = height
+
+        self._bits = 0
+        if (initialValue):
+            self._bits = self._fullMask()
+
+        # Column views are built lazily and reused, since grid[x][y] is the hot path.
+        self._columns = None
+
+    @staticmethod
+    def fromBits(width, height, bits):
+        """
+        Build a grid directly from a packed integer.
+        """
+
+        grid = BitGrid(width, height)
+        grid._bits = bits
+        return grid
+
+    @staticmethod
+    def fromGrid(other):
+        """
+        Build a bitboard with the same contents as another grid.
+        """
+
+        if (isinstance(other, BitGrid)):
+            return other.copy()
+
+        grid = BitGrid(other.getWidth(), other.getHeight())
+        for (x, y) in other.asList(True):
+            grid.set(x, y, True)
+
+        return grid
+
+    def asList(self, key = True):
+        bits = self._bits
+        if (not key):
+            bits = self._fullMask() & ~bits
+
+        values = []
+        while (bits != 0):
+            lowBit = bits & -bits
+            index = lowBit.bit_length() - 1
+            values.append((index // self._height, index % self._height))
+            bits ^= lowBit
+
+        return values
+
+    def copy(self):
+        return BitGrid.fromBits(self._width, self._height, self._bits)
+
+    def count(self, item = True):
+        numSet = bin(self._bits).count('1')
+        if (item):
+            return numSet
+
+        return self._width * self._height - numSet
+
+    def deepCopy(self):
+        return self.copy()
+
+    def get(self, x, y):
+        return ((self._bits >> (x * self._height + y)) & 1) == 1
+
+    def getBits(self):
+        """
+        Get the packed integer that backs this grid.
+        """
+
+        return self._bits
+
+    def getHeight(self):
+        return self._height
+
+    def getWidth(self):
+        return self._width
+
+    def set(self, x, y, value):
+        bit = 1 << (x * self._height + y)
+        if (value):
+            self._bits |= bit
+        else:
+            self._bits &= ~bit
+
+    def shallowCopy(self):
+        """
+        Ints are immutable, so a bitboard cannot share storage with another grid.
+        This is the same as `BitGrid.copy`.
+        """
+
+        return self.copy()
+
+    def _checkX(self, x):
+        if (x < 0):
+            x += self._width
+
+        if (x < 0 or x >= self._width):
+            raise IndexError('Grid column out of range: %d' % (x))
+
+        return x
+
+    def _fullMask(self):
+        return (1 << (self._width * self._height)) - 1
+
+    def __eq__(self, other):
+        if (other is None):
+            return False
+
+        if (isinstance(other, BitGrid)):
+            return (self._bits == other._bits
+                    and self._width == other._width
+                    and self._height == other._height)
+
+        if (self._width != other.getWidth() or self._height != other.getHeight()):
+            return False
+
+        return self.asList(True) == other.asList(True)
+
+    def __getitem__(self, x):
+        if (self._columns is None):
+            self._columns = [_BitGridColumn(self, i) for i in range(self._width)]
+
+        return self._columns[x]
+
+    def __hash__(self):
+        return hash(self._bits)
+
+    def __lt__(self, other):
+        return self.__hash__() < other.__hash__()
+
+    def __setitem__(self, x, column):
+        x = self._checkX(x)
+        for y in range(self._height):
+            self.set(x, y, column[y])
+
+    def __str__(self):
+        out = [[str(self.get(x, y))[0] for x in range(self._width)] for y in range(self._height)]
+        out.reverse()
+        return '\n'.join([''.join(x) for x in out])
+
+class _BitGridColumn:
+    """
+    A view of a single column (fixed x) of a `BitGrid`.
+    This is what allows the grid[x][y] syntax on a bitboard.
+    """
+
+    __slots__ = ('_grid', '_x')
+
+    def __init__(self, grid, x):
+        self._grid = grid
+        self._x = x
+
+    def _checkY(self, y):
+        height = self._grid._height
+
+        if (y < 0):
+            y += height
+
+        if (y < 0 or y >= height):
+            raise IndexError('Grid row out of range: %d' % (y))
+
+        return y
+
+    def __getitem__(self, y):
+        grid = self._grid
+        if (y < 0 or y >= grid._height):
+            y = self._checkY(y)
+
+        return ((grid._bits >> (self._x * grid._height + y)) & 1) == 1
+
+    def __len__(self):
+        return self._grid._height
+
+    def __setitem__(self, y, value):
+        self._grid.set(self._x, self._checkY(y), value)
@@ -1,8 +1,9 @@
 import os
 import random
 
+from pacai.core import mazeGraph
 from pacai.core.distance import manhattan
-from pacai.core.grid import Grid
+from pacai.core.grid import BitGrid
 
 # By default, the layout directory is adjacent to this file.
 DEFAULT_LAYOUT_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'layouts')
@@ -17,15 +18,30 @@ class Layout(object):
     def __init__(self, layoutText, maxGhosts = None):
         self.width = len(layoutText[0])
         self.height = len(layoutText)
-        self.walls = Grid(self.width, self.height, initialValue = False)
-        self.food = Grid(self.width, self.height, initialValue = False)
+        self.walls = BitGrid(self.width, self.height, initialValue = False)
+        self.food = BitGrid(self.width, self.height, initialValue = False)
         self.capsules = []
         self.agentPositions = []
         self.numGhosts = 0
         self.layoutText = layoutText
 
+        # Built the first time it is needed, see getMazeGraph().
+        self._mazeGraph = None
+
         self.processLayoutText(layoutText, maxGhosts)
 
+    def getMazeGraph(self):
+        """
+        Get the `pacai.core.mazeGraph.MazeGraph` (junctions, corridors, and dead ends)
+        of this layout.
+        The graph is built once and shared with every other layout that has the same walls.
+        """
+
+        if (self._mazeGraph is None):
+            self._mazeGraph = mazeGraph.getMazeGraph(self.walls)
+
+        return self._mazeGraph
+
     def getNumGhosts(self):
         return self.numGhosts
 
@@ -0,0 +1,218 @@
+"""
+A compressed graph of a maze.
+
+Most open cells in a maze are corridor cells with exactly two open neighbors.
+A `MazeGraph` only keeps the other cells (junctions and dead ends) as nodes,
+joined by edges weighted with the length of the corridor between them.
+Every cell also knows which corridor it is in, and how deep into a dead end it is,
+so those questions are just lookups.
+"""
+
+from pacai.core.directions import Directions
+from pacai.util.gridCache import GridCache
+
+class MazeGraph(object):
+    """
+    The junctions, dead ends, and corridors of a set of walls.
+    Build these with `getMazeGraph` (or `pacai.core.layout.Layout.getMazeGraph`),
+    so the graph is only built once for each set of walls.
+
+    Nodes are the open cells that do not have exactly two open neighbors.
+    A loop of corridor cells without any junction gets one of its cells as a node.
+
+    A dead end is any cell that can only be left through a single cell:
+    the cells that are left after repeatedly removing cells with at most one open neighbor
+    are not in a dead end (they are on a loop, or between loops).
+    """
+
+    def __init__(self, walls):
+        positions = walls.asList(False)
+        openPositions = set(positions)
+
+        # {position: [(action, neighbor), ...]}.
+        self._neighbors = {}
+        for (x, y) in positions:
+            self._neighbors[(x, y)] = [(action, (x + dx, y + dy))
+                    for (action, (dx, dy)) in _STEPS if (x + dx, y + dy) in openPositions]
+
+        # {node: [(other node, corridor length, first action), ...]}.
+        self._edges = {}
+
+        # {corridor cell: (end node, distance, other end node, distance)}.
+        self._corridors = {}
+
+        # {position: (dead end depth, exit)}, for cells in a dead end.
+        self._deadEnds = {}
+
+        for position in positions:
+            if (len(self._neighbors[position]) != 2):
+                self._edges[position] = []
+
+        for node in list(self._edges):
+            self._walkCorridors(node)
+
+        # Whatever is not yet covered is on a loop without any junctions.
+        for position in positions:
+            if (position not in self._edges and position not in self._corridors):
+                self._edges[position] = []
+                self._walkCorridors(position)
+
+        self._findDeadEnds(positions)
+
+    def getCorridor(self, position):
+        """
+        Get the corridor an open cell is in as: (end node, distance, other end node, distance).
+        A node is its own corridor: (node, 0, node, 0).
+        """
+
+        if (position in self._edges):
+            return (position, 0, position, 0)
+
+        return self._corridors[position]
+
+    def getDeadEndDepth(self, position):
+        """
+        Get how many moves it takes to leave the dead end an open cell is in,
+        or zero if the cell is not in a dead end.
+        """
+
+        deadEnd = self._deadEnds.get(position)
+        if (deadEnd is None):
+            return 0
+
+        return deadEnd[0]
+
+    def getDeadEndExit(self, position):
+        """
+        Get the cell just outside of the dead end an open cell is in.
+        This is None for cells that are not in a dead end,
+        and for parts of the maze that have no loops at all (so there is no outside).
+        """
+
+        deadEnd = self._deadEnds.get(position)
+        if (deadEnd is None):
+            return None
+
+        return deadEnd[1]
+
+    def getEdges(self, node):
+        """
+        Get the corridors leaving a node as: [(other node, length, first action), ...].
+        A corridor that comes back to the same node is listed once for each way it leaves.
+        """
+
+        return self._edges[node]
+
+    def getExits(self, position):
+        """
+        Get the number of open neighbors of an open cell.
+        """
+
+        return len(self._neighbors[position])
+
+    def getNodes(self):
+        return list(self._edges)
+
+    def isDeadEnd(self, position):
+        return position in self._deadEnds
+
+    def isNode(self, position):
+        return position in self._edges
+
+    def _findDeadEnds(self, positions):
+        degrees = {position: len(self._neighbors[position]) for position in positions}
+
+        # Peel away cells with at most one neighbor left until only loops remain.
+        leaves = [position for position in positions if degrees[position] <= 1]
+        peeled = set()
+        order = []
+
+        while (len(leaves) > 0):
+            position = leaves.pop()
+            if (position in peeled):
+                continue
+
+            peeled.add(position)
+            order.append(position)
+
+            for (_, neighbor) in self._neighbors[position]:
+                if (neighbor not in peeled):
+                    degrees[neighbor] -= 1
+                    if (degrees[neighbor] <= 1):
+                        leaves.append(neighbor)
+
+        # Measure depths from the cells left over.
+        frontier = []
+        for position in positions:
+            if (position in peeled):
+                continue
+
+            for (_, neighbor) in self._neighbors[position]:
+                if (neighbor in peeled and neighbor not in self._deadEnds):
+                    self._deadEnds[neighbor] = (1, position)
+                    frontier.append(neighbor)
+
+        self._spreadDeadEnds(frontier, peeled)
+
+        # Parts of the maze without any loops get peeled away completely,
+        # their depths are measured from the last cell to be peeled.
+        for position in reversed(order):
+            if (position not in self._deadEnds):
+                self._deadEnds[position] = (1, None)
+                self._spreadDeadEnds([position], peeled)
+
+    def _spreadDeadEnds(self, frontier, peeled):
+        while (len(frontier) > 0):
+            nextFrontier = []
+
+            for position in frontier:
+                (depth, exit) = self._deadEnds[position]
+
+                for (_, neighbor) in self._neighbors[position]:
+                    if (neighbor in peeled and neighbor not in self._deadEnds):
+                        self._deadEnds[neighbor] = (depth + 1, exit)
+                        nextFrontier.append(neighbor)
+
+            frontier = nextFrontier
+
+    def _walkCorridors(self, node):
+        """
+        Follow every corridor out of a node to the node at its other end.
+        """
+
+        for (action, position) in self._neighbors[node]:
+            cells = []
+            previous = node
+
+            while (position not in self._edges):
+                cells.append(position)
+
+                for (_, neighbor) in self._neighbors[position]:
+                    if (neighbor != previous):
+                        break
+
+                previous = position
+                position = neighbor
+
+            length = len(cells) + 1
+            self._edges[node].append((position, length, action))
+
+            for (i, cell) in enumerate(cells):
+                self._corridors[cell] = (node, i + 1, position, length - (i + 1))
+
+_STEPS = [
+    (Directions.NORTH, (0, 1)),
+    (Directions.SOUTH, (0, -1)),
+    (Directions.EAST, (1, 0)),
+    (Directions.WEST, (-1, 0)),
+]
+
+# Graphs shared by every layout in this process, keyed by walls.
+graphMap = GridCache()
+
+def getMazeGraph(walls):
+    """
+    Get the `MazeGraph` for a set of walls, only building it the first time the walls are seen.
+    """
+
+    return graphMap.get(walls, lambda: MazeGraph(walls))
@@ -1,6 +1,27 @@
 import abc
+from array import array
 
 class MarkovDecisionProcess(abc.ABC):
+    def __init__(self):
+        self._version = 0
+
+    def getVersion(self):
+        """
+        Get a number that changes whenever the actions, transitions, or rewards of this MDP change
+        (e.g. when a parameter is set).
+        Anything cached from the MDP (see `CachedMDP`) is only good for the same version.
+        """
+
+        return self._version
+
+    def markChanged(self):
+        """
+        Signal that the actions, transitions, or rewards of this MDP have changed.
+        Children should call this from any method that changes them.
+        """
+
+        self._version += 1
+
     @abc.abstractmethod
     def getStates(self):
         """
@@ -48,6 +69,16 @@ class MarkovDecisionProcess(abc.ABC):
 
         pass
 
+    def getTransitionModel(self):
+        """
+        Get all the states, actions, transitions, and rewards of this MDP as a `TransitionModel`.
+        The model is built once (from the methods above), so solvers do not have to call back into
+        the MDP for every backup (see `pacai.core.valueIteration`).
+        Like `MarkovDecisionProcess.getStates`, this is not generally possible for large MDPs.
+        """
+
+        return TransitionModel(self)
+
     @abc.abstractmethod
     def isTerminal(self, state):
         """
@@ -59,3 +90,230 @@ class MarkovDecisionProcess(abc.ABC):
         """
 
         pass
+
+class CachedMDP(MarkovDecisionProcess):
+    """
+    Wrap another MDP and remember everything it answers,
+    so each (state, action) pair is only ever computed once.
+    Everything is forgotten whenever the wrapped MDP changes
+    (see `MarkovDecisionProcess.getVersion`),
+    so parameters can still be set on either the wrapper or the wrapped MDP.
+    Anything else (e.g. setters or a grid) is passed through to the wrapped MDP.
+
+    Returned lists are shared between calls, so callers should not modify them.
+    """
+
+    def __init__(self, mdp):
+        super().__init__()
+
+        self._mdp = mdp
+        self._clear()
+
+    def getMDP(self):
+        return self._mdp
+
+    # Override
+    def getVersion(self):
+        return self._mdp.getVersion()
+
+    # Override
+    def markChanged(self):
+        self._mdp.markChanged()
+
+    # Override
+    def getStates(self):
+        self._checkVersion()
+
+        if (self._states is None):
+            self._states = self._mdp.getStates()
+
+        return self._states
+
+    # Override
+    def getStartState(self):
+        self._checkVersion()
+
+        if (self._startState is None):
+            self._startState = self._mdp.getStartState()
+
+        return self._startState
+
+    # Override
+    def getPossibleActions(self, state):
+        self._checkVersion()
+
+        actions = self._actions.get(state)
+        if (actions is None):
+            actions = self._mdp.getPossibleActions(state)
+            self._actions[state] = actions
+
+        return actions
+
+    # Override
+    def getTransitionStatesAndProbs(self, state, action):
+        self._checkVersion()
+
+        key = (state, action)
+        transitions = self._transitions.get(key)
+        if (transitions is None):
+            transitions = self._mdp.getTransitionStatesAndProbs(state, action)
+            self._transitions[key] = transitions
+
+        return transitions
+
+    # Override
+    def getReward(self, state, action, nextState):
+        self._checkVersion()
+
+        key = (state, action, nextState)
+        reward = self._rewards.get(key)
+        if (reward is None):
+            reward = self._mdp.getReward(state, action, nextState)
+            self._rewards[key] = reward
+
+        return reward
+
+    # Override
+    def getTransitionModel(self):
+        self._checkVersion()
+
+        if (self._model is None):
+            self._model = TransitionModel(self)
+
+        return self._model
+
+    # Override
+    def isTerminal(self, state):
+        self._checkVersion()
+
+        terminal = self._terminal.get(state)
+        if (terminal is None):
+            terminal = self._mdp.isTerminal(state)
+            self._terminal[state] = terminal
+
+        return terminal
+
+    def _checkVersion(self):
+        if (self._cachedVersion != self._mdp.getVersion()):
+            self._clear()
+
+    def _clear(self):
+        self._cachedVersion = self._mdp.getVersion()
+
+        self._states = None
+        self._startState = None
+        self._model = None
+
+        self._actions = {}
+        self._transitions = {}
+        self._rewards = {}
+        self._terminal = {}
+
+    def __getattr__(self, name):
+        # Only called for attributes the wrapper does not have.
+        if (name == '_mdp'):
+            raise AttributeError(name)
+
+        return getattr(self._mdp, name)
+
+class TransitionModel(object):
+    """
+    A compiled copy of a `MarkovDecisionProcess` with states and actions numbered,
+    and transitions stored as a sparse (state, action, nextState) tensor in flat arrays.
+
+    States are numbered in the order of `MarkovDecisionProcess.getStates`.
+    Every (state, action) pair gets a row, and the rows of state i are
+    `actionStarts[i]` up to (but not including) `actionStarts[i + 1]`
+    (in the order of `MarkovDecisionProcess.getPossibleActions`).
+    The transitions of row r are the entries `rowStarts[r]` up to `rowStarts[r + 1]`,
+    where entry e goes to state `nextStates[e]` with probability `probs[e]`
+    and reward `rewards[e]`.
+
+    A model does not notice changes to its MDP, a new one has to be built.
+    """
+
+    def __init__(self, mdp):
+        self.states = list(mdp.getStates())
+        self.stateIndexes = {state: index for (index, state) in enumerate(self.states)}
+
+        self.terminal = [mdp.isTerminal(state) for state in self.states]
+
+        # The actions of each state (the action of each row, grouped by state).
+        self.actions = []
+
+        self.actionStarts = array('l', [0])
+        self.rowStarts = array('l', [0])
+
+        self.nextStates = array('l')
+        self.probs = array('d')
+        self.rewards = array('d')
+
+        for index in range(len(self.states)):
+            state = self.states[index]
+
+            actions = ()
+            if (not self.terminal[index]):
+                actions = tuple(mdp.getPossibleActions(state))
+
+            for action in actions:
+                for (nextState, prob) in mdp.getTransitionStatesAndProbs(state, action):
+                    self.nextStates.append(self.stateIndexes[nextState])
+                    self.probs.append(prob)
+                    self.rewards.append(mdp.getReward(state, action, nextState))
+
+                self.rowStarts.append(len(self.nextStates))
+
+            self.actions.append(actions)
+            self.actionStarts.append(len(self.rowStarts) - 1)
+
+        # Built when first asked for.
+        self._predecessors = None
+
+    def getActions(self, stateIndex):
+        return self.actions[stateIndex]
+
+    def getPredecessors(self):
+        """
+        Get the states that can reach each state in a single transition,
+        as a list (by state number) of sets of state numbers.
+        """
+
+        if (self._predecessors is None):
+            self._predecessors = [set() for _ in range(len(self.states))]
+
+            for stateIndex in range(len(self.states)):
+                firstEntry = self.rowStarts[self.actionStarts[stateIndex]]
+                lastEntry = self.rowStarts[self.actionStarts[stateIndex + 1]]
+
+                for entry in range(firstEntry, lastEntry):
+                    if (self.probs[entry] > 0.0):
+                        self._predecessors[self.nextStates[entry]].add(stateIndex)
+
+        return self._predecessors
+
+    def getNumRows(self):
+        return len(self.rowStarts) - 1
+
+    def getNumStates(self):
+        return len(self.states)
+
+    def getRow(self, stateIndex, action):
+        """
+        Get the row for taking the action in the state.
+        """
+
+        actions = self.actions[stateIndex]
+        if (action not in actions):
+            raise ValueError("Action '%s' is not possible in state %s." %
+                    (action, self.states[stateIndex]))
+
+        return self.actionStarts[stateIndex] + actions.index(action)
+
+    def getState(self, stateIndex):
+        return self.states[stateIndex]
+
+    def getStateIndex(self, state):
+        return self.stateIndexes[state]
+
+    def hasState(self, state):
+        return state in self.stateIndexes
@@ -0,0 +1,436 @@
+"""
+A compact, streaming format for recorded games (replays).
+
+A replay file holds any number of games, one after another.
+Each game is stored as:
+```
+    'G'
+    varint header length, header (UTF-8 JSON: the layout text, number of ghosts, and game info)
+    move chunks, each: varint chunk length, chunk (varint-encoded moves)
+    varint 0 (end of the moves)
+    varint number of moves
+```
+A move (agentIndex, action) is encoded as the varint (agentIndex * len(ACTIONS) + action code),
+so a move by any of the first few agents takes a single byte.
+Moves are written in chunks as the game is played, so a game does not have to be held in memory.
+
+Next to each replay file is an index file (the replay path + INDEX_SUFFIX)
+holding the offset of each finished game,
+so a single game can be read without decoding the ones before it.
+If the index is missing, it is rebuilt by skipping over the games (without decoding any moves).
+
+Unlike pickle, loading a replay never runs any code.
+
+The states of a recorded game can be visited in any order with a `ReplaySeeker`.
+"""
+
+import json
+import os
+import struct
+
+from pacai.core.directions import Directions
+from pacai.core.layout import Layout
+
+MAGIC = b'PACR0001'
+INDEX_MAGIC = b'PACI0001'
+INDEX_SUFFIX = '.index'
+
+GAME_TAG = b'G'
+
+# Index entries are little-endian 64 bit offsets.
+INDEX_ENTRY = struct.Struct('<Q')
+
+# The order of actions here is part of the format, only ever append to it.
+ACTIONS = [
+    Directions.NORTH,
+    Directions.SOUTH,
+    Directions.EAST,
+    Directions.WEST,
+    Directions.STOP,
+]
+
+ACTION_CODES = {action: code for (code, action) in enumerate(ACTIONS)}
+
+# Buffered moves are written out once they reach this many bytes.
+CHUNK_SIZE = 4096
+
+# By default, a ReplaySeeker keeps a state every this many plies.
+DEFAULT_SNAPSHOT_INTERVAL = 100
+
+class ReplayWriter(object):
+    """
+    Write games to a replay file as they are played.
+
+    A game is started with `ReplayWriter.startGame`, its moves are added with
+    `ReplayWriter.recordMove` (see `pacai.core.game.Game.replayWriter`),
+    and it is finished (and added to the index) with `ReplayWriter.endGame`.
+    A game that is never finished is dropped from the file.
+    """
+
+    def __init__(self, path, append = False):
+        self._path = path
+        self._indexPath = path + INDEX_SUFFIX
+
+        if (not append or not os.path.isfile(path)):
+            with open(path, 'wb') as file:
+                file.write(MAGIC)
+
+            with open(self._indexPath, 'wb') as file:
+                file.write(INDEX_MAGIC)
+        else:
+            # Drop anything after the last finished game (e.g. from a writer that was killed).
+            offsets, end = _scanOffsets(path)
+            os.truncate(path, end)
+            _writeIndex(self._indexPath, offsets)
+
+        self._file = open(path, 'ab')
+        self._gameOffset = None
+        self._chunk = bytearray()
+        self._numMoves = 0
+
+    def close(self):
+        if (self._file is None):
+            return
+
+        self._file.close()
+        self._file = None
+
+        if (self._gameOffset is not None):
+            os.truncate(self._path, self._gameOffset)
+            self._gameOffset = None
+
+    def getPath(self):
+        return self._path
+
+    def startGame(self, layout, info = None):
+        """
+        Start a new game on the given `pacai.core.layout.Layout`.
+        The info is a JSON-compatible dict of anything else needed to replay the game.
+        """
+
+        if (self._gameOffset is not None):
+            raise ValueError('The previous game has not been finished.')
+
+        header = {
+            'layout': list(layout.layoutText),
+            'numGhosts': layout.getNumGhosts(),
+            'info': info or {},
+        }
+        header = json.dumps(header).encode('utf-8')
+
+        self._gameOffset = self._file.tell()
+        self._chunk = bytearray()
+        self._numMoves = 0
+
+        self._file.write(GAME_TAG)
+        self._file.write(_encodeVarint(len(header)))
+        self._file.write(header)
+
+    def recordMove(self, agentIndex, action):
+        if (self._gameOffset is None):
+            raise ValueError('A game must be started before moves can be recorded.')
+
+        if (action not in ACTION_CODES):
+            raise ValueError("Cannot record unknown action: '%s'." % (action))
+
+        _appendVarint(self._chunk, agentIndex * len(ACTIONS) + ACTION_CODES[action])
+        self._numMoves += 1
+
+        if (len(self._chunk) >= CHUNK_SIZE):
+            self._flushChunk()
+
+    def endGame(self):
+        if (self._gameOffset is None):
+            raise ValueError('There is no game to finish.')
+
+        self._flushChunk()
+        self._file.write(_encodeVarint(0))
+        self._file.write(_encodeVarint(self._numMoves))
+        self._file.flush()
+
+        with open(self._indexPath, 'ab') as file:
+            file.write(INDEX_ENTRY.pack(self._gameOffset))
+
+        self._gameOffset = None
+
+    def writeGame(self, layout, info, moves):
+        """
+        Write out an entire game at once.
+        The moves are a list of (agentIndex, action), e.g. `pacai.core.game.Game.moveHistory`.
+        """
+
+        self.startGame(layout, info)
+
+        for (agentIndex, action) in moves:
+            self.recordMove(agentIndex, action)
+
+        self.endGame()
+
+    def _flushChunk(self):
+        if (len(self._chunk) == 0):
+            return
+
+        self._file.write(_encodeVarint(len(self._chunk)))
+        self._file.write(self._chunk)
+        self._chunk = bytearray()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exceptionType, exceptionValue, traceback):
+        self.close()
+
+class ReplayReader(object):
+    """
+    Read games from a replay file written by a `ReplayWriter`.
+    Games are numbered in the order they were written (negative indexes count from the end).
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._file = open(path, 'rb')
+
+        if (self._file.read(len(MAGIC)) != MAGIC):
+            self._file.close()
+            raise ValueError("'%s' is not a replay file." % (path))
+
+        indexPath = path + INDEX_SUFFIX
+        if (not os.path.isfile(indexPath)):
+            _writeIndex(indexPath, _scanOffsets(path)[0])
+
+        self._offsets = _readIndex(indexPath)
+
+    def close(self):
+        self._file.close()
+
+    def getInfo(self, index):
+        return self._readHeader(index)['info']
+
+    def getLayout(self, index):
+        header = self._readHeader(index)
+        return Layout(header['layout'], maxGhosts = header['numGhosts'])
+
+    def getMoves(self, index):
+        return list(self.iterMoves(index))
+
+    def getNumGames(self):
+        return len(self._offsets)
+
+    def iterMoves(self, index):
+        """
+        Generate the (agentIndex, action) moves of a game, decoding a chunk at a time.
+        """
+
+        self._seekGame(index)
+        headerLength = _readVarint(self._file)
+        self._file.seek(headerLength, os.SEEK_CUR)
+
+        numActions = len(ACTIONS)
+
+        while (True):
+            chunkLength = _readVarint(self._file)
+            if (chunkLength == 0):
+                break
+
+            chunk = self._file.read(chunkLength)
+            if (len(chunk) != chunkLength):
+                raise ValueError('Replay file is truncated.')
+
+            # Other reads may move the file while moves are being generated.
+            nextChunk = self._file.tell()
+
+            value = 0
+            shift = 0
+            for byte in chunk:
+                value |= (byte & 0x7F) << shift
+                if (byte & 0x80):
+                    shift += 7
+                    continue
+
+                yield (value // numActions, ACTIONS[value % numActions])
+                value = 0
+                shift = 0
+
+            self._file.seek(nextChunk)
+
+    def _readHeader(self, index):
+        self._seekGame(index)
+        headerLength = _readVarint(self._file)
+        return json.loads(self._file.read(headerLength).decode('utf-8'))
+
+    def _seekGame(self, index):
+        if (index < -len(self._offsets) or index >= len(self._offsets)):
+            raise IndexError('Replay file has %d games, cannot read game %d.' %
+                    (len(self._offsets), index))
+
+        self._file.seek(self._offsets[index])
+        if (self._file.read(len(GAME_TAG)) != GAME_TAG):
+            raise ValueError('Replay index does not point to a game.')
+
+    def __len__(self):
+        return self.getNumGames()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exceptionType, exceptionValue, traceback):
+        self.close()
+
+class ReplaySeeker(object):
+    """
+    Random access to the states of a recorded game.
+
+    The state at ply N is the state after the first N moves have been made
+    (ply 0 is the initial state).
+    A snapshot of the state is kept every `interval` plies (as they are first reached),
+    so going to any ply takes at most `interval - 1` successors from the nearest snapshot before it.
+    """
+
+    def __init__(self, initialState, moves, interval = DEFAULT_SNAPSHOT_INTERVAL):
+        if (int(interval) < 1):
+            raise ValueError('The snapshot interval must be at least 1.')
+
+        self._moves = list(moves)
+        self._interval = int(interval)
+
+        # The state at ply (i * interval).
+        self._snapshots = [initialState]
+
+    def getNumPlies(self):
+        """
+        Get the number of moves in the game (the last ply).
+        """
+
+        return len(self._moves)
+
+    def getState(self, ply):
+        for state in self.iterStates(ply, ply):
+            return state
+
+    def iterStates(self, start = 0, stop = None):
+        """
+        Generate the states from ply `start` to ply `stop` (inclusive, the last ply by default).
+        States are only computed as they are asked for.
+        """
+
+        if (stop is None):
+            stop = len(self._moves)
+
+        if (start < 0 or stop > len(self._moves)):
+            raise IndexError('Game has %d plies, cannot get plies [%d, %d].' %
+                    (len(self._moves), start, stop))
+
+        # Start from the last snapshot at or before the start, making any missing snapshots along the way.
+        snapshotIndex = min(start // self._interval, len(self._snapshots) - 1)
+        ply = snapshotIndex * self._interval
+        state = self._snapshots[snapshotIndex]
+
+        while (ply < start):
+            state = self._advance(state, ply)
+            ply += 1
+
+        while (ply <= stop):
+            yield state
+
+            if (ply == stop):
+                break
+
+            state = self._advance(state, ply)
+            ply += 1
+
+    def _advance(self, state, ply):
+        """
+        Get the state after the move at the given ply (keeping it if it is a new snapshot).
+        """
+
+        state = state.generateSuccessor(*self._moves[ply])
+
+        ply += 1
+        if (ply % self._interval == 0 and ply // self._interval == len(self._snapshots)):
+            self._snapshots.append(state)
+
+        return state
+
+def _appendVarint(buffer, value):
+    while (value >= 0x80):
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+
+    buffer.append(value)
+
+def _encodeVarint(value):
+    buffer = bytearray()
+    _appendVarint(buffer, value)
+    return bytes(buffer)
+
+def _readVarint(file):
+    value = 0
+    shift = 0
+
+    while (True):
+        byte = file.read(1)
+        if (len(byte) == 0):
+            raise ValueError('Replay file is truncated.')
+
+        value |= (byte[0] & 0x7F) << shift
+        if (not (byte[0] & 0x80)):
+            return value
+
+        shift += 7
+
+def _readIndex(indexPath):
+    with open(indexPath, 'rb') as file:
+        if (file.read(len(INDEX_MAGIC)) != INDEX_MAGIC):
+            raise ValueError("'%s' is not a replay index." % (indexPath))
+
+        data = file.read()
+
+    numEntries = len(data) // INDEX_ENTRY.size
+    return [offset for (offset,) in INDEX_ENTRY.iter_unpack(data[:numEntries * INDEX_ENTRY.size])]
+
+def _scanOffsets(path):
+    """
+    Find the offset of every finished game in a replay file by skipping over each one.
+    Returns the offsets and the offset just past the last finished game.
+    """
+
+    offsets = []
+    end = len(MAGIC)
+
+    with open(path, 'rb') as file:
+        if (file.read(len(MAGIC)) != MAGIC):
+            raise ValueError("'%s' is not a replay file." % (path))
+
+        fileSize = os.fstat(file.fileno()).st_size
+
+        while (True):
+            offset = file.tell()
+            if (file.read(len(GAME_TAG)) != GAME_TAG):
+                break
+
+            try:
+                file.seek(_readVarint(file), os.SEEK_CUR)
+
+                chunkLength = _readVarint(file)
+                while (chunkLength != 0):
+                    file.seek(chunkLength, os.SEEK_CUR)
+                    chunkLength = _readVarint(file)
+
+                _readVarint(file)
+            except ValueError:
+                # An unfinished game.
+                break
+
+            if (file.tell() > fileSize):
+                break
+
+            offsets.append(offset)
+            end = file.tell()
+
+    return offsets, end
+
+def _writeIndex(indexPath, offsets):
+    with open(indexPath, 'wb') as file:
+        file.write(INDEX_MAGIC)
+        for offset in offsets:
+            file.write(INDEX_ENTRY.pack(offset))
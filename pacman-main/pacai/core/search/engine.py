@@ -0,0 +1,103 @@
+"""
+A best-first search engine (A* and uniform cost search)
+for any `pacai.core.search.problem.SearchProblem`.
+
+The frontier does not hold a whole path for every node.
+Each reached state just remembers its parent, the action taken from the parent, and its cost,
+and the path is only built once a goal is found.
+The frontier is a `pacai.util.priorityQueue.IndexedPriorityQueue`,
+so finding a cheaper way to a state that is already in the frontier lowers its priority in place
+instead of adding another entry.
+
+The time spent searching is recorded on the problem
+(see `pacai.core.search.problem.SearchProblem.getExpansionRate`).
+"""
+
+import time
+
+from pacai.core.search.heuristic import null as nullHeuristic
+from pacai.util.priorityQueue import IndexedPriorityQueue
+
+def aStarSearch(problem, heuristic = nullHeuristic):
+    """
+    Search the node that has the lowest combined cost and heuristic first.
+    Ties go to the node with the highest cost (the one closest to a goal by the heuristic).
+    States are never expanded twice, so the heuristic should be consistent
+    to be sure of finding an optimal path.
+
+    Returns the actions that reach a goal, or an empty list if no goal can be reached.
+    """
+
+    startTime = time.perf_counter()
+
+    try:
+        return _search(problem, heuristic)
+    finally:
+        problem.addSearchTime(time.perf_counter() - startTime)
+
+def uniformCostSearch(problem):
+    """
+    Search the node of least total cost first.
+    """
+
+    return aStarSearch(problem, nullHeuristic)
+
+def _buildPath(parents, start, state):
+    actions = []
+
+    while (state != start):
+        (state, action, _) = parents[state]
+        actions.append(action)
+
+    actions.reverse()
+    return actions
+
+def _search(problem, heuristic):
+    start = problem.startingState()
+
+    # {state: (parent state, action from the parent, cost from the start)}.
+    parents = {start: (None, None, 0)}
+
+    # {state: heuristic value}, so the heuristic is only called once per state.
+    estimates = {}
+
+    expanded = set()
+
+    # Priorities are (cost + heuristic, -cost).
+    frontier = IndexedPriorityQueue()
+    frontier.push(start, (heuristic(start, problem), 0))
+
+    while (not frontier.isEmpty()):
+        state = frontier.pop()
+
+        if (problem.isGoal(state)):
+            return _buildPath(parents, start, state)
+
+        expanded.add(state)
+        cost = parents[state][2]
+
+        for (successor, action, stepCost) in problem.successorStates(state):
+            if (successor in expanded):
+                continue
+
+            successorCost = cost + stepCost
+
+            known = parents.get(successor)
+            if (known is not None and known[2] <= successorCost):
+                continue
+
+            parents[successor] = (state, action, successorCost)
+
+            estimate = estimates.get(successor)
+            if (estimate is None):
+                estimate = heuristic(successor, problem)
+                estimates[successor] = estimate
+
+            frontier.push(successor, (successorCost + estimate, -successorCost))
+
+    return []
+
+# Abbreviations
+
+astar = aStarSearch
+ucs = uniformCostSearch
@@ -1,5 +1,6 @@
 from pacai.core.actions import Actions
 from pacai.core.directions import Directions
+from pacai.core.grid import BitGrid
 from pacai.core.search.problem import SearchProblem
 
 class FoodSearchProblem(SearchProblem):
@@ -7,43 +8,48 @@ class FoodSearchProblem(SearchProblem):
     A search problem associated with finding the a path that collects all of the
     food in a pacman game.
 
-    A search state in this problem is a tuple (pacmanPosition, foodGrid).
-    Wwhere pacmanPosition is a tuple (x, y) of integers specifying Pacman's position,
-    and foodGrid is a `pacai.core.grid.Grid` of either `True` or `False`,
-    specifying remaining food.
+    A search state in this problem is a tuple of two ints (positionId, foodBits).
+    Every cell (x, y) of the board has the id (x * height + y),
+    which is also its bit in a `pacai.core.grid.BitGrid`.
+    So positionId is Pacman's cell, and foodBits has a bit set for each cell with remaining food.
+    States are small, and hashing or comparing them is just hashing or comparing two ints.
+
+    Use `FoodSearchProblem.getPosition`, `FoodSearchProblem.getFoodGrid`,
+    and `FoodSearchProblem.getFoodPositions` to turn states back into positions and grids.
     """
 
     def __init__(self, startingGameState):
         super().__init__()
 
-        self.start = (startingGameState.getPacmanPosition(), startingGameState.getFood())
         self.walls = startingGameState.getWalls()
         self.startingGameState = startingGameState
         self.heuristicInfo = {}  # A dictionary for the heuristic to store information
 
+        self._width = self.walls.getWidth()
+        self._height = self.walls.getHeight()
+
+        # The open neighbors of each open cell: ((action, neighborId, ~neighborBit), ...).
+        self._neighbors = self._buildNeighbors()
+
+        self.start = (self.positionToId(startingGameState.getPacmanPosition()),
+                BitGrid.fromGrid(startingGameState.getFood()).getBits())
+
     def startingState(self):
         return self.start
 
     def isGoal(self, state):
-        return state[1].count() == 0
+        return state[1] == 0
 
     def successorStates(self, state):
         """
         Returns successor states, the actions they require, and a cost of 1.
         """
 
-        successors = []
         self._numExpanded += 1
-        for direction in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            x, y = state[0]
-            dx, dy = Actions.directionToVector(direction)
-            nextx, nexty = int(x + dx), int(y + dy)
-            if not self.walls[nextx][nexty]:
-                nextFood = state[1].copy()
-                nextFood[nextx][nexty] = False
-                successors.append((((nextx, nexty), nextFood), direction, 1))
 
-        return successors
+        (positionId, foodBits) = state
+        return [((neighborId, foodBits & clearMask), action, 1)
+                for (action, neighborId, clearMask) in self._neighbors[positionId]]
 
     def actionsCost(self, actions):
         """
@@ -51,7 +57,7 @@ class FoodSearchProblem(SearchProblem):
         If those actions include an illegal move, return 999999.
         """
 
-        x, y = self.startingState()[0]
+        x, y = self.getPosition(self.startingState())
         cost = 0
         for action in actions:
             # figure out the next state and see whether it's legal
@@ -62,3 +68,62 @@ class FoodSearchProblem(SearchProblem):
             cost += 1
 
         return cost
+
+    def getFoodGrid(self, state):
+        """
+        Get the remaining food in a state as a `pacai.core.grid.BitGrid`.
+        """
+
+        return BitGrid.fromBits(self._width, self._height, state[1])
+
+    def getFoodPositions(self, state):
+        """
+        Get the positions (x, y) of the remaining food in a state.
+        """
+
+        positions = []
+
+        foodBits = state[1]
+        while (foodBits != 0):
+            bit = foodBits & -foodBits
+            foodBits ^= bit
+            positions.append(self.idToPosition(bit.bit_length() - 1))
+
+        return positions
+
+    def getNumFood(self, state):
+        return bin(state[1]).count('1')
+
+    def getPosition(self, state):
+        """
+        Get Pacman's position (x, y) in a state.
+        """
+
+        return self.idToPosition(state[0])
+
+    def idToPosition(self, positionId):
+        return divmod(positionId, self._height)
+
+    def positionToId(self, position):
+        return position[0] * self._height + position[1]
+
+    def _buildNeighbors(self):
+        neighbors = [()] * (self._width * self._height)
+
+        for x in range(self._width):
+            for y in range(self._height):
+                if (self.walls[x][y]):
+                    continue
+
+                cellNeighbors = []
+                for direction in [Directions.NORTH, Directions.SOUTH,
+                        Directions.EAST, Directions.WEST]:
+                    dx, dy = Actions.directionToVector(direction)
+                    nextx, nexty = int(x + dx), int(y + dy)
+                    if not self.walls[nextx][nexty]:
+                        neighborId = self.positionToId((nextx, nexty))
+                        cellNeighbors.append((direction, neighborId, ~(1 << neighborId)))
+
+                neighbors[self.positionToId((x, y))] = tuple(cellNeighbors)
+
+        return neighbors
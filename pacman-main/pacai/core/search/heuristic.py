@@ -4,6 +4,9 @@ goal in the provided `pacai.core.search.problem.SearchProblem`.
 """
 
 from pacai.core import distance
+from pacai.core import distanceCalculator
+
+FOOD_MST_KEY = 'foodMST'
 
 def null(state, problem = None):
     """
@@ -34,7 +37,107 @@ def euclidean(position, problem):
 
 def numFood(state, problem):
     """
-    This heuristic is the amount of food left to on the board.
+    This heuristic is the amount of food left to on the board
+    (for a `pacai.core.search.food.FoodSearchProblem`).
+    """
+
+    return problem.getNumFood(state)
+
+def foodMST(state, problem):
+    """
+    This heuristic is the maze distance to the closest food plus the length of
+    a minimum spanning tree (by maze distance) over all of the remaining food
+    (for a `pacai.core.search.food.FoodSearchProblem`).
+    Any path that eats all the food has to reach some food and then connect all of it,
+    so this heuristic is admissible (and consistent).
+
+    Maze distances come from the layout's shared `pacai.core.distanceCalculator.DistanceTable`,
+    and spanning trees are memoized by the remaining food
+    in `problem.heuristicInfo[FOOD_MST_KEY]`.
     """
 
-    return state[1].count()
+    info = problem.heuristicInfo.get(FOOD_MST_KEY)
+    if (info is None):
+        info = _FoodMST(problem)
+        problem.heuristicInfo[FOOD_MST_KEY] = info
+
+    return info.getValue(state)
+
+class _FoodMST(object):
+    """
+    The distances between the food of a `pacai.core.search.food.FoodSearchProblem`,
+    and the spanning trees computed so far.
+    Food is numbered by its order in the starting state, since food only ever gets eaten.
+    """
+
+    def __init__(self, problem):
+        layout = problem.startingGameState.getInitialLayout()
+        self._table = distanceCalculator.getDistanceTable(layout)
+        self._problem = problem
+
+        self._foodPositions = problem.getFoodPositions(problem.startingState())
+
+        # {positionId: food number}.
+        self._foodNumbers = {problem.positionToId(position): number
+                for (number, position) in enumerate(self._foodPositions)}
+
+        # [food number][food number]: maze distance.
+        self._foodDistances = [self._getDistances(position) for position in self._foodPositions]
+
+        # {positionId: [food number]: maze distance}, filled in as Pacman's positions are seen.
+        self._pacmanDistances = {}
+
+        # {foodBits: (food numbers, spanning tree length)}.
+        self._trees = {}
+
+    def getValue(self, state):
+        (positionId, foodBits) = state
+
+        tree = self._trees.get(foodBits)
+        if (tree is None):
+            tree = self._computeTree(foodBits)
+            self._trees[foodBits] = tree
+
+        (numbers, length) = tree
+        if (len(numbers) == 0):
+            return 0
+
+        distances = self._pacmanDistances.get(positionId)
+        if (distances is None):
+            distances = self._getDistances(self._problem.idToPosition(positionId))
+            self._pacmanDistances[positionId] = distances
+
+        return length + min([distances[number] for number in numbers])
+
+    def _computeTree(self, foodBits):
+        """
+        Find the length of a minimum spanning tree over some of the food using Prim's algorithm.
+        """
+
+        numbers = []
+        while (foodBits != 0):
+            bit = foodBits & -foodBits
+            foodBits ^= bit
+            numbers.append(self._foodNumbers[bit.bit_length() - 1])
+
+        if (len(numbers) == 0):
+            return (), 0
+
+        # The shortest edge from the tree to each food not yet in the tree.
+        firstDistances = self._foodDistances[numbers[0]]
+        edges = {number: firstDistances[number] for number in numbers[1:]}
+
+        length = 0
+        while (len(edges) > 0):
+            nearest = min(edges, key = edges.get)
+            length += edges.pop(nearest)
+
+            distances = self._foodDistances[nearest]
+            for number in edges:
+                if (distances[number] < edges[number]):
+                    edges[number] = distances[number]
+
+        return tuple(numbers), length
+
+    def _getDistances(self, position):
+        return [self._table.get(position, food) for food in self._foodPositions]
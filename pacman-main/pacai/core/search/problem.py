@@ -32,6 +32,9 @@ class SearchProblem(abc.ABC):
         self._visitedLocations = set()
         self._visitHistory = []
 
+        # The total time (in seconds) spent searching this problem.
+        self._searchTime = 0.0
+
     @abc.abstractmethod
     def actionsCost(self, actions):
         """
@@ -43,9 +46,39 @@ class SearchProblem(abc.ABC):
 
         pass
 
+    def addExpandedCount(self, count = 1):
+        """
+        Count nodes expanded by a search that does not expand them with
+        `SearchProblem.successorStates` (which counts its own expansions).
+        """
+
+        self._numExpanded += count
+
+    def addSearchTime(self, seconds):
+        """
+        Record time spent searching this problem,
+        so that the expansion rate can be reported along with the expanded count.
+        """
+
+        self._searchTime += seconds
+
     def getExpandedCount(self):
         return self._numExpanded
 
+    def getExpansionRate(self):
+        """
+        Get the number of nodes expanded per second of search,
+        or None if no search time has been recorded.
+        """
+
+        if (self._searchTime <= 0.0):
+            return None
+
+        return self._numExpanded / self._searchTime
+
+    def getSearchTime(self):
+        return self._searchTime
+
     def getVisitHistory(self):
         return self._visitHistory
 
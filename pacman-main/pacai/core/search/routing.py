@@ -0,0 +1,294 @@
+"""
+Point-to-point routing for a `pacai.core.search.position.PositionSearchProblem`.
+
+These searches are for problems that look for a single goal position where every move costs 1
+(the default cost function).
+Any other problem is solved with `pacai.core.search.engine.uniformCostSearch` instead.
+Both can be used as the search function of a `pacai.agents.search.base.SearchAgent`,
+e.g. `--agent-args fn=pacai.core.search.routing.jps`.
+
+ - `bidirectionalSearch` runs breadth first searches from both the start and the goal,
+   always growing the smaller frontier by a whole level, until the two searches meet.
+ - `jumpPointSearch` is A* over jump points.
+   Instead of expanding every cell, it scans along straight lines
+   and only puts the cells where a shortest path may need to turn into the frontier.
+   Shortest paths are considered with their vertical moves as early as possible,
+   so a horizontal scan only stops where a vertical move opens up that was blocked
+   one cell back, and a vertical scan stops where a horizontal scan from it finds something.
+"""
+
+import time
+
+from pacai.core.actions import Actions
+from pacai.core.directions import Directions
+from pacai.core.search import engine
+from pacai.core.search.position import DEFAULT_COST_FUNCTION
+from pacai.core.search.position import PositionSearchProblem
+from pacai.util.gridCache import GridCache
+from pacai.util.priorityQueue import IndexedPriorityQueue
+
+# Grids of blocked cells shared by every search in this process, keyed by walls.
+# {walls: (blocked, paddedHeight)}.
+# Each grid is a bytearray with a border of blocked cells around the walls,
+# where the cell (x, y) is at ((x + 1) * paddedHeight + (y + 1)).
+_blockedGrids = GridCache()
+
+def bidirectionalSearch(problem):
+    """
+    Search breadth first from both ends of a point-to-point problem.
+    Each cell taken from a frontier counts as one expanded node.
+
+    Returns the actions that reach the goal, or an empty list if the goal cannot be reached.
+    """
+
+    if (not _isPointToPoint(problem)):
+        return engine.uniformCostSearch(problem)
+
+    startTime = time.perf_counter()
+
+    try:
+        return _bidirectionalSearch(problem)
+    finally:
+        problem.addSearchTime(time.perf_counter() - startTime)
+
+def jumpPointSearch(problem):
+    """
+    Search for the goal of a point-to-point problem with jump point search.
+    Each jump point taken from the frontier counts as one expanded node.
+
+    Returns the actions that reach the goal, or an empty list if the goal cannot be reached.
+    """
+
+    if (not _isPointToPoint(problem)):
+        return engine.uniformCostSearch(problem)
+
+    startTime = time.perf_counter()
+
+    try:
+        return _jumpPointSearch(problem)
+    finally:
+        problem.addSearchTime(time.perf_counter() - startTime)
+
+def _bidirectionalSearch(problem):
+    (blocked, height) = _getBlockedGrid(problem.walls)
+
+    start = _getCell(problem.startingState(), height)
+    goal = _getCell(problem.goal, height)
+
+    if (start == goal or blocked[start] or blocked[goal]):
+        return []
+
+    # {cell: (parent cell, depth)}.
+    # The parent of a cell searched from the goal is the next cell on the way to the goal.
+    forward = {start: (None, 0)}
+    backward = {goal: (None, 0)}
+
+    forwardFrontier = [start]
+    backwardFrontier = [goal]
+
+    while (len(forwardFrontier) > 0 and len(backwardFrontier) > 0):
+        if (len(forwardFrontier) <= len(backwardFrontier)):
+            problem.addExpandedCount(len(forwardFrontier))
+            (forwardFrontier, meeting) = _expandLevel(blocked, height,
+                    forwardFrontier, forward, backward)
+        else:
+            problem.addExpandedCount(len(backwardFrontier))
+            (backwardFrontier, meeting) = _expandLevel(blocked, height,
+                    backwardFrontier, backward, forward)
+
+        if (meeting is not None):
+            # The moves from the goal side were found walking away from the goal.
+            backwardPath = _buildPath(backward, height, meeting)
+            return _buildPath(forward, height, meeting) + [Actions.reverseDirection(action)
+                    for action in reversed(backwardPath)]
+
+    return []
+
+def _expandLevel(blocked, height, frontier, parents, otherParents):
+    """
+    Expand a whole level of one side of a bidirectional search.
+    Returns the next level and the cell where the two sides met with the shortest path
+    (or None if they did not meet).
+    """
+
+    nextFrontier = []
+    meeting = None
+    meetingDepth = None
+
+    for cell in frontier:
+        depth = parents[cell][1] + 1
+
+        for step in (1, -1, height, -height):
+            neighbor = cell + step
+            if (blocked[neighbor] or neighbor in parents):
+                continue
+
+            parents[neighbor] = (cell, depth)
+            nextFrontier.append(neighbor)
+
+            other = otherParents.get(neighbor)
+            if (other is not None and (meetingDepth is None or depth + other[1] < meetingDepth)):
+                meeting = neighbor
+                meetingDepth = depth + other[1]
+
+    return nextFrontier, meeting
+
+def _jumpPointSearch(problem):
+    (blocked, height) = _getBlockedGrid(problem.walls)
+
+    (startX, startY) = problem.startingState()
+    (goalX, goalY) = problem.goal
+
+    start = _getCell(problem.startingState(), height)
+    goal = _getCell(problem.goal, height)
+
+    if (blocked[start] or blocked[goal]):
+        return []
+
+    # {cell: (parent jump point, cost from the start)}.
+    parents = {start: (None, 0)}
+
+    # {cell: the step (change in cell) used to reach the cell, or None for the start}.
+    steps = {start: None}
+
+    expanded = set()
+
+    # Priorities are (cost + manhattan distance, -cost).
+    frontier = IndexedPriorityQueue()
+    frontier.push(start, (abs(startX - goalX) + abs(startY - goalY), 0))
+
+    while (not frontier.isEmpty()):
+        cell = frontier.pop()
+        problem.addExpandedCount()
+
+        if (cell == goal):
+            return _buildPath(parents, height, goal)
+
+        expanded.add(cell)
+        cost = parents[cell][1]
+
+        for step in _getJumpSteps(steps[cell], height):
+            jumpPoint = _jump(blocked, height, cell, step, goal)
+            if (jumpPoint is None or jumpPoint in expanded):
+                continue
+
+            jumpCost = cost + abs(jumpPoint - cell) // abs(step)
+
+            known = parents.get(jumpPoint)
+            if (known is not None and known[1] <= jumpCost):
+                continue
+
+            parents[jumpPoint] = (cell, jumpCost)
+            steps[jumpPoint] = step
+
+            (x, y) = divmod(jumpPoint, height)
+            estimate = abs(x - 1 - goalX) + abs(y - 1 - goalY)
+            frontier.push(jumpPoint, (jumpCost + estimate, -jumpCost))
+
+    return []
+
+def _getJumpSteps(step, height):
+    """
+    Get the directions (as a change in cell) to scan from a jump point
+    that was reached with the given step.
+    Going straight back is never needed.
+    """
+
+    if (step is None):
+        return (1, -1, height, -height)
+
+    if (step == 1 or step == -1):
+        return (step, height, -height)
+
+    return (step, 1, -1)
+
+def _jump(blocked, height, cell, step, goal):
+    """
+    Scan from a cell in one direction, and return the next jump point (or None).
+    """
+
+    if (step == 1 or step == -1):
+        while (True):
+            cell += step
+            if (blocked[cell]):
+                return None
+
+            if (cell == goal
+                    or _jumpHorizontal(blocked, cell, height, goal) is not None
+                    or _jumpHorizontal(blocked, cell, -height, goal) is not None):
+                return cell
+
+    return _jumpHorizontal(blocked, cell, step, goal)
+
+def _jumpHorizontal(blocked, cell, step, goal):
+    while (True):
+        cell += step
+        if (blocked[cell]):
+            return None
+
+        if (cell == goal):
+            return cell
+
+        # A vertical move that was not possible from the previous cell.
+        if ((not blocked[cell + 1] and blocked[cell - step + 1])
+                or (not blocked[cell - 1] and blocked[cell - step - 1])):
+            return cell
+
+def _buildPath(parents, height, cell):
+    """
+    Get the moves from the first cell of a search to the given cell,
+    where the parent of each cell is in the same row or column.
+    """
+
+    actions = []
+
+    while (parents[cell][0] is not None):
+        parent = parents[cell][0]
+
+        if (abs(cell - parent) < height):
+            action = Directions.NORTH if (cell > parent) else Directions.SOUTH
+            length = abs(cell - parent)
+        else:
+            action = Directions.EAST if (cell > parent) else Directions.WEST
+            length = abs(cell - parent) // height
+
+        actions += [action] * length
+        cell = parent
+
+    actions.reverse()
+    return actions
+
+def _getCell(position, height):
+    return (position[0] + 1) * height + (position[1] + 1)
+
+def _getBlockedGrid(walls):
+    return _blockedGrids.get(walls, lambda: _buildBlockedGrid(walls))
+
+def _buildBlockedGrid(walls):
+    width = walls.getWidth()
+    height = walls.getHeight()
+    paddedHeight = height + 2
+
+    blocked = bytearray([1]) * ((width + 2) * paddedHeight)
+    for x in range(width):
+        for y in range(height):
+            if (not walls[x][y]):
+                blocked[(x + 1) * paddedHeight + (y + 1)] = 0
+
+    return (blocked, paddedHeight)
+
+def _isPointToPoint(problem):
+    """
+    Check if a problem is a plain `pacai.core.search.position.PositionSearchProblem`
+    (a single goal position and a cost of 1 for every move).
+    """
+
+    return (isinstance(problem, PositionSearchProblem)
+            and type(problem).isGoal is PositionSearchProblem.isGoal
+            and type(problem).successorStates is PositionSearchProblem.successorStates
+            and problem.costFn is DEFAULT_COST_FUNCTION)
+
+# Abbreviations
+
+bidirectional = bidirectionalSearch
+jps = jumpPointSearch
@@ -0,0 +1,259 @@
+"""
+Value iteration and policy evaluation over a `pacai.core.mdp.TransitionModel`.
+
+Values are arrays indexed by state number (see `pacai.core.mdp.TransitionModel`).
+States without any actions (e.g. terminal states) always have a value of zero.
+
+There are three ways to run value iteration:
+ - `valueIteration`: every sweep backs up all the states at once
+   (from the values of the previous sweep),
+   until the values stop changing by more than a tolerance
+   (and/or a maximum number of sweeps is reached).
+ - `asyncValueIteration`: states are backed up one at a time in place,
+   so each backup sees the newest values of the states before it in the sweep.
+ - `prioritizedSweeping`: the state whose value is the most wrong (largest Bellman error)
+   is always backed up next,
+   and only the predecessors of a changed state are checked again.
+The in-place versions usually need far fewer backups to converge.
+"""
+
+from array import array
+
+from pacai.util.priorityQueue import PriorityQueue
+
+DEFAULT_TOLERANCE = 1e-6
+
+def getQValue(model, values, discountRate, row):
+    """
+    Get the q-value of a row (a state and an action) of the model.
+    """
+
+    nextStates = model.nextStates
+    probs = model.probs
+    rewards = model.rewards
+
+    qValue = 0.0
+    for entry in range(model.rowStarts[row], model.rowStarts[row + 1]):
+        qValue += probs[entry] * (rewards[entry] + discountRate * values[nextStates[entry]])
+
+    return qValue
+
+def getBestQValue(model, values, discountRate, stateIndex):
+    """
+    Get the value of the best action in a state (zero if there are no actions).
+    This is a single Bellman backup.
+    """
+
+    firstRow = model.actionStarts[stateIndex]
+    lastRow = model.actionStarts[stateIndex + 1]
+
+    if (firstRow == lastRow):
+        return 0.0
+
+    return max([getQValue(model, values, discountRate, row) for row in range(firstRow, lastRow)])
+
+def getPolicy(model, values, discountRate):
+    """
+    Get the best action for every state (None for states without actions).
+    Ties go to the first action.
+    """
+
+    policy = []
+
+    for stateIndex in range(model.getNumStates()):
+        bestAction = None
+        bestValue = None
+
+        start = model.actionStarts[stateIndex]
+        for (i, action) in enumerate(model.actions[stateIndex]):
+            qValue = getQValue(model, values, discountRate, start + i)
+            if (bestValue is None or qValue > bestValue):
+                bestAction = action
+                bestValue = qValue
+
+        policy.append(bestAction)
+
+    return policy
+
+def valueIteration(model, discountRate, tolerance = DEFAULT_TOLERANCE, maxIterations = None,
+        values = None):
+    """
+    Run value iteration starting from the given values (all zeros by default).
+    Stops once no value changes by more than the tolerance,
+    or after maxIterations sweeps (either may be None, but not both).
+
+    Returns: (values, number of sweeps done).
+    """
+
+    return _iterate(model, discountRate, tolerance, maxIterations, values, None)
+
+def asyncValueIteration(model, discountRate, tolerance = DEFAULT_TOLERANCE, maxBackups = None,
+        values = None):
+    """
+    Run in-place value iteration, backing up the states one at a time in order
+    (going back to the first state after the last).
+    Stops once a whole sweep changes no value by more than the tolerance,
+    or after maxBackups backups (either may be None, but not both).
+
+    Returns: (values, number of backups done).
+    """
+
+    if (tolerance is None and maxBackups is None):
+        raise ValueError('Either a tolerance or a maximum number of backups is required.')
+
+    numStates = model.getNumStates()
+    values = _initValues(numStates, values)
+
+    backups = 0
+    while (maxBackups is None or backups < maxBackups):
+        change = 0.0
+
+        for stateIndex in range(numStates):
+            if (maxBackups is not None and backups >= maxBackups):
+                break
+
+            value = getBestQValue(model, values, discountRate, stateIndex)
+            change = max(change, abs(value - values[stateIndex]))
+            values[stateIndex] = value
+            backups += 1
+        else:
+            if (tolerance is not None and change <= tolerance):
+                break
+
+    return values, backups
+
+def prioritizedSweeping(model, discountRate, tolerance = DEFAULT_TOLERANCE, maxBackups = None,
+        values = None):
+    """
+    Run in-place value iteration, always backing up the state with the largest Bellman error
+    (the most its value would change with a backup).
+    Only states with an error over the tolerance are ever backed up,
+    and after a backup only the predecessors of that state are checked for new errors.
+    Stops once no state has an error over the tolerance, or after maxBackups backups.
+
+    Returns: (values, number of backups done).
+    """
+
+    if (tolerance is None):
+        raise ValueError('Prioritized sweeping needs a tolerance.')
+
+    numStates = model.getNumStates()
+    values = _initValues(numStates, values)
+    predecessors = model.getPredecessors()
+
+    # States can be in the queue many times (with different priorities),
+    # so also keep track of which states still need a backup.
+    queue = PriorityQueue()
+    queued = [False] * numStates
+
+    for stateIndex in range(numStates):
+        error = abs(getBestQValue(model, values, discountRate, stateIndex) - values[stateIndex])
+        if (error > tolerance):
+            queue.push(stateIndex, -error)
+            queued[stateIndex] = True
+
+    backups = 0
+    while (not queue.isEmpty() and (maxBackups is None or backups < maxBackups)):
+        stateIndex = queue.pop()
+        if (not queued[stateIndex]):
+            continue
+
+        queued[stateIndex] = False
+        values[stateIndex] = getBestQValue(model, values, discountRate, stateIndex)
+        backups += 1
+
+        for predecessor in predecessors[stateIndex]:
+            error = abs(getBestQValue(model, values, discountRate, predecessor)
+                    - values[predecessor])
+            if (error > tolerance):
+                queue.push(predecessor, -error)
+                queued[predecessor] = True
+
+    return values, backups
+
+def evaluatePolicy(model, policy, discountRate, tolerance = DEFAULT_TOLERANCE,
+        maxIterations = None, values = None):
+    """
+    Compute the values of following a policy (a list of actions by state number, see `getPolicy`).
+    Stops the same way as `valueIteration`.
+
+    Returns: (values, number of sweeps done).
+    """
+
+    rows = []
+    for stateIndex in range(model.getNumStates()):
+        if (len(model.actions[stateIndex]) == 0):
+            rows.append(None)
+        else:
+            rows.append(model.getRow(stateIndex, policy[stateIndex]))
+
+    return _iterate(model, discountRate, tolerance, maxIterations, values, rows)
+
+def _iterate(model, discountRate, tolerance, maxIterations, values, policyRows):
+    """
+    Sweep all the states until done.
+    If policyRows (the row to use for each state) is given, then the policy is evaluated,
+    otherwise each state takes its best row.
+    """
+
+    if (tolerance is None and maxIterations is None):
+        raise ValueError('Either a tolerance or a maximum number of iterations is required.')
+
+    numStates = model.getNumStates()
+    values = _initValues(numStates, values)
+
+    actionStarts = model.actionStarts
+    rowStarts = model.rowStarts
+    nextStates = model.nextStates
+    probs = model.probs
+    rewards = model.rewards
+
+    iteration = 0
+    while (maxIterations is None or iteration < maxIterations):
+        newValues = array('d', [0.0]) * numStates
+        change = 0.0
+
+        for stateIndex in range(numStates):
+            if (policyRows is None):
+                firstRow = actionStarts[stateIndex]
+                lastRow = actionStarts[stateIndex + 1]
+            elif (policyRows[stateIndex] is None):
+                firstRow = 0
+                lastRow = 0
+            else:
+                firstRow = policyRows[stateIndex]
+                lastRow = firstRow + 1
+
+            if (firstRow == lastRow):
+                value = 0.0
+            else:
+                value = None
+                for row in range(firstRow, lastRow):
+                    qValue = 0.0
+                    for entry in range(rowStarts[row], rowStarts[row + 1]):
+                        qValue += probs[entry] * (rewards[entry]
+                                + discountRate * values[nextStates[entry]])
+
+                    if (value is None or qValue > value):
+                        value = qValue
+
+            newValues[stateIndex] = value
+            change = max(change, abs(value - values[stateIndex]))
+
+        values = newValues
+        iteration += 1
+
+        if (tolerance is not None and change <= tolerance):
+            break
+
+    return values, iteration
+
+def _initValues(numStates, values):
+    """
+    Get a new array of starting values (all zeros if none are given).
+    """
+
+    if (values is None):
+        return array('d', [0.0]) * numStates
+
+    return array('d', values)
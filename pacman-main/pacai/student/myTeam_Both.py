@@ -289,33 +289,12 @@ class OffensiveAgent(CaptureAgent):
         self.lastPos = None
         self.borderPatrolThreshold = 2  # Distance to check for border patrol
         self.powerPelletThreshold = 4   # Distance to consider going for power pellet
-        self.deadEndThreshold = 1       # Number of escape routes needed to avoid dead end
+        self.deadEndDepth = 5           # Moves into a dead end that are still safe to take
 
     def isInDeadEnd(self, pos, gameState):
-        """Check if a position is in or leads to a dead end"""
+        """Check if a position is too deep in a dead end (see pacai.core.mazeGraph.MazeGraph)"""
         x, y = int(pos[0]), int(pos[1])
-        escapeRoutes = 0
-        visited = set()
-        
-        def countExits(x, y, depth=0):
-            if depth > 5:  # Look ahead up to 5 steps
-                return 1
-            if (x, y) in visited:
-                return 0
-            visited.add((x, y))
-            
-            exits = 0
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                nextX, nextY = x + dx, y + dy
-                if not gameState.hasWall(nextX, nextY):
-                    if (nextX == self.safeZone and self.red) or \
-                       (nextX == self.safeZone + 1 and not self.red):
-                        exits += 1
-                    else:
-                        exits += countExits(nextX, nextY, depth + 1)
-            return exits
-        
-        return countExits(x, y) < self.deadEndThreshold
+        return gameState.getMazeGraph().getDeadEndDepth((x, y)) > self.deadEndDepth
 
     def isBorderPatrolled(self, gameState):
         """Check if opponent ghost is patrolling the border"""
@@ -647,35 +626,14 @@ class OffensiveAgent(CaptureAgent):
         self.lastAction = None
         self.borderPatrolThreshold = 2
         self.powerPelletThreshold = 4
-        self.deadEndThreshold = 1
+        self.deadEndDepth = 5
         self.ghostBackThreshold = 5  # Distance to consider ghost as "behind"
     
 
     def isInDeadEnd(self, pos, gameState):
-        """Check if a position is in or leads to a dead end"""
+        """Check if a position is too deep in a dead end (see pacai.core.mazeGraph.MazeGraph)"""
         x, y = int(pos[0]), int(pos[1])
-        escapeRoutes = 0
-        visited = set()
-        
-        def countExits(x, y, depth=0):
-            if depth > 5:
-                return 1
-            if (x, y) in visited:
-                return 0
-            visited.add((x, y))
-            
-            exits = 0
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                nextX, nextY = x + dx, y + dy
-                if not gameState.hasWall(nextX, nextY):
-                    if (nextX == self.safeZone and self.red) or \
-                       (nextX == self.safeZone + 1 and not self.red):
-                        exits += 1
-                    else:
-                        exits += countExits(nextX, nextY, depth + 1)
-            return exits
-        
-        return countExits(x, y) < self.deadEndThreshold
+        return gameState.getMazeGraph().getDeadEndDepth((x, y)) > self.deadEndDepth
 
     def isGhostBehind(self, gameState):
         """Check if non-scared ghost is behind the agent"""
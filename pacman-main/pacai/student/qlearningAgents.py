@@ -1,5 +1,6 @@
 from pacai.agents.learning.reinforcement import ReinforcementAgent
 from pacai.util import reflection
+import logging
 import random
 
 class QLearningAgent(ReinforcementAgent):
@@ -184,3 +185,100 @@ class ApproximateQAgent(PacmanQAgent):
         if self.episodesSoFar == self.numTraining:
             # You might want to print your weights here for debugging.
             print("Weights:", self.weights)
+
+class VectorApproximateQAgent(PacmanQAgent):
+    """
+    An approximate Q-learning agent that keeps its weights in a dense vector.
+
+    The extractor must be a `pacai.core.featureExtractors.VectorFeatureExtractor`.
+    The features of all the legal actions in a state are extracted together,
+    and all of their Q-values come from a single pass of dot products with the weights.
+    The features of the last couple of states are kept,
+    since every state is looked at both when acting in it and when learning from it.
+
+    With the same features, this learns exactly the same weights as `ApproximateQAgent`.
+    """
+
+    def __init__(self, index,
+            extractor = 'pacai.core.featureExtractors.SimpleExtractor', **kwargs):
+        super().__init__(index, **kwargs)
+        self.featExtractor = reflection.qualifiedImport(extractor)()
+        self.schema = self.featExtractor.getSchema()
+
+        self.weights = self.schema.newVector()
+
+        # [(state, {action: feature vector}), ...], newest last.
+        self._featureCache = []
+
+    def getFeatureVectors(self, state):
+        """
+        Get the feature vector of each legal action in a state, as {action: vector}.
+        """
+        for (cachedState, vectors) in self._featureCache:
+            if cachedState is state:
+                return vectors
+
+        actions = self.getLegalActions(state)
+        vectors = dict(zip(actions, self.featExtractor.getFeatureVectors(state, actions)))
+
+        self._featureCache = self._featureCache[-1:] + [(state, vectors)]
+        return vectors
+
+    def getQValues(self, state):
+        """
+        Get the Q-value of each legal action in a state, as {action: Q-value}.
+        """
+        weights = self.weights
+        qValues = {}
+        for (action, vector) in self.getFeatureVectors(state).items():
+            qValues[action] = sum(map(float.__mul__, weights, vector))
+        return qValues
+
+    def getQValue(self, state, action):
+        vectors = self.getFeatureVectors(state)
+        if action in vectors:
+            vector = vectors[action]
+        else:
+            vector = self.featExtractor.getFeatureVector(state, action)
+
+        return sum(map(float.__mul__, self.weights, vector))
+
+    def getValue(self, state):
+        qValues = self.getQValues(state)
+        if not qValues:
+            return 0.0
+        return max(qValues.values())
+
+    def getPolicy(self, state):
+        qValues = self.getQValues(state)
+        if not qValues:
+            return None
+        return max(qValues, key = qValues.get)
+
+    def update(self, state, action, nextState, reward):
+        vector = self.getFeatureVectors(state)[action]
+        correction = (reward + self.getDiscountRate() * self.getValue(nextState)
+                - self.getQValue(state, action))
+
+        step = self.getAlpha() * correction
+        weights = self.weights
+        for i in range(len(weights)):
+            weights[i] += step * vector[i]
+
+    def getWeights(self):
+        """
+        Get the weights by feature name.
+        """
+        return self.schema.toDict(self.weights)
+
+    def final(self, state):
+        """
+        Called at the end of each game.
+        """
+
+        # Call the super-class final method.
+        super().final(state)
+
+        # Did we finish training?
+        if self.episodesSoFar == self.numTraining:
+            logging.debug('Weights: %s' % (self.getWeights()))
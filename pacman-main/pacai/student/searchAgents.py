@@ -138,9 +138,11 @@ def foodHeuristic(state, problem):
     On the other hand, inadmissible or inconsistent heuristics may find optimal solutions,
     so be careful.
 
-    The state is a tuple (pacmanPosition, foodGrid) where foodGrid is a
-    `pacai.core.grid.Grid` of either True or False.
-    You can call `foodGrid.asList()` to get a list of food coordinates instead.
+    The state is a tuple (positionId, foodBits) of ints
+    (see `pacai.core.search.food.FoodSearchProblem`).
+    You can call `problem.getPosition(state)` to get Pacman's position,
+    `problem.getFoodGrid(state)` to get a `pacai.core.grid.BitGrid` of the remaining food,
+    and `problem.getFoodPositions(state)` to get a list of food coordinates instead.
 
     If you want access to info like walls, capsules, etc., you can query the problem.
     For example, `problem.walls` gives you a Grid of where the walls are.
@@ -153,8 +155,8 @@ def foodHeuristic(state, problem):
     ```
     Subsequent calls to this heuristic can access problem.heuristicInfo['wallCount'].
     """
-    position, foodGrid = state
-    foodList = foodGrid.asList()
+    position = problem.getPosition(state)
+    foodList = problem.getFoodPositions(state)
 
     if not foodList:
         return 0
@@ -1,4 +1,5 @@
 from pacai.agents.learning.value import ValueEstimationAgent
+from pacai.core import valueIteration
 
 class ValueIterationAgent(ValueEstimationAgent):
     """
@@ -7,7 +8,8 @@ class ValueIterationAgent(ValueEstimationAgent):
     Make sure to read `pacai.agents.learning` before working on this class.
 
     A `ValueIterationAgent` takes a `pacai.core.mdp.MarkovDecisionProcess` on initialization,
-    and runs value iteration for a given number of iterations using the supplied discount factor.
+    and runs value iteration for a given number of iterations using the supplied discount factor
+    (or until the values converge, see `pacai.core.valueIteration`).
 
     Some useful mdp methods you will use:
     `pacai.core.mdp.MarkovDecisionProcess.getStates`,
@@ -30,29 +32,49 @@ class ValueIterationAgent(ValueEstimationAgent):
     you should return None.
     """
 
-    def __init__(self, index, mdp, discountRate = 0.9, iters = 100, **kwargs):
+    def __init__(self, index, mdp, discountRate = 0.9, iters = 100, tolerance = None, **kwargs):
+        """
+        Args:
+            iters: The most sweeps of value iteration to run (None for no limit).
+            tolerance: Stop early once no value changes by more than this (None to run all iters).
+        """
+
         super().__init__(index, **kwargs)
         self.mdp = mdp
         self.discountRate = discountRate
         self.iters = iters
+        self.tolerance = tolerance
+
+        # The whole MDP is compiled once, so the sweeps don't have to call back into it.
+        self.model = mdp.getTransitionModel()
+        self.modelValues, self.numBackups = self.runValueIteration()
+
+        # The number of (whole sweeps worth of) backups done.
+        numStates = max(1, self.model.getNumStates())
+        self.numIterations = (self.numBackups + numStates - 1) // numStates
+
         self.values = {}
-        for state in self.mdp.getStates():
-            self.values[state] = 0.0
-        for _ in range(self.iters):
-            new_values = self.values.copy()
-            for state in self.mdp.getStates():
-                if self.mdp.isTerminal(state):
-                    new_values[state] = 0.0
-                else:
-                    actions = self.mdp.getPossibleActions(state)
-                    if actions:
-                        new_values[state] = max(self.getQValue(state, action) for action in actions)
-            self.values = new_values
+        for stateIndex in range(self.model.getNumStates()):
+            self.values[self.model.getState(stateIndex)] = self.modelValues[stateIndex]
+
+    def runValueIteration(self):
+        """
+        Compute the values of every state in the model.
+        Returns: (values by state number, number of single state backups done).
+        """
+        values, iterations = valueIteration.valueIteration(self.model, self.discountRate,
+                tolerance = self.tolerance, maxIterations = self.iters)
+        return values, iterations * self.model.getNumStates()
 
     def getQValue(self, state, action):
         """
         Compute the Q-value of a state-action pair.
         """
+        if self.model.hasState(state):
+            row = self.model.getRow(self.model.getStateIndex(state), action)
+            return valueIteration.getQValue(self.model, self.modelValues, self.discountRate, row)
+
+        # States outside of the MDP (e.g. walls shown by a display) have to ask the MDP directly.
         q_value = 0.0
         for next_state, prob in self.mdp.getTransitionStatesAndProbs(state, action):
             reward = self.mdp.getReward(state, action, next_state)
@@ -85,4 +107,43 @@ class ValueIterationAgent(ValueEstimationAgent):
         """
         Return the value of the state (computed in __init__).
         """
-        return self.values.get(state, 0.0)
\ No newline at end of file
+        return self.values.get(state, 0.0)
+
+class AsynchronousValueIterationAgent(ValueIterationAgent):
+    """
+    A value iteration agent that backs up one state at a time, in place
+    (see `pacai.core.valueIteration.asyncValueIteration`).
+    Each backup uses the newest values of the other states,
+    so it usually converges in fewer backups than `ValueIterationAgent`.
+
+    The iters are still counted in sweeps (a backup of every state).
+    """
+
+    def runValueIteration(self):
+        maxBackups = None
+        if self.iters is not None:
+            maxBackups = self.iters * self.model.getNumStates()
+
+        return valueIteration.asyncValueIteration(self.model, self.discountRate,
+                tolerance = self.tolerance, maxBackups = maxBackups)
+
+class PrioritizedSweepingValueIterationAgent(ValueIterationAgent):
+    """
+    A value iteration agent that always backs up the state whose value is the most wrong
+    (see `pacai.core.valueIteration.prioritizedSweeping`),
+    running until no value would change by more than the tolerance.
+
+    The iters are a limit counted in sweeps (a backup of every state).
+    """
+
+    def __init__(self, index, mdp, discountRate = 0.9, iters = 100,
+            tolerance = valueIteration.DEFAULT_TOLERANCE, **kwargs):
+        super().__init__(index, mdp, discountRate, iters, tolerance, **kwargs)
+
+    def runValueIteration(self):
+        maxBackups = None
+        if self.iters is not None:
+            maxBackups = self.iters * self.model.getNumStates()
+
+        return valueIteration.prioritizedSweeping(self.model, self.discountRate,
+                tolerance = self.tolerance, maxBackups = maxBackups)
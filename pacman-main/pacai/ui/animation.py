@@ -0,0 +1,403 @@
+"""
+Write animations (e.g. gifs) of games one frame at a time.
+
+Frames are rendered and encoded as they arrive,
+so only a handful of frames are ever held in memory no matter how long the game is.
+Frames can also be rendered in parallel by a pool of worker processes
+(they are still encoded in order).
+Three formats are supported (none need any external tools):
+ - `FORMAT_GIF`: an animated gif.
+ - `FORMAT_APNG`: an animated png.
+ - `FORMAT_FRAMES`: a directory of png images, one per frame.
+"""
+
+import abc
+import collections
+import multiprocessing
+import os
+import queue
+import struct
+import threading
+import zlib
+
+from PIL import GifImagePlugin
+from PIL import Image
+from PIL import ImageChops
+
+FORMAT_GIF = 'gif'
+FORMAT_APNG = 'apng'
+FORMAT_FRAMES = 'frames'
+FORMATS = [FORMAT_GIF, FORMAT_APNG, FORMAT_FRAMES]
+
+# The most frames that can be waiting for a background writer.
+DEFAULT_QUEUE_SIZE = 16
+
+FRAME_FILENAME = 'frame_%06d.png'
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_COMPRESSION_LEVEL = 6
+MAX_APNG_DURATION = 2**16 - 1
+
+def getFormat(path):
+    """
+    Guess the format for an animation from its path:
+    a directory (or a path ending in a separator) gets frames,
+    a .png/.apng extension gets an animated png,
+    and everything else gets a gif.
+    """
+
+    if (path.endswith(os.sep) or os.path.isdir(path)):
+        return FORMAT_FRAMES
+
+    extension = os.path.splitext(path)[1].lower()
+    if (extension in ['.png', '.apng']):
+        return FORMAT_APNG
+
+    return FORMAT_GIF
+
+def openAnimation(path, fps, render, format = None, background = False,
+        workers = 0, initializer = None, initargs = ()):
+    """
+    Get an `AnimationWriter` that renders frames with `render(frame)`
+    and writes them to path in the given format (see `getFormat` for the default).
+    See `AnimationWriter` for rendering with worker processes.
+    """
+
+    if (format is None):
+        format = getFormat(path)
+
+    if (format == FORMAT_GIF):
+        encoder = GIFEncoder(path, fps)
+    elif (format == FORMAT_APNG):
+        encoder = APNGEncoder(path, fps)
+    elif (format == FORMAT_FRAMES):
+        encoder = FrameDirectoryEncoder(path, fps)
+    else:
+        raise ValueError("Unknown animation format '%s', expected one of: %s." % (format, FORMATS))
+
+    return AnimationWriter(encoder, render, background = background,
+            workers = workers, initializer = initializer, initargs = initargs)
+
+class AnimationWriter(object):
+    """
+    Render frames and pass the images on to an encoder.
+
+    In the background, frames are rendered and encoded on another thread
+    while the game continues.
+    With workers, frames are rendered by a pool of that many processes.
+    Each worker is set up once with `initializer(*initargs)` (e.g. to load sprites),
+    so render, frames, and images all need to be picklable.
+    Either way, only a bounded number of frames can be waiting at any time
+    (adding a frame blocks until there is room).
+    """
+
+    def __init__(self, encoder, render, background = False, queueSize = DEFAULT_QUEUE_SIZE,
+            workers = 0, initializer = None, initargs = ()):
+        self._encoder = encoder
+        self._render = render
+        self._queueSize = queueSize
+
+        self._queue = None
+        self._thread = None
+        self._error = None
+
+        # Frames that are being rendered by the pool, in order.
+        self._pool = None
+        self._rendering = collections.deque()
+
+        if (workers > 0):
+            self._pool = multiprocessing.Pool(workers, initializer = initializer,
+                    initargs = initargs)
+
+        if (background):
+            self._queue = queue.Queue(maxsize = queueSize)
+            self._thread = threading.Thread(target = self._work, daemon = True)
+            self._thread.start()
+
+    def addFrame(self, frame):
+        if (self._pool is not None):
+            frame = self._pool.apply_async(self._render, (frame,))
+
+        if (self._queue is not None):
+            self._checkError()
+            self._queue.put(frame)
+            return
+
+        if (self._pool is None):
+            self._encoder.addImage(self._render(frame))
+            return
+
+        self._rendering.append(frame)
+        if (len(self._rendering) > self._queueSize):
+            self._encoder.addImage(self._rendering.popleft().get())
+
+    def close(self):
+        """
+        Write out any remaining frames and finish the animation.
+        """
+
+        try:
+            if (self._thread is not None):
+                self._queue.put(None)
+                self._thread.join()
+                self._thread = None
+
+            while (len(self._rendering) > 0):
+                self._encoder.addImage(self._rendering.popleft().get())
+        finally:
+            # Every frame has been rendered (or rendering failed), so the workers can just be stopped.
+            if (self._pool is not None):
+                self._pool.terminate()
+                self._pool.join()
+                self._pool = None
+
+            self._rendering.clear()
+            self._encoder.close()
+
+        self._checkError()
+
+    def _checkError(self):
+        if (self._error is not None):
+            error = self._error
+            self._error = None
+            raise error
+
+    def _work(self):
+        while (True):
+            frame = self._queue.get()
+            if (frame is None):
+                return
+
+            # After a failure, keep taking frames so the game is not blocked.
+            if (self._error is not None):
+                continue
+
+            try:
+                if (self._pool is not None):
+                    self._encoder.addImage(frame.get())
+                else:
+                    self._encoder.addImage(self._render(frame))
+            except Exception as ex:
+                self._error = ex
+
+class AbstractEncoder(abc.ABC):
+    """
+    Encode a stream of (same sized, RGB) images into an animation.
+    """
+
+    def __init__(self, path, fps):
+        self._path = path
+        self._frameDuration = int(1.0 / fps * 1000.0)
+        self._numImages = 0
+
+    @abc.abstractmethod
+    def addImage(self, image):
+        pass
+
+    @abc.abstractmethod
+    def close(self):
+        pass
+
+    def getNumImages(self):
+        return self._numImages
+
+class AbstractDeltaEncoder(AbstractEncoder):
+    """
+    An encoder for formats that can show each frame as a change to the previous one.
+    One image is held back so that repeats of it can be folded into its duration,
+    and only the region that changed from the previous image is written.
+    """
+
+    def __init__(self, path, fps):
+        super().__init__(path, fps)
+
+        # (image, changed region (None for the whole image), duration) waiting to be written.
+        self._pending = None
+
+    def addImage(self, image):
+        self._numImages += 1
+
+        if (self._pending is None):
+            self._pending = (image, None, self._frameDuration)
+            return
+
+        (pendingImage, pendingBox, pendingDuration) = self._pending
+
+        box = ImageChops.difference(pendingImage, image).getbbox()
+        if (box is None):
+            self._pending = (pendingImage, pendingBox, pendingDuration + self._frameDuration)
+            return
+
+        self._writePending()
+        self._pending = (image, box, self._frameDuration)
+
+    def close(self):
+        if (self._pending is not None):
+            self._writePending()
+            self._pending = None
+
+        self._finish()
+
+    def _writePending(self):
+        (image, box, duration) = self._pending
+
+        if (box is None):
+            self._writeImage(image, (0, 0), duration)
+        else:
+            self._writeImage(image.crop(box), box[0:2], duration)
+
+    @abc.abstractmethod
+    def _finish(self):
+        """
+        Finish off the file after the last image has been written.
+        """
+
+        pass
+
+    @abc.abstractmethod
+    def _writeImage(self, image, offset, duration):
+        """
+        Write an image (or a region of one at the offset) that is shown for duration ms.
+        The first image written is always the full image.
+        """
+
+        pass
+
+class GIFEncoder(AbstractDeltaEncoder):
+    """
+    Write an animated gif that loops forever.
+    Every frame gets its own color table.
+    """
+
+    def __init__(self, path, fps):
+        super().__init__(path, fps)
+
+        self._file = open(path, 'wb')
+        self._wroteHeader = False
+
+    def _finish(self):
+        if (self._file is None):
+            return
+
+        # A gif needs at least one frame.
+        if (self._wroteHeader):
+            self._file.write(b';')
+
+        self._file.close()
+        self._file = None
+
+    def _writeImage(self, image, offset, duration):
+        image = image.convert('P', palette = Image.ADAPTIVE)
+
+        includeColorTable = True
+        if (not self._wroteHeader):
+            header, usedColors = GifImagePlugin.getheader(image, info = {'loop': 0})
+            self._file.write(b''.join(header))
+            self._wroteHeader = True
+
+            # The first image uses the global color table.
+            includeColorTable = False
+
+        # Leave each frame in place (disposal 1) so the next one can draw over just what changed.
+        data = GifImagePlugin.getdata(image, offset = offset, duration = duration, disposal = 1,
+                include_color_table = includeColorTable)
+        self._file.write(b''.join(data))
+
+class APNGEncoder(AbstractDeltaEncoder):
+    """
+    Write an animated png that loops forever.
+    The number of frames is filled in when the encoder is closed.
+    """
+
+    def __init__(self, path, fps):
+        super().__init__(path, fps)
+
+        self._file = open(path, 'wb')
+        self._file.write(PNG_SIGNATURE)
+
+        self._animationControlOffset = None
+        self._numWrittenImages = 0
+        self._sequenceNumber = 0
+
+    def _finish(self):
+        if (self._file is None):
+            return
+
+        if (self._animationControlOffset is not None):
+            self._writeChunk(b'IEND', b'')
+
+            # Now that the number of frames is known, fill it in.
+            self._file.seek(self._animationControlOffset)
+            self._writeChunk(b'acTL', struct.pack('>II', self._numWrittenImages, 0))
+
+        self._file.close()
+        self._file = None
+
+    def _writeImage(self, image, offset, duration):
+        if (self._animationControlOffset is None):
+            self._writeChunk(b'IHDR', struct.pack('>IIBBBBB', image.width, image.height,
+                    8, 2, 0, 0, 0))
+
+            # The number of frames is filled in later.
+            self._animationControlOffset = self._file.tell()
+            self._writeChunk(b'acTL', struct.pack('>II', 0, 0))
+
+        # Delays are stored as a 16 bit fraction of a second.
+        duration = min(duration, MAX_APNG_DURATION)
+
+        self._writeChunk(b'fcTL', struct.pack('>IIIIIHHBB', self._nextSequenceNumber(),
+                image.width, image.height, offset[0], offset[1], duration, 1000, 0, 0))
+
+        data = _compressImage(image)
+        if (self._numWrittenImages == 0):
+            # The first frame is also the default (still) image.
+            self._writeChunk(b'IDAT', data)
+        else:
+            self._writeChunk(b'fdAT', struct.pack('>I', self._nextSequenceNumber()) + data)
+
+        self._numWrittenImages += 1
+
+    def _nextSequenceNumber(self):
+        number = self._sequenceNumber
+        self._sequenceNumber += 1
+        return number
+
+    def _writeChunk(self, chunkType, data):
+        self._file.write(struct.pack('>I', len(data)))
+        self._file.write(chunkType)
+        self._file.write(data)
+        self._file.write(struct.pack('>I', zlib.crc32(chunkType + data) & 0xFFFFFFFF))
+
+class FrameDirectoryEncoder(AbstractEncoder):
+    """
+    Write every frame as its own png in a directory (frame_000000.png, frame_000001.png, ...).
+    Tools like ffmpeg can turn these into a video later.
+    """
+
+    def __init__(self, path, fps):
+        super().__init__(path, fps)
+
+        os.makedirs(path, exist_ok = True)
+
+    def addImage(self, image):
+        image.save(os.path.join(self._path, FRAME_FILENAME % (self._numImages)))
+        self._numImages += 1
+
+    def close(self):
+        pass
+
+def _compressImage(image):
+    """
+    Get the compressed png image data for an image (with no filtering).
+    """
+
+    image = image.convert('RGB')
+    raw = image.tobytes()
+    stride = image.width * 3
+
+    rows = bytearray()
+    for y in range(image.height):
+        rows.append(0)
+        rows += raw[(y * stride):((y + 1) * stride)]
+
+    return zlib.compress(bytes(rows), PNG_COMPRESSION_LEVEL)
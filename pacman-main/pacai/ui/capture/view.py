@@ -12,4 +12,5 @@ class CaptureAbstractView(AbstractView):
 
     # Override
     def _createFrame(self, state):
-        return CaptureFrame(self._frameCount, state, self._turnCount)
+        return CaptureFrame(self._frameCount, state, self._turnCount,
+                previous = self._lastFrame)
@@ -23,17 +23,28 @@ class Frame(abc.ABC):
     """
     A general representation of that can be seen on-screen at a given time.
     Frames are the basic units of the views.
+
+    If the previous frame (of the same game) is supplied,
+    then the board is built from it by only looking at the cells whose food or capsules changed.
+    Columns that did not change are shared with the previous frame (frames are never modified).
     """
 
-    def __init__(self, frame, state, turn):
+    def __init__(self, frame, state, turn, previous = None):
         self._frame = frame
         self._turn = turn
 
-        self._boardHeight = state.getInitialLayout().getHeight()
-        self._boardWidth = state.getInitialLayout().getWidth()
+        self._layout = state.getInitialLayout()
+        self._boardHeight = self._layout.getHeight()
+        self._boardWidth = self._layout.getWidth()
+
+        self._foodBits = state.getFoodBits()
+        self._capsules = set(state.getCapsules())
 
         # All items on the board are at integral potision.
-        self._board = self._buildBoard(state)
+        if (previous is not None and previous._layout is self._layout):
+            self._board = self._updateBoard(state, previous)
+        else:
+            self._board = self._buildBoard(state)
 
         # Agents may not be at integral positions, so they are represented independently.
         self._agentTokens = self._getAgentTokens(state)
@@ -79,14 +90,37 @@ class Frame(abc.ABC):
     def getBoardWidth(self):
         return self._boardWidth
 
-    def toImage(self, sprites = {}, font = None):
-        # Height is +1 for the score.
-        size = (
-            self._boardWidth * spritesheet.SQUARE_SIZE,
-            (self._boardHeight + 1) * spritesheet.SQUARE_SIZE
-        )
+    def toImage(self, sprites = {}, font = None, cache = None):
+        """
+        Draw this frame.
+        If a `BoardCache` is supplied, then the board is drawn from (and updates) the cache,
+        so only the cells that changed since the last frame drawn with that cache are redrawn.
+        """
+
+        if (cache is None or len(self._highlightLocations) > 0):
+            image = self._drawBoard(sprites)
+        else:
+            image = cache.getBoardImage(self, sprites).copy()
+
+        draw = ImageDraw.Draw(image)
+
+        # Finally, overlay the agents.
+        for ((x, y), agentToken) in self._agentTokens.items():
+            self._placeToken(x, y, agentToken, sprites, image, draw)
+
+        # Draw score
+        position = self._toImageCoords(SCORE_X_POSITION, SCORE_Y_POSITION)
+        scoreText = "Score: %d" % (self._score)
+        draw.text(position, scoreText, self._getTextColor(), font)
 
-        image = Image.new('RGB', size, (0, 0, 0, 255))
+        return image
+
+    def _drawBoard(self, sprites, onlyWalls = False):
+        """
+        Draw a new image of just the board (with any highlights under it).
+        """
+
+        image = Image.new('RGB', self._getImageSize(), (0, 0, 0, 255))
         draw = ImageDraw.Draw(image)
 
         # First, draw any highlights.
@@ -102,37 +136,76 @@ class Frame(abc.ABC):
         # Then, draw the board.
         for x in range(self._boardWidth):
             for y in range(self._boardHeight):
-                if (self._board[x][y] != token.EMPTY_TOKEN):
-                    self._placeToken(x, y, self._board[x][y], sprites, image, draw)
+                objectToken = self._board[x][y]
+                if (objectToken == token.EMPTY_TOKEN):
+                    continue
 
-        # Finally, overlay the agents.
-        for ((x, y), agentToken) in self._agentTokens.items():
-            self._placeToken(x, y, agentToken, sprites, image, draw)
+                if (onlyWalls and not token.isWall(objectToken)):
+                    continue
 
-        # Draw score
-        position = self._toImageCoords(SCORE_X_POSITION, SCORE_Y_POSITION)
-        scoreText = "Score: %d" % (self._score)
-        draw.text(position, scoreText, self._getTextColor(), font)
+                self._placeToken(x, y, objectToken, sprites, image, draw)
 
         return image
 
+    def _getImageSize(self):
+        return (self.getImageWidth(), self.getImageHeight())
+
     def _buildBoard(self, state):
         board = self._boardWidth * [None]
         for x in range(self._boardWidth):
 
             items = self._boardHeight * [token.EMPTY_TOKEN]
             for y in range(self._boardHeight):
-                if (state.hasWall(x, y)):
-                    items[y] = self._getWallToken(x, y, state)
-                elif (state.hasFood(x, y)):
-                    items[y] = self._getFoodToken(x, y, state)
-                elif (state.hasCapsule(x, y)):
-                    items[y] = self._getCapsuleToken(x, y, state)
+                items[y] = self._getObjectToken(x, y, state)
 
             board[x] = items
 
         return board
 
+    def _updateBoard(self, state, previous):
+        """
+        Build the board from the previous frame's board,
+        only recomputing the cells where food or capsules were eaten (or put back).
+        """
+
+        board = list(previous._board)
+        copiedColumns = set()
+
+        changedCells = []
+
+        changedFood = self._foodBits ^ previous._foodBits
+        while (changedFood != 0):
+            bit = changedFood & -changedFood
+            changedFood ^= bit
+
+            # Bits are stored column-major (see BitGrid).
+            changedCells.append(divmod(bit.bit_length() - 1, self._boardHeight))
+
+        changedCells += list(self._capsules ^ previous._capsules)
+
+        for (x, y) in changedCells:
+            if (x not in copiedColumns):
+                board[x] = list(board[x])
+                copiedColumns.add(x)
+
+            board[x][y] = self._getObjectToken(x, y, state)
+
+        return board
+
+    def _getObjectToken(self, x, y, state):
+        """
+        Get the token for whatever is not an agent at (x, y).
+        """
+
+        if (state.hasWall(x, y)):
+            return self._getWallToken(x, y, state)
+        elif (state.hasFood(x, y)):
+            return self._getFoodToken(x, y, state)
+        elif (state.hasCapsule(x, y)):
+            return self._getCapsuleToken(x, y, state)
+
+        return token.EMPTY_TOKEN
+
     @abc.abstractmethod
     def _getAgentBaseToken(self, x, y, agentIndex, state):
         pass
@@ -241,3 +314,94 @@ class Frame(abc.ABC):
             return (0, 255, 0)
         else:
             return (0, 0, 0)
+
+    def __getstate__(self):
+        # The layout is only needed to build the next frame, so don't send it along with every frame.
+        state = self.__dict__.copy()
+        state['_layout'] = None
+        return state
+
+class BoardCache(object):
+    """
+    The board (everything but the agents and score) from the last frame drawn,
+    kept so the next frame only has to redraw the cells that changed.
+
+    The walls never change during a game, so they are drawn once onto a background.
+    Food and capsules are drawn over the background,
+    and a cell is redrawn (from the background) only when its token changes.
+    A cache should not be shared between threads.
+    """
+
+    def __init__(self):
+        self._key = None
+
+        # The walls.
+        self._background = None
+
+        # The walls and everything else on the board, along with the tokens that were drawn.
+        self._board = None
+        self._tokens = None
+
+    def getBoardImage(self, frame, sprites):
+        """
+        Get an image of the frame's board (which should not be modified).
+        """
+
+        key = (frame.getBoardWidth(), frame.getBoardHeight(), id(sprites))
+        if (key != self._key):
+            self._reset(key, frame, sprites)
+            return self._board
+
+        draw = None
+
+        for x in range(frame.getBoardWidth()):
+            column = frame.getCol(x)
+            oldColumn = self._tokens[x]
+
+            if (column == oldColumn):
+                continue
+
+            for y in range(frame.getBoardHeight()):
+                newToken = column[y]
+                oldToken = oldColumn[y]
+
+                if (newToken == oldToken):
+                    continue
+
+                # Walls are only drawn with the background, so a new layout needs a new cache.
+                if (token.isWall(newToken) or token.isWall(oldToken)):
+                    self._reset(key, frame, sprites)
+                    return self._board
+
+                # Clear the cell back to the background, then draw what is there now.
+                startPoint = frame._toImageCoords(x, y)
+                endPoint = frame._toImageCoords(x + 1, y - 1)
+                box = (startPoint[0], startPoint[1], endPoint[0], endPoint[1])
+                self._board.paste(self._background.crop(box), box)
+
+                if (newToken != token.EMPTY_TOKEN):
+                    if (draw is None):
+                        draw = ImageDraw.Draw(self._board)
+
+                    frame._placeToken(x, y, newToken, sprites, self._board, draw)
+
+            self._tokens[x] = list(column)
+
+        return self._board
+
+    def _reset(self, key, frame, sprites):
+        self._key = key
+        self._background = frame._drawBoard(sprites, onlyWalls = True)
+
+        self._board = self._background.copy()
+        draw = ImageDraw.Draw(self._board)
+
+        self._tokens = []
+        for x in range(frame.getBoardWidth()):
+            column = frame.getCol(x)
+            self._tokens.append(list(column))
+
+            for y in range(frame.getBoardHeight()):
+                objectToken = column[y]
+                if (objectToken != token.EMPTY_TOKEN and not token.isWall(objectToken)):
+                    frame._placeToken(x, y, objectToken, sprites, self._board, draw)
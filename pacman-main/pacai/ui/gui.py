@@ -8,6 +8,7 @@ from PIL import ImageTk
 
 from pacai.ui.keyboard import Keyboard
 from pacai.ui import spritesheet
+from pacai.ui.frame import BoardCache
 from pacai.ui.view import AbstractView
 
 MAX_FPS = 1000
@@ -60,6 +61,8 @@ class AbstractGUIView(AbstractView):
         self._dead = False
         self._keyboard = None
 
+        self._boardCache = BoardCache()
+
     # Override
     def finish(self):
         super().finish()
@@ -157,7 +160,7 @@ class AbstractGUIView(AbstractView):
         if (not forceDraw and self._adjustFPS()):
             return
 
-        image = frame.toImage(self._sprites, self._font)
+        image = frame.toImage(self._sprites, self._font, self._boardCache)
 
         # Check for a resize.
         if (self._height != frame.getImageHeight() or self._width != frame.getImageWidth()):
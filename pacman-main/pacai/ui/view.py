@@ -3,7 +3,9 @@ import os
 
 from PIL import ImageFont
 
+from pacai.ui import animation
 from pacai.ui import spritesheet
+from pacai.ui.frame import BoardCache
 
 DEFAULT_GIF_FPS = 10
 MIN_GIF_FPS = 1
@@ -15,24 +17,38 @@ DEFAULT_SPRITES = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'pac
 THIS_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)))
 FONT_PATH = os.path.join(THIS_DIR, 'fonts', 'roboto', 'RobotoMono-Regular.ttf')
 
+# What each gif worker process needs to render frames (see _initGifWorker).
+_workerSprites = None
+_workerFont = None
+_workerBoardCache = None
+
 class AbstractView(abc.ABC):
     """
     A abstarct view that represents all the necessary functionality a specific
     view should implement.
     The ability to produce a gif is inherent to all views,
     even if they do not produce graphics at runtime.
+    Gifs (or other animations, see `pacai.ui.animation`) are written as the game is played,
+    optionally rendered on a background thread (`gifBackground`)
+    and/or by a pool of worker processes (`gifWorkers`).
     """
 
     def __init__(self, spritesPath = DEFAULT_SPRITES,
-            gifPath = None, gifFPS = DEFAULT_GIF_FPS, skipFrames = DEFAULT_SKIP_FRAMES):
+            gifPath = None, gifFPS = DEFAULT_GIF_FPS, skipFrames = DEFAULT_SKIP_FRAMES,
+            gifFormat = None, gifBackground = False, gifWorkers = 0):
         self._spritesPath = spritesPath
 
         self._gifPath = gifPath
         self._gifFPS = max(MIN_GIF_FPS, int(gifFPS))
+        self._gifFormat = gifFormat
+        self._gifBackground = gifBackground
+        self._gifWorkers = max(0, int(gifWorkers))
 
         self._saveFrames = (self._gifPath is not None)
         self._skipFrames = max(1, int(skipFrames))
-        self._keyFrames = []
+
+        # Opened on the first key frame.
+        self._animation = None
 
         # The number of frames this view has produced.
         self._frameCount = 0
@@ -40,21 +56,29 @@ class AbstractView(abc.ABC):
         # (Tracked by the number of times agent 0 has been animated.)
         self._turnCount = 0
 
+        # The last frame created, so the next one can be built from just what changed.
+        self._lastFrame = None
+
         self._sprites = spritesheet.loadSpriteSheet(spritesPath)
         self._font = ImageFont.truetype(FONT_PATH, spritesheet.SQUARE_SIZE - 14)
 
+        # Fonts cannot be shared between threads, so a background writer gets its own.
+        self._gifFont = self._font
+        if (self._saveFrames and self._gifBackground):
+            self._gifFont = ImageFont.truetype(FONT_PATH, spritesheet.SQUARE_SIZE - 14)
+
+        # The gif is rendered separately from anything else (maybe on another thread).
+        self._gifBoardCache = BoardCache()
+
     def finish(self):
         """
         Signal that the game is over and the UI should cleanup.
         """
 
-        # Save the gif.
-        if (self._saveFrames and len(self._keyFrames) > 0):
-            gifTimePerFrameMS = int(1.0 / self._gifFPS * 1000.0)
-
-            images = [frame.toImage(self._sprites, self._font) for frame in self._keyFrames]
-            images[0].save(self._gifPath, save_all = True, append_images = images,
-                    duration = gifTimePerFrameMS, loop = 0, optimize = False)
+        # Finish the gif.
+        if (self._animation is not None):
+            self._animation.close()
+            self._animation = None
 
     def getKeyboard(self):
         """
@@ -70,6 +94,15 @@ class AbstractView(abc.ABC):
 
         pass
 
+    def needsUpdates(self):
+        """
+        Does this view need to see every state of a game?
+        If not, a game may only show it the first and last states
+        (see `pacai.core.game.Game`).
+        """
+
+        return True
+
     def update(self, state, forceDraw = False):
         """
         Materialize the view, given a state.
@@ -79,9 +112,12 @@ class AbstractView(abc.ABC):
             forceDraw = True
 
         frame = self._createFrame(state)
+        if (frame is not None):
+            self._lastFrame = frame
+
         if (frame is not None and self._saveFrames
                 and (state.isOver() or (self._frameCount % self._skipFrames == 0))):
-            self._keyFrames.append(frame)
+            self._addKeyFrame(frame)
 
         self._drawFrame(state, frame, forceDraw = forceDraw)
 
@@ -89,11 +125,30 @@ class AbstractView(abc.ABC):
         if (state.getLastAgentMoved() == 0):
             self._turnCount += 1
 
+    def _addKeyFrame(self, frame):
+        if (self._animation is None):
+            if (self._gifWorkers > 0):
+                # Each worker loads its own sprites and font, and keeps its own board cache.
+                self._animation = animation.openAnimation(self._gifPath, self._gifFPS,
+                        _renderGifWorkerFrame, format = self._gifFormat,
+                        background = self._gifBackground, workers = self._gifWorkers,
+                        initializer = _initGifWorker, initargs = (self._spritesPath,))
+            else:
+                self._animation = animation.openAnimation(self._gifPath, self._gifFPS,
+                        self._renderKeyFrame, format = self._gifFormat,
+                        background = self._gifBackground)
+
+        self._animation.addFrame(frame)
+
+    def _renderKeyFrame(self, frame):
+        return frame.toImage(self._sprites, self._gifFont, self._gifBoardCache)
+
     @abc.abstractmethod
     def _createFrame(self, state):
         """
         Create the frame using the given state.
-        Children can decide on the correct concrete representation of a frame.
+        Children can decide on the correct concrete representation of a frame,
+        and should build it from the last frame (`AbstractView._lastFrame`) when there is one.
         """
 
         pass
@@ -106,3 +161,13 @@ class AbstractView(abc.ABC):
         """
 
         pass
+
+def _initGifWorker(spritesPath):
+    global _workerSprites, _workerFont, _workerBoardCache
+
+    _workerSprites = spritesheet.loadSpriteSheet(spritesPath)
+    _workerFont = ImageFont.truetype(FONT_PATH, spritesheet.SQUARE_SIZE - 14)
+    _workerBoardCache = BoardCache()
+
+def _renderGifWorkerFrame(frame):
+    return frame.toImage(_workerSprites, _workerFont, _workerBoardCache)
@@ -0,0 +1,51 @@
+"""
+A bounded cache for things built from a grid (usually a layout's walls).
+"""
+
+import collections
+
+DEFAULT_CAPACITY = 16
+
+class GridCache(object):
+    """
+    A map from `pacai.core.grid.Grid` to a value built from it,
+    so things like distance tables are only built once for each set of walls in a process.
+
+    Keys are copied when stored, so later changes to a grid cannot corrupt the cache.
+    When the cache is full, the least recently used entry is dropped
+    (anyone still holding its value keeps it).
+    """
+
+    def __init__(self, capacity = DEFAULT_CAPACITY):
+        self._capacity = int(capacity)
+        self._entries = collections.OrderedDict()
+
+    def clear(self):
+        self._entries.clear()
+
+    def get(self, grid, build):
+        """
+        Get the value for a grid, calling `build()` to make it if the grid is not cached.
+        """
+
+        value = self._entries.get(grid)
+        if (value is not None):
+            self._entries.move_to_end(grid)
+            return value
+
+        value = build()
+
+        self._entries[grid.copy()] = value
+        if (len(self._entries) > self._capacity):
+            self._entries.popitem(last = False)
+
+        return value
+
+    def getCapacity(self):
+        return self._capacity
+
+    def __contains__(self, grid):
+        return grid in self._entries
+
+    def __len__(self):
+        return len(self._entries)
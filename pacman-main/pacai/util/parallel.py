@@ -0,0 +1,70 @@
+"""
+Utilities for playing many games across a pool of worker processes.
+"""
+
+import logging
+import multiprocessing
+import pickle
+import random
+
+from pacai.util.logs import initLogging
+
+MAX_SEED = 2**32
+
+# The game function and arguments, set once in each worker process.
+_workerContext = None
+
+def getGameSeeds(numGames):
+    """
+    Draw a seed (from `random`) for each of the next `numGames` games.
+    Seeding each game with its own seed (whether it is played in this process or not)
+    makes a seeded run produce the same games regardless of how many processes play them.
+    """
+
+    return [random.randint(0, MAX_SEED) for i in range(numGames)]
+
+def runGamesInParallel(playGame, gameArgs, seeds, jobs):
+    """
+    Play a game for each seed (see `getGameSeeds`) on a pool of `jobs` worker processes
+    and return the finished `pacai.core.game.Game` objects in order.
+
+    `playGame(*gameArgs)` must be a module-level function that plays a single game and returns it.
+    `random` is seeded with the game's seed right before each game.
+
+    Every worker receives its own snapshot of `gameArgs` (including any agents),
+    so agents must be picklable and learning done in one worker is not seen by the others.
+    The returned games do not hold the worker's agents or display.
+    """
+
+    try:
+        pickle.dumps(gameArgs)
+    except (pickle.PicklingError, AttributeError, TypeError) as ex:
+        raise ValueError('Games can only be run in parallel with picklable agents. -- %s' % (ex))
+
+    logging.info('Playing %d games on %d processes.' % (len(seeds), jobs))
+
+    initArgs = (playGame, gameArgs, logging.getLogger().getEffectiveLevel())
+    with multiprocessing.Pool(jobs, initializer = _initWorker, initargs = initArgs) as pool:
+        return pool.map(_playSeededGame, seeds, chunksize = 1)
+
+def _initWorker(playGame, gameArgs, loggingLevel):
+    global _workerContext
+
+    initLogging(loggingLevel)
+    logging.getLogger().setLevel(loggingLevel)
+
+    _workerContext = (playGame, gameArgs)
+
+def _playSeededGame(seed):
+    playGame, gameArgs = _workerContext
+
+    random.seed(seed)
+    logging.debug('Seed value: ' + str(seed))
+
+    game = playGame(*gameArgs)
+
+    # Agents and displays stay with the worker, only the game's results are sent back.
+    game.agents = None
+    game.display = None
+
+    return game
@@ -56,3 +56,90 @@ class PriorityQueueWithFunction(PriorityQueue):
 
     def __len__(self):
         return len(self.heap)
+
+class IndexedPriorityQueue(object):
+    """
+    A priority queue where each item is in the queue at most once,
+    and the priority of an item already in the queue can be lowered (decrease-key).
+    Items must be hashable, but do not need to be comparable:
+    ties in priority are broken by the order items were pushed (first in, first out).
+
+    Every item is indexed to its entry in the heap.
+    Lowering the priority of an item retires its old entry (which gets skipped when popped)
+    and pushes a new one, which keeps all the heap work inside `heapq`.
+    Retired entries are cleaned out whenever they make up most of the heap.
+    """
+
+    def __init__(self):
+        # Entries are [priority, count, item], and retired entries have an item of _RETIRED.
+        # Counts are unique, so comparing entries never has to compare items.
+        self._heap = []
+
+        # {item: the live entry of the item}.
+        self._entries = {}
+
+        self._count = 0
+
+    def getPriority(self, item):
+        """
+        Get the priority of an item in the queue.
+        """
+
+        return self._entries[item][0]
+
+    def isEmpty(self):
+        return len(self._entries) == 0
+
+    def pop(self):
+        """
+        Remove and return the item with the lowest priority.
+        """
+
+        return self.popWithPriority()[0]
+
+    def popWithPriority(self):
+        """
+        Remove and return the item with the lowest priority, along with its priority.
+        """
+
+        while (True):
+            (priority, _, item) = heapq.heappop(self._heap)
+            if (item is not _RETIRED):
+                del self._entries[item]
+                return item, priority
+
+    def push(self, item, priority):
+        """
+        Add an item to the queue.
+        If the item is already in the queue, then its priority is lowered to the given priority
+        (a higher priority is ignored).
+
+        Returns True if the item was added or had its priority lowered.
+        """
+
+        entry = self._entries.get(item)
+        if (entry is not None):
+            if (entry[0] <= priority):
+                return False
+
+            entry[2] = _RETIRED
+
+            if (len(self._heap) > 2 * len(self._entries)):
+                self._heap = [entry for entry in self._heap if entry[2] is not _RETIRED]
+                heapq.heapify(self._heap)
+
+        self._count += 1
+        entry = [priority, self._count, item]
+        self._entries[item] = entry
+        heapq.heappush(self._heap, entry)
+
+        return True
+
+    def __contains__(self, item):
+        return item in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+# Marks an entry in an IndexedPriorityQueue that has been replaced.
+_RETIRED = object()
@@ -0,0 +1,50 @@
+"""
+Zobrist hashing.
+
+A Zobrist hash of a set of features is the XOR of a random key for each feature.
+Adding or removing a feature is then just XORing its key in or out,
+so a hash can be kept up-to-date incrementally instead of being recomputed.
+"""
+
+MASK = (1 << 64) - 1
+
+# Game state features.
+FOOD = 1
+CAPSULE = 2
+
+# Keys are derived deterministically from the feature and cached on first use.
+_keys = {}
+
+def getKey(*feature):
+    """
+    Get the (64 bit) key for a feature, e.g. `getKey(FOOD, x, y)`.
+    The same feature will always get the same key.
+    """
+
+    key = _keys.get(feature)
+    if (key is None):
+        key = _mix(hash(feature))
+        _keys[feature] = key
+
+    return key
+
+def hashPositions(feature, positions):
+    """
+    Get the Zobrist hash for a feature present at each of the given (x, y) positions.
+    """
+
+    hashCode = 0
+    for (x, y) in positions:
+        hashCode ^= getKey(feature, x, y)
+
+    return hashCode
+
+def _mix(value):
+    """
+    Scramble an int into a well distributed 64 bit key (the SplitMix64 finalizer).
+    """
+
+    value = (value + 0x9E3779B97F4A7C15) & MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK
+    return value ^ (value >> 31)
@@ -0,0 +1,116 @@
+import time
+import unittest
+
+from pacai.agents.search.adversarial import AdversarialSearch
+from pacai.agents.search.adversarial import MODE_ALPHA_BETA
+from pacai.agents.search.adversarial import MODE_EXPECTIMAX
+from pacai.agents.search.adversarial import EXACT
+from pacai.agents.search.adversarial import LOWER_BOUND
+from pacai.agents.search.adversarial import MODE_MINIMAX
+from pacai.agents.search.adversarial import TranspositionTable
+from pacai.agents.search.adversarial import UPPER_BOUND
+from pacai.bin.pacman import PacmanGameState
+from pacai.core.eval import score
+from pacai.core.layout import Layout
+from pacai.core.layout import getLayout
+
+DEPTH = 2
+
+"""
+Test the adversarial search engine against a plain recursive search.
+"""
+class AdversarialSearchTest(unittest.TestCase):
+    def _plainValue(self, state, agentIndex, remaining, expectimax):
+        if (remaining == 0 or state.isOver()):
+            return score(state)
+
+        nextAgent = (agentIndex + 1) % state.getNumAgents()
+        values = [self._plainValue(successor, nextAgent, remaining - 1, expectimax)
+                for (action, successor) in state.generateSuccessors(agentIndex)]
+
+        if (agentIndex == 0):
+            return max(values)
+
+        if (expectimax):
+            return sum(values) / len(values)
+
+        return min(values)
+
+    def _checkMode(self, mode, expectimax):
+        state = PacmanGameState(getLayout('smallClassic', maxGhosts = 1))
+        expected = self._plainValue(state, 0, DEPTH * state.getNumAgents(), expectimax)
+
+        search = AdversarialSearch(score, mode)
+        value, action = search.search(state, 0, DEPTH)
+
+        self.assertAlmostEqual(expected, value)
+        self.assertIn(action, state.getLegalActions(0))
+        self.assertEqual(DEPTH, search.getCompletedDepth())
+        self.assertTrue(search.getNodeCount() > 0)
+
+    def test_minimax(self):
+        self._checkMode(MODE_MINIMAX, False)
+
+    def test_alpha_beta(self):
+        self._checkMode(MODE_ALPHA_BETA, False)
+
+    def test_expectimax(self):
+        self._checkMode(MODE_EXPECTIMAX, True)
+
+    def test_deadline(self):
+        state = PacmanGameState(getLayout('smallClassic', maxGhosts = 1))
+
+        # Even a passed deadline completes the first iteration.
+        search = AdversarialSearch(score, MODE_ALPHA_BETA)
+        value, action = search.search(state, 0, None, deadline = time.time() - 1.0)
+        self.assertIn(action, state.getLegalActions(0))
+        self.assertEqual(1, search.getCompletedDepth())
+
+        # A fixed depth still bounds a search with time to spare.
+        search = AdversarialSearch(score, MODE_ALPHA_BETA)
+        value, action = search.search(state, 0, DEPTH, deadline = time.time() + 60.0)
+        self.assertEqual(DEPTH, search.getCompletedDepth())
+
+        with self.assertRaises(ValueError):
+            search.search(state, 0, None)
+
+    def test_table(self):
+        table = TranspositionTable(2)
+
+        table.put('a', 2, 1.0, 0, None)
+        table.put('b', 1, 2.0, 0, None)
+
+        # Shallower results do not replace deeper ones.
+        table.put('a', 1, 5.0, 0, None)
+        self.assertEqual(1.0, table.get('a')[1])
+
+        # 'b' is now the least recently used.
+        table.put('c', 1, 3.0, 0, None)
+        self.assertEqual(2, len(table))
+        self.assertIsNone(table.get('b'))
+        self.assertIsNotNone(table.get('a'))
+
+    def test_stale_root_entry(self):
+        state = PacmanGameState(Layout(['%%%%%%', '%P. .%', '%%%%%%']))
+
+        # A deeper bound from an earlier search (with a bad move) is already in the table.
+        search = AdversarialSearch(score, MODE_ALPHA_BETA)
+        search.getTable().put((state, 0), 99, -1e9, UPPER_BOUND, 'Stop')
+
+        self.assertEqual((9, 'East'), search.search(state, 0, 1))
+        self.assertEqual((1, 9, EXACT, 'East'), search.getTable().get((state, 0)))
+
+    def test_table_bounds(self):
+        table = TranspositionTable()
+
+        # An exact value replaces a deeper bound, but a bound never replaces a deeper exact value.
+        table.put('a', 5, 1.0, LOWER_BOUND, 'North')
+        table.put('a', 1, 2.0, EXACT, 'South')
+        self.assertEqual((1, 2.0, EXACT, 'South'), table.get('a'))
+
+        table.put('b', 5, 1.0, EXACT, 'North')
+        table.put('b', 1, 2.0, UPPER_BOUND, 'South')
+        self.assertEqual((5, 1.0, EXACT, 'North'), table.get('b'))
+
+if __name__ == '__main__':
+    unittest.main()
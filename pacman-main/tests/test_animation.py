@@ -0,0 +1,134 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from PIL import Image
+from PIL import ImageChops
+
+from pacai.bin import pacman
+from pacai.ui import animation
+
+WIDTH = 40
+HEIGHT = 30
+FPS = 10
+
+def _renderWorkerFrame(index):
+    image = Image.new('RGB', (WIDTH, HEIGHT), (0, 0, 0))
+    image.paste((255, 0, 0), (index, 0, index + 4, 4))
+    return image
+
+"""
+Test writing animations a frame at a time.
+"""
+class AnimationTest(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def _makeImages(self):
+        images = []
+
+        # Move a square across the image (with a repeated frame in the middle).
+        for i in range(8):
+            image = Image.new('RGB', (WIDTH, HEIGHT), (0, 0, 0))
+            image.paste((255, 255, 0), (i * 4, 5, i * 4 + 6, 11))
+            images.append(image)
+
+            if (i == 3):
+                images.append(image.copy())
+
+        return images
+
+    def _checkAnimation(self, path, format, background):
+        images = self._makeImages()
+
+        writer = animation.openAnimation(path, FPS, lambda index: images[index],
+                format = format, background = background)
+        for i in range(len(images)):
+            writer.addFrame(i)
+        writer.close()
+
+        if (animation.getFormat(path) == animation.FORMAT_FRAMES):
+            self.assertEqual(len(images), len(os.listdir(path)))
+            return
+
+        # The repeated image is shown as a single (longer) frame.
+        expected = images[:4] + images[5:]
+
+        with Image.open(path) as result:
+            self.assertEqual(len(expected), result.n_frames)
+
+            for i in range(len(expected)):
+                result.seek(i)
+                diff = ImageChops.difference(result.convert('RGB'), expected[i])
+                self.assertIsNone(diff.getbbox())
+
+    def test_gif(self):
+        path = os.path.join(self._dir, 'test.gif')
+        self.assertEqual(animation.FORMAT_GIF, animation.getFormat(path))
+        self._checkAnimation(path, None, False)
+
+    def test_apng(self):
+        path = os.path.join(self._dir, 'test.png')
+        self.assertEqual(animation.FORMAT_APNG, animation.getFormat(path))
+        self._checkAnimation(path, None, False)
+
+    def test_frames(self):
+        path = os.path.join(self._dir, 'frames') + os.sep
+        self.assertEqual(animation.FORMAT_FRAMES, animation.getFormat(path))
+        self._checkAnimation(path, None, False)
+
+    def test_background(self):
+        self._checkAnimation(os.path.join(self._dir, 'test.gif'), animation.FORMAT_GIF, True)
+
+    def test_background_error(self):
+        def render(frame):
+            raise RuntimeError('Failed to render.')
+
+        writer = animation.openAnimation(os.path.join(self._dir, 'test.gif'), FPS, render,
+                background = True)
+        writer.addFrame(0)
+        self.assertRaises(RuntimeError, writer.close)
+
+    def test_workers(self):
+        for background in [False, True]:
+            path = os.path.join(self._dir, 'workers.gif')
+
+            # More frames than can be waiting at once.
+            numFrames = animation.DEFAULT_QUEUE_SIZE * 2
+            writer = animation.openAnimation(path, FPS, _renderWorkerFrame,
+                    background = background, workers = 2)
+            for i in range(numFrames):
+                writer.addFrame(i)
+            writer.close()
+
+            with Image.open(path) as result:
+                self.assertEqual(numFrames, result.n_frames)
+
+                for i in range(numFrames):
+                    result.seek(i)
+                    diff = ImageChops.difference(result.convert('RGB'), _renderWorkerFrame(i))
+                    self.assertIsNone(diff.getbbox())
+
+    def test_game_workers(self):
+        paths = [os.path.join(self._dir, 'serial.gif'), os.path.join(self._dir, 'workers.gif')]
+
+        pacman.main(['-p', 'GreedyAgent', '--null-graphics', '--seed', '1', '--gif', paths[0]])
+        pacman.main(['-p', 'GreedyAgent', '--null-graphics', '--seed', '1', '--gif', paths[1],
+                '--gif-workers', '2'])
+
+        with open(paths[0], 'rb') as serialFile, open(paths[1], 'rb') as workersFile:
+            self.assertEqual(serialFile.read(), workersFile.read())
+
+    def test_game(self):
+        path = os.path.join(self._dir, 'game.gif')
+        pacman.main(['-p', 'GreedyAgent', '--null-graphics', '--gif', path, '--gif-background'])
+
+        with Image.open(path) as result:
+            self.assertTrue(result.n_frames > 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
+import random
 import unittest
 
+from pacai.bin import benchmark
 from pacai.bin import capture
 from pacai.bin import gridworld
 from pacai.bin import pacman
@@ -60,6 +62,53 @@ class BinTest(unittest.TestCase):
         # Run game of pacman with seed value entry.
         pacman.main(['-p', 'GreedyAgent', '--null-graphics', '--seed', '1234'])
 
+    def test_parallel_runs(self):
+        # The same seed should give the same games, regardless of the number of processes.
+        runs = []
+        for jobs in ['1', '2', '3']:
+            runs.append(capture.main(['--null-graphics', '--seed', '1234', '-n', '3',
+                    '--jobs', jobs]))
+
+        for games in runs[1:]:
+            self.assertEqual([game.state.getScore() for game in runs[0]],
+                    [game.state.getScore() for game in games])
+            self.assertEqual([game.moveHistory for game in runs[0]],
+                    [game.moveHistory for game in games])
+
+        runs = []
+        for jobs in ['1', '2']:
+            runs.append(pacman.main(['-p', 'GreedyAgent', '--null-graphics', '--seed', '1234',
+                    '-n', '3', '--jobs', jobs]))
+
+        self.assertEqual(3, len(runs[1]))
+        self.assertEqual([game.state.getScore() for game in runs[0]],
+                [game.state.getScore() for game in runs[1]])
+        self.assertEqual([game.moveHistory for game in runs[0]],
+                [game.moveHistory for game in runs[1]])
+
+    def test_benchmark(self):
+        results = benchmark.main(['--num-games', '1', 'mediumClassic'])
+        self.assertEqual(['mediumClassic'], list(results.keys()))
+
+    def test_benchmark_value_iteration(self):
+        results = benchmark.main([benchmark.VALUE_ITERATION])[benchmark.VALUE_ITERATION]
+        self.assertEqual(benchmark.VALUE_ITERATION_GRIDS, list(results.keys()))
+
+        for backups in results.values():
+            self.assertTrue(backups['prioritized'] <= backups['value'])
+
+    def test_simulated_runs(self):
+        # Simulating a game should not change how it plays out.
+        games = []
+        for simulate in [False, True]:
+            random.seed(1234)
+            game = benchmark.newCaptureGame(simulate)
+            game.run()
+            games.append(game)
+
+        self.assertEqual(games[0].moveHistory, games[1].moveHistory)
+        self.assertEqual(games[0].state.getScore(), games[1].state.getScore())
+
     def test_capture_seeded_maze_generations(self):
         # Run game of capture with random generated map without seed value.
         capture.main(['--null-graphics', '--layout', 'RANDOM']) 
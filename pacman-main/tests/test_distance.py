@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+
+from pacai.bin import capture
+from pacai.core import distanceCalculator
+from pacai.core.layout import Layout
+
+LAYOUT_TEXT = [
+    '%%%%%%%',
+    '%  %  %',
+    '% %% %%',
+    '%     %',
+    '%%%%%%%',
+]
+
+"""
+Test the maze distance tables.
+"""
+class DistanceTest(unittest.TestCase):
+    def test_distances(self):
+        layout = Layout(LAYOUT_TEXT)
+        table = distanceCalculator.computeDistances(layout)
+
+        self.assertEqual(0, table[((1, 1), (1, 1))])
+        self.assertEqual(1, table[((1, 1), (2, 1))])
+        self.assertEqual(2, table[((1, 1), (1, 3))])
+        self.assertEqual(7, table[((2, 3), (4, 2))])
+        self.assertEqual(table[((5, 1), (4, 3))], table[((4, 3), (5, 1))])
+
+        self.assertNotIn(((0, 0), (1, 1)), table)
+        self.assertIsNone(table.get((0, 0), (1, 1)))
+
+    def test_shared_table(self):
+        # Separate layouts with the same walls should share a single table.
+        distancer1 = distanceCalculator.Distancer(Layout(LAYOUT_TEXT), cacheDir = None)
+        distancer1.getMazeDistances()
+
+        distancer2 = distanceCalculator.Distancer(Layout(LAYOUT_TEXT), cacheDir = None)
+        distancer2.getMazeDistances()
+
+        self.assertIs(distancer1._distances, distancer2._distances)
+
+    def test_cache(self):
+        layout = Layout(LAYOUT_TEXT)
+        expected = distanceCalculator.computeDistances(layout)
+
+        with tempfile.TemporaryDirectory() as cacheDir:
+            # The first load computes and writes the cache, the second reads it back.
+            for i in range(2):
+                # Drop any tables in memory, so the disk cache gets used.
+                distanceCalculator.distanceMap.clear()
+
+                distancer = distanceCalculator.Distancer(layout, cacheDir = cacheDir)
+                distancer.getMazeDistances()
+
+                for pos1 in expected.getPositions():
+                    for pos2 in expected.getPositions():
+                        self.assertEqual(expected[(pos1, pos2)],
+                                distancer.getDistance(pos1, pos2))
+
+            # Release the memory map before the directory is removed.
+            distancer = None
+            distanceCalculator.distanceMap.clear()
+
+    def test_cache_off_by_default(self):
+        with tempfile.TemporaryDirectory() as cacheDir:
+            distanceCalculator.distanceMap.clear()
+            distanceCalculator.Distancer(Layout(LAYOUT_TEXT)).getMazeDistances()
+            self.assertIsNone(distanceCalculator.getCacheDir())
+
+            # The command line turns the cache on.
+            distanceCalculator.distanceMap.clear()
+            try:
+                capture.main(['--null-graphics', '--max-moves', '4',
+                        '--distance-cache', cacheDir])
+                self.assertEqual(cacheDir, distanceCalculator.getCacheDir())
+                self.assertEqual(1, len(os.listdir(cacheDir)))
+            finally:
+                distanceCalculator.setCacheDir(None)
+                distanceCalculator.distanceMap.clear()
+
+    def test_registry_limit(self):
+        distanceCalculator.distanceMap.clear()
+
+        capacity = distanceCalculator.distanceMap.getCapacity()
+
+        # Walls with a different width each time.
+        layouts = []
+        for i in range(capacity + 2):
+            layouts.append(Layout(['%' * (i + 3), '%' + ' ' * (i + 1) + '%', '%' * (i + 3)]))
+
+        tables = [distanceCalculator.getDistanceTable(layout) for layout in layouts]
+        self.assertEqual(capacity, len(distanceCalculator.distanceMap))
+
+        # The oldest tables were dropped, the newest are still shared.
+        self.assertNotIn(layouts[0].walls, distanceCalculator.distanceMap)
+        self.assertIs(tables[-1], distanceCalculator.getDistanceTable(layouts[-1]))
+
+        distanceCalculator.distanceMap.clear()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pacai.bin import pacman
+from pacai.bin.pacman import PacmanGameState
+from pacai.core.featureExtractors import FeatureSchema
+from pacai.core.featureExtractors import SimpleExtractor
+from pacai.core.layout import getLayout
+
+NUM_EPISODES = 5
+
+"""
+Test extracting features as dense vectors and learning from them.
+"""
+class FeaturesTest(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def test_schema(self):
+        schema = FeatureSchema(['a', 'b', 'c'])
+
+        self.assertEqual(3, len(schema))
+        self.assertEqual(('a', 'b', 'c'), schema.getNames())
+        self.assertEqual(1, schema.getIndex('b'))
+
+        vector = schema.toVector({'c': 2.0})
+        self.assertEqual([0.0, 0.0, 2.0], list(vector))
+        self.assertEqual({'a': 0.0, 'b': 0.0, 'c': 2.0}, schema.toDict(vector))
+
+        self.assertRaises(ValueError, FeatureSchema, ['a', 'a'])
+
+    def test_simple_extractor(self):
+        state = PacmanGameState(getLayout('mediumGrid'))
+        actions = state.getLegalActions()
+
+        extractor = SimpleExtractor()
+        schema = extractor.getSchema()
+        self.assertIs(schema, SimpleExtractor.getSchema())
+
+        vectors = extractor.getFeatureVectors(state, actions)
+        self.assertEqual(len(actions), len(vectors))
+
+        for (action, vector) in zip(actions, vectors):
+            self.assertEqual(len(schema), len(vector))
+            self.assertEqual(list(vector), list(extractor.getFeatureVector(state, action)))
+            self.assertEqual(schema.toVector(extractor.getFeatures(state, action)), vector)
+            self.assertEqual(0.1, vector[schema.getIndex('bias')])
+
+        # The dicts only have eats-food when food is eaten.
+        features = extractor.getFeatures(state, 'Stop')
+        self.assertEqual(['#-of-ghosts-1-step-away', 'bias', 'closest-food'], sorted(features))
+
+    def test_same_weights(self):
+        weights = []
+
+        for agent in ['ApproximateQAgent', 'VectorApproximateQAgent']:
+            games = pacman.main([
+                '--pacman', agent,
+                '--agent-args', 'extractor=pacai.core.featureExtractors.SimpleExtractor',
+                '--num-training', str(NUM_EPISODES), '--num-games', str(NUM_EPISODES + 1),
+                '--layout', 'mediumGrid', '--null-graphics', '--quiet', '--seed', '1',
+                '--record', os.path.join(self._dir, 'games.replay'),
+            ])
+
+            agent = games[-1].agents[0]
+            if (isinstance(agent.weights, dict)):
+                weights.append(agent.weights)
+            else:
+                weights.append(agent.getWeights())
+
+        # The dict agent only has weights for features it has seen.
+        for (name, weight) in weights[1].items():
+            self.assertEqual(weights[0].get(name, 0.0), weight)
+
+if __name__ == '__main__':
+    unittest.main()
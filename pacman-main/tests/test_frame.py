@@ -0,0 +1,122 @@
+import random
+import unittest
+
+from PIL import ImageChops
+from PIL import ImageFont
+
+from pacai.bin.capture import CaptureGameState
+from pacai.bin.pacman import PacmanGameState
+from pacai.core.directions import Directions
+from pacai.core.layout import getLayout
+from pacai.ui import spritesheet
+from pacai.ui import view
+from pacai.ui.capture.frame import CaptureFrame
+from pacai.ui.frame import BoardCache
+from pacai.ui.pacman.frame import PacmanFrame
+
+NUM_MOVES = 40
+
+"""
+Test that frames built (and drawn) from previous frames look the same as frames made from scratch.
+"""
+class FrameTest(unittest.TestCase):
+    def setUp(self):
+        self._sprites = spritesheet.loadSpriteSheet(view.DEFAULT_SPRITES)
+        self._font = ImageFont.truetype(view.FONT_PATH, spritesheet.SQUARE_SIZE - 14)
+
+    def _getStates(self, state, numMoves = NUM_MOVES):
+        states = [state]
+
+        rng = random.Random(1)
+        for i in range(numMoves):
+            if (state.isOver()):
+                break
+
+            agentIndex = i % state.getNumAgents()
+            state = state.generateSuccessor(agentIndex,
+                    rng.choice(state.getLegalActions(agentIndex)))
+            states.append(state)
+
+        return states
+
+    def _getFrames(self, layoutName):
+        states = self._getStates(PacmanGameState(getLayout(layoutName)))
+        return [PacmanFrame(i, states[i], i // 5) for i in range(len(states))]
+
+    def test_cache(self):
+        cache = BoardCache()
+
+        # Switch layouts part way through to make sure the cache notices.
+        frames = self._getFrames('testClassic') + self._getFrames('smallClassic')
+        for frame in frames:
+            expected = frame.toImage(self._sprites, self._font)
+            actual = frame.toImage(self._sprites, self._font, cache)
+
+            self.assertIsNone(ImageChops.difference(expected, actual).getbbox())
+
+    def _checkIncremental(self, frameClass, states, step):
+        previous = None
+
+        # Going backwards puts food back on the board.
+        indexes = list(range(0, len(states), step))
+        for i in indexes + list(reversed(indexes)):
+            expected = frameClass(i, states[i], 0)
+            actual = frameClass(i, states[i], 0, previous = previous)
+
+            for x in range(expected.getBoardWidth()):
+                self.assertEqual(expected.getCol(x), actual.getCol(x))
+
+            previous = actual
+
+    def test_incremental(self):
+        states = self._getStates(PacmanGameState(getLayout('smallClassic')), 400)
+
+        # Views that skip frames still only see the previous frame they made.
+        for step in [1, 3]:
+            self._checkIncremental(PacmanFrame, states, step)
+
+    def test_incremental_capture(self):
+        state = CaptureGameState(getLayout('defaultCapture'), 1200)
+        states = [state]
+
+        # Eat everything on the board (a few pieces at a time).
+        eaten = ([(x, y, True) for (x, y) in state.getCapsules()]
+                + [(x, y, False) for (x, y) in state.getFood().asList()])
+        for i in range(len(eaten)):
+            if (i % 3 == 0):
+                state = state.generateSuccessor(0, Directions.STOP)
+                states.append(state)
+
+            (x, y, isCapsule) = eaten[i]
+            if (isCapsule):
+                state.eatCapsule(x, y)
+            else:
+                state.eatFood(x, y)
+
+        for step in [1, 4]:
+            self._checkIncremental(CaptureFrame, states, step)
+
+    def test_incremental_new_layout(self):
+        previous = PacmanFrame(0, PacmanGameState(getLayout('testClassic')), 0)
+
+        state = PacmanGameState(getLayout('smallClassic'))
+        expected = PacmanFrame(1, state, 0)
+        actual = PacmanFrame(1, state, 0, previous = previous)
+
+        self.assertEqual(expected.getBoardWidth(), actual.getBoardWidth())
+        for x in range(expected.getBoardWidth()):
+            self.assertEqual(expected.getCol(x), actual.getCol(x))
+
+    def test_highlights(self):
+        state = PacmanGameState(getLayout('smallClassic'))
+        state.setHighlightLocations([(1, 1), (2, 1)])
+        frame = PacmanFrame(0, state, 0)
+
+        cache = BoardCache()
+        expected = frame.toImage(self._sprites, self._font)
+        actual = frame.toImage(self._sprites, self._font, cache)
+
+        self.assertIsNone(ImageChops.difference(expected, actual).getbbox())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+
+from pacai.bin.pacman import PacmanGameState
+from pacai.core.directions import Directions
+from pacai.core.layout import getLayout
+from pacai.util import zobrist
+
+"""
+Test game state hashing.
+"""
+class GameStateTest(unittest.TestCase):
+    def _play(self, state, actions):
+        for action in actions:
+            state = state.generateSuccessor(0, action)
+
+        return state
+
+    def test_transposition_hash(self):
+        state = PacmanGameState(getLayout('testClassic', maxGhosts = 0))
+
+        # The same position reached through different move orders.
+        state1 = self._play(state, [Directions.NORTH, Directions.EAST, Directions.EAST])
+        state2 = self._play(state, [Directions.EAST, Directions.NORTH, Directions.EAST])
+
+        self.assertEqual(state1, state2)
+        self.assertEqual(hash(state1), hash(state2))
+        self.assertNotEqual(hash(state), hash(state1))
+
+    def test_incremental_board_hash(self):
+        state = PacmanGameState(getLayout('testClassic', maxGhosts = 0))
+        numFood = state.getNumFood()
+
+        successor = self._play(state, [Directions.EAST, Directions.EAST])
+        self.assertEqual(numFood - 1, successor.getNumFood())
+
+        expected = zobrist.hashPositions(zobrist.FOOD, successor.getFood().asList())
+        self.assertEqual(expected, successor._boardHash)
+
+        # The parent state is untouched.
+        self.assertEqual(zobrist.hashPositions(zobrist.FOOD, state.getFood().asList()),
+                state._boardHash)
+
+    def test_shared_agent_states(self):
+        state = PacmanGameState(getLayout('testClassic'))
+        ghostState = state.getAgentState(1)
+
+        successor = state.generateSuccessor(0, Directions.NORTH)
+
+        # Only the agent that moved gets a new state.
+        self.assertIs(ghostState, successor.getAgentState(1))
+        self.assertIsNot(state.getAgentState(0), successor.getAgentState(0))
+        self.assertEqual((1, 1), state.getAgentPosition(0))
+        self.assertEqual((1, 2), successor.getAgentPosition(0))
+
+        # Writing to a shared state copies it first.
+        successor.getMutableAgentState(1).setScaredTimer(10)
+        self.assertEqual(0, ghostState.getScaredTimer())
+        self.assertEqual(10, successor.getAgentState(1).getScaredTimer())
+
+    def test_generate_successors(self):
+        state = PacmanGameState(getLayout('testClassic'))
+
+        for agentIndex in range(state.getNumAgents()):
+            successors = state.generateSuccessors(agentIndex)
+
+            self.assertEqual(state.getLegalActions(agentIndex),
+                    [action for (action, successor) in successors])
+
+            for (action, successor) in successors:
+                self.assertEqual(state.generateSuccessor(agentIndex, action), successor)
+
+        with self.assertRaises(ValueError):
+            state.generateSuccessors(0, [Directions.WEST])
+
+if __name__ == '__main__':
+    unittest.main()
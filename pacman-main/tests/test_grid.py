@@ -0,0 +1,65 @@
+import unittest
+
+from pacai.core.grid import BitGrid
+from pacai.core.grid import Grid
+
+"""
+Test the bitboard grid against the list-backed grid.
+"""
+class GridTest(unittest.TestCase):
+    def _buildGrids(self, width, height, positions):
+        grid = Grid(width, height)
+        bitGrid = BitGrid(width, height)
+
+        for (x, y) in positions:
+            grid[x][y] = True
+            bitGrid[x][y] = True
+
+        return grid, bitGrid
+
+    def test_matches_grid(self):
+        positions = [(0, 0), (1, 2), (3, 1), (4, 3), (2, 2)]
+        grid, bitGrid = self._buildGrids(5, 4, positions)
+
+        self.assertEqual(grid.count(), bitGrid.count())
+        self.assertEqual(grid.count(False), bitGrid.count(False))
+        self.assertEqual(grid.asList(), bitGrid.asList())
+        self.assertEqual(grid.asList(False), bitGrid.asList(False))
+        self.assertEqual(hash(grid), hash(bitGrid))
+        self.assertEqual(str(grid), str(bitGrid))
+        self.assertEqual(bitGrid, grid)
+
+        for x in range(5):
+            for y in range(4):
+                self.assertEqual(grid[x][y], bitGrid[x][y])
+                self.assertEqual(grid.get(x, y), bitGrid.get(x, y))
+
+    def test_copy(self):
+        _, bitGrid = self._buildGrids(3, 3, [(1, 1), (2, 0)])
+
+        copy = bitGrid.copy()
+        self.assertEqual(bitGrid, copy)
+        self.assertEqual(hash(bitGrid), hash(copy))
+
+        copy[1][1] = False
+        self.assertTrue(bitGrid[1][1])
+        self.assertFalse(copy[1][1])
+        self.assertNotEqual(bitGrid, copy)
+        self.assertEqual(1, copy.count())
+
+    def test_initial_value(self):
+        bitGrid = BitGrid(4, 3, initialValue = True)
+        self.assertEqual(12, bitGrid.count())
+        self.assertEqual([], bitGrid.asList(False))
+
+    def test_bounds(self):
+        bitGrid = BitGrid(2, 2)
+
+        with self.assertRaises(IndexError):
+            bitGrid[2][0]
+
+        with self.assertRaises(IndexError):
+            bitGrid[0][2]
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+
+from pacai.bin.capture import CaptureGameState
+from pacai.core import distanceCalculator
+from pacai.core.directions import Directions
+from pacai.core.layout import Layout
+from pacai.core.layout import getLayout
+from pacai.student.myTeam_Both import OffensiveAgent
+
+LAYOUT_TEXT = [
+    '%%%%%%%%%',
+    '%   %   %',
+    '% % % %%%',
+    '%       %',
+    '%%%%%%%%%',
+]
+
+"""
+Test the junction and corridor graph of layouts.
+"""
+class MazeGraphTest(unittest.TestCase):
+    def test_graph(self):
+        graph = Layout(LAYOUT_TEXT).getMazeGraph()
+
+        self.assertEqual([(3, 1), (5, 1), (7, 1), (7, 3)], sorted(graph.getNodes()))
+        self.assertTrue(graph.isNode((7, 3)))
+        self.assertFalse(graph.isNode((2, 3)))
+
+        self.assertEqual(3, graph.getExits((3, 1)))
+        self.assertEqual(2, graph.getExits((2, 3)))
+        self.assertEqual(1, graph.getExits((7, 3)))
+
+        # The loop on the left leaves and comes back to (3, 1).
+        self.assertEqual([((3, 1), 8, Directions.NORTH), ((5, 1), 2, Directions.EAST),
+                ((3, 1), 8, Directions.WEST)], graph.getEdges((3, 1)))
+        self.assertEqual([((5, 1), 4, Directions.WEST)], graph.getEdges((7, 3)))
+
+        self.assertEqual(((3, 1), 5, (3, 1), 3), graph.getCorridor((2, 3)))
+        self.assertEqual(((7, 3), 2, (5, 1), 2), graph.getCorridor((5, 3)))
+        self.assertEqual(((5, 1), 0, (5, 1), 0), graph.getCorridor((5, 1)))
+
+        # Everything right of the loop is a dead end.
+        self.assertEqual(0, graph.getDeadEndDepth((3, 1)))
+        self.assertEqual(0, graph.getDeadEndDepth((1, 3)))
+        self.assertFalse(graph.isDeadEnd((1, 3)))
+        self.assertIsNone(graph.getDeadEndExit((1, 3)))
+
+        self.assertEqual(1, graph.getDeadEndDepth((4, 1)))
+        self.assertEqual(4, graph.getDeadEndDepth((7, 1)))
+        self.assertEqual(6, graph.getDeadEndDepth((7, 3)))
+        self.assertTrue(graph.isDeadEnd((7, 3)))
+        self.assertEqual((3, 1), graph.getDeadEndExit((7, 3)))
+
+    def test_loop(self):
+        graph = Layout([
+            '%%%%%',
+            '%   %',
+            '% % %',
+            '%   %',
+            '%%%%%',
+        ]).getMazeGraph()
+
+        # A loop without any junctions still gets a node.
+        self.assertEqual(1, len(graph.getNodes()))
+
+        node = graph.getNodes()[0]
+        self.assertEqual([8, 8], [length for (_, length, _) in graph.getEdges(node)])
+        self.assertFalse(any([graph.isDeadEnd(position) for position in [(1, 1), (2, 3)]]))
+
+    def test_layouts(self):
+        for name in ['mediumClassic', 'defaultCapture', 'jumboCapture', 'openMaze', 'bigMaze']:
+            layout = getLayout(name)
+            graph = layout.getMazeGraph()
+            distances = distanceCalculator.computeDistances(layout)
+
+            for position in layout.walls.asList(False):
+                (end1, distance1, end2, distance2) = graph.getCorridor(position)
+                self.assertTrue(graph.isNode(end1) and graph.isNode(end2))
+                self.assertTrue(distances[(position, end1)] <= distance1)
+                self.assertTrue(distances[(position, end2)] <= distance2)
+
+                if (graph.isNode(position)):
+                    self.assertNotEqual(2, graph.getExits(position))
+                    for (node, length, _) in graph.getEdges(position):
+                        self.assertTrue(distances[(position, node)] <= length)
+
+                depth = graph.getDeadEndDepth(position)
+                self.assertEqual(depth > 0, graph.isDeadEnd(position))
+
+                exit = graph.getDeadEndExit(position)
+                if (exit is not None):
+                    self.assertEqual(depth, distances[(position, exit)])
+                    self.assertFalse(graph.isDeadEnd(exit))
+
+        # A perfect maze has no loops, so all of it is a dead end.
+        graph = getLayout('bigMaze').getMazeGraph()
+        self.assertTrue(all([graph.isDeadEnd(position)
+                for position in getLayout('bigMaze').walls.asList(False)]))
+
+    def test_shared_graph(self):
+        self.assertIs(Layout(LAYOUT_TEXT).getMazeGraph(), Layout(LAYOUT_TEXT).getMazeGraph())
+
+    def test_capture_targets(self):
+        # The closer food is 8 moves into a dead end, the other food is on a loop.
+        layout = Layout([
+            '%%%%%%%%%%%%%%%%%%%%%%%%',
+            '%%%%%%%%%%%%%    .%%%%%%',
+            '%%%%%%%%%%%%% %%%%%%%%%%',
+            '%1                    .%',
+            '%%%%%%%%%%%%%%% %%%%%% %',
+            '%3%%%%%%%%%%%%%    2  4%',
+            '%%%%%%%%%%%%%%%%%%%%%%%%',
+        ])
+        state = CaptureGameState(layout, 100)
+
+        agent = OffensiveAgent(0)
+        agent.registerInitialState(state)
+
+        self.assertTrue(agent.isInDeadEnd((17, 5), state))
+        self.assertFalse(agent.isInDeadEnd((22, 3), state))
+
+        agent.chooseAction(state)
+        self.assertEqual((22, 3), agent.currentTarget)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,207 @@
+import unittest
+
+from pacai.bin import gridworld
+from pacai.core import valueIteration
+from pacai.core.mdp import CachedMDP
+from pacai.student.valueIterationAgent import AsynchronousValueIterationAgent
+from pacai.student.valueIterationAgent import PrioritizedSweepingValueIterationAgent
+from pacai.student.valueIterationAgent import ValueIterationAgent
+
+GRIDS = ['BookGrid', 'BridgeGrid', 'CliffGrid', 'Cliff2Grid', 'DiscountGrid', 'MazeGrid']
+DISCOUNT = 0.9
+ITERATIONS = 50
+
+def _getMDP(name, noise = 0.2, livingReward = 0.0):
+    mdp = gridworld._getGridWorld(name)
+    mdp.setNoise(noise)
+    mdp.setLivingReward(livingReward)
+    return mdp
+
+class CountingGridworld(gridworld.Gridworld):
+    def __init__(self, grid):
+        super().__init__(grid)
+        self.numCalls = 0
+
+    def getTransitionStatesAndProbs(self, state, action):
+        self.numCalls += 1
+        return super().getTransitionStatesAndProbs(state, action)
+
+def _naiveValueIteration(mdp, discountRate, iters):
+    values = {state: 0.0 for state in mdp.getStates()}
+
+    for _ in range(iters):
+        newValues = values.copy()
+
+        for state in mdp.getStates():
+            if (mdp.isTerminal(state)):
+                newValues[state] = 0.0
+                continue
+
+            qValues = []
+            for action in mdp.getPossibleActions(state):
+                qValue = 0.0
+                for (nextState, prob) in mdp.getTransitionStatesAndProbs(state, action):
+                    reward = mdp.getReward(state, action, nextState)
+                    qValue += prob * (reward + discountRate * values[nextState])
+
+                qValues.append(qValue)
+
+            newValues[state] = max(qValues)
+
+        values = newValues
+
+    return values
+
+"""
+Test solving MDPs from a compiled transition model.
+"""
+class MDPTest(unittest.TestCase):
+    def test_model(self):
+        mdp = _getMDP('BookGrid')
+        model = mdp.getTransitionModel()
+
+        self.assertEqual(mdp.getStates(), model.states)
+
+        for state in mdp.getStates():
+            stateIndex = model.getStateIndex(state)
+            self.assertEqual(state, model.getState(stateIndex))
+
+            if (mdp.isTerminal(state)):
+                self.assertEqual((), model.getActions(stateIndex))
+                continue
+
+            self.assertEqual(tuple(mdp.getPossibleActions(state)), model.getActions(stateIndex))
+
+            for action in mdp.getPossibleActions(state):
+                row = model.getRow(stateIndex, action)
+
+                transitions = []
+                for entry in range(model.rowStarts[row], model.rowStarts[row + 1]):
+                    nextState = model.getState(model.nextStates[entry])
+                    transitions.append((nextState, model.probs[entry]))
+                    self.assertEqual(mdp.getReward(state, action, nextState), model.rewards[entry])
+
+                self.assertEqual(mdp.getTransitionStatesAndProbs(state, action), transitions)
+
+        self.assertRaises(ValueError, model.getRow, model.getStateIndex((0, 0)), 'exit')
+
+    def test_value_iteration(self):
+        for name in GRIDS:
+            for (noise, livingReward) in [(0.2, 0.0), (0.0, -1.0)]:
+                mdp = _getMDP(name, noise, livingReward)
+                expected = _naiveValueIteration(mdp, DISCOUNT, ITERATIONS)
+
+                agent = ValueIterationAgent(0, mdp, DISCOUNT, ITERATIONS)
+                self.assertEqual(ITERATIONS, agent.numIterations)
+
+                for state in mdp.getStates():
+                    self.assertEqual(expected[state], agent.getValue(state))
+
+    def test_tolerance(self):
+        for name in GRIDS:
+            model = _getMDP(name).getTransitionModel()
+
+            values, iterations = valueIteration.valueIteration(model, DISCOUNT, tolerance = 1e-8)
+            self.assertTrue(iterations < 1000)
+
+            # Another sweep should not change anything (by more than the tolerance).
+            nextValues, _ = valueIteration.valueIteration(model, DISCOUNT,
+                    tolerance = None, maxIterations = 1, values = values)
+            for stateIndex in range(model.getNumStates()):
+                self.assertAlmostEqual(values[stateIndex], nextValues[stateIndex], places = 7)
+
+            # Following the greedy policy should be worth the same.
+            policy = valueIteration.getPolicy(model, values, DISCOUNT)
+            policyValues, _ = valueIteration.evaluatePolicy(model, policy, DISCOUNT,
+                    tolerance = 1e-8)
+            for stateIndex in range(model.getNumStates()):
+                self.assertAlmostEqual(values[stateIndex], policyValues[stateIndex], places = 5)
+
+        self.assertRaises(ValueError, valueIteration.valueIteration, model, DISCOUNT,
+                tolerance = None, maxIterations = None)
+
+    def test_predecessors(self):
+        model = _getMDP('MazeGrid').getTransitionModel()
+        predecessors = model.getPredecessors()
+
+        for stateIndex in range(model.getNumStates()):
+            for row in range(model.actionStarts[stateIndex], model.actionStarts[stateIndex + 1]):
+                for entry in range(model.rowStarts[row], model.rowStarts[row + 1]):
+                    self.assertIn(stateIndex, predecessors[model.nextStates[entry]])
+
+        # Nothing leaves the terminal state.
+        terminalIndex = model.getStateIndex('TERMINAL_STATE')
+        for stateIndex in range(model.getNumStates()):
+            self.assertNotIn(terminalIndex, predecessors[stateIndex])
+
+    def test_in_place(self):
+        for name in GRIDS:
+            mdp = _getMDP(name)
+            expected = ValueIterationAgent(0, mdp, DISCOUNT, None, tolerance = 1e-10)
+
+            for agentClass in [AsynchronousValueIterationAgent,
+                    PrioritizedSweepingValueIterationAgent]:
+                agent = agentClass(0, mdp, DISCOUNT, None, tolerance = 1e-8)
+                self.assertTrue(agent.numBackups <= expected.numBackups)
+
+                for state in mdp.getStates():
+                    self.assertAlmostEqual(expected.getValue(state), agent.getValue(state),
+                            places = 5)
+                    self.assertEqual(expected.getPolicy(state), agent.getPolicy(state))
+
+    def test_max_backups(self):
+        model = _getMDP('DiscountGrid').getTransitionModel()
+
+        for solve in [valueIteration.asyncValueIteration, valueIteration.prioritizedSweeping]:
+            _, backups = solve(model, DISCOUNT, maxBackups = 10)
+            self.assertEqual(10, backups)
+
+        # The iters of the agents are counted in sweeps.
+        agent = AsynchronousValueIterationAgent(0, _getMDP('DiscountGrid'), DISCOUNT, 2)
+        self.assertEqual(2, agent.numIterations)
+        self.assertEqual(2 * model.getNumStates(), agent.numBackups)
+
+    def test_cached(self):
+        mdp = CountingGridworld(gridworld.BOOK_GRID)
+        cached = CachedMDP(mdp)
+
+        expected = _naiveValueIteration(mdp, DISCOUNT, ITERATIONS)
+        numCalls = mdp.numCalls
+
+        self.assertEqual(expected, _naiveValueIteration(cached, DISCOUNT, ITERATIONS))
+        self.assertEqual(expected, _naiveValueIteration(cached, DISCOUNT, ITERATIONS))
+
+        # Each (state, action) is only asked for once.
+        self.assertEqual(numCalls + numCalls // ITERATIONS, mdp.numCalls)
+
+        # Anything else goes to the wrapped MDP.
+        self.assertIs(mdp.grid, cached.grid)
+        self.assertIs(cached.getTransitionModel(), cached.getTransitionModel())
+
+        # Changing the MDP (through the wrapper or not) clears the cache.
+        for target in [cached, mdp]:
+            model = cached.getTransitionModel()
+
+            target.setNoise(0.0)
+            self.assertEqual(mdp.getTransitionStatesAndProbs((0, 0), 'north'),
+                    cached.getTransitionStatesAndProbs((0, 0), 'north'))
+            self.assertIsNot(model, cached.getTransitionModel())
+
+            target.setLivingReward(-1.0)
+            self.assertEqual(-1.0, cached.getReward((0, 0), 'north', (0, 1)))
+
+            expected = _naiveValueIteration(mdp, DISCOUNT, ITERATIONS)
+            self.assertEqual(expected, _naiveValueIteration(cached, DISCOUNT, ITERATIONS))
+
+            mdp.setNoise(0.2)
+            mdp.setLivingReward(0.0)
+
+    def test_agent_tolerance(self):
+        mdp = _getMDP('BookGrid')
+        agent = ValueIterationAgent(0, mdp, DISCOUNT, 1000, tolerance = 1e-4)
+
+        self.assertTrue(agent.numIterations < 1000)
+        self.assertEqual('north', agent.getPolicy((0, 0)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,22 @@
 import os
+import random
 import tempfile
 import unittest
 
+from pacai.agents.base import BaseAgent
+from pacai.agents.ghost.random import RandomGhost
 from pacai.bin import capture
 from pacai.bin import pacman
+from pacai.bin.capture import CaptureGameState
+from pacai.core import replay
+from pacai.core.directions import Directions
+from pacai.core.layout import getLayout
+from pacai.ui.pacman.null import PacmanNullView
 
 PACMAN_FILENAME = 'pacai_unittest_pacman.replay'
 CAPTURE_FILENAME = 'pacai_unittest_capture.replay'
+FORMAT_FILENAME = 'pacai_unittest_format.replay'
+CRASH_FILENAME = 'pacai_unittest_crash.replay'
 
 """
 Test saving and playing replays.
@@ -23,17 +33,125 @@ class ReplayTest(unittest.TestCase):
         pacman.main(['--null-graphics', '--replay', replayPath])
 
         os.remove(replayPath)
+        os.remove(replayPath + replay.INDEX_SUFFIX)
 
     def test_capture(self):
         replayPath = os.path.join(tempfile.gettempdir(), CAPTURE_FILENAME)
 
-        capture.main(['--null-graphics', '--fps=1000', '--record', replayPath])
+        games = capture.main(['--null-graphics', '--fps=1000', '-n', '2', '--record', replayPath])
 
         self.assertTrue(os.path.isfile(replayPath))
 
-        capture.main(['--null-graphics', '--replay', replayPath])
+        with replay.ReplayReader(replayPath) as reader:
+            self.assertEqual(2, reader.getNumGames())
+            self.assertEqual(games[0].moveHistory, reader.getMoves(0))
+            self.assertEqual(games[1].moveHistory, reader.getMoves(1))
+
+        capture.main(['--null-graphics', '--replay', replayPath, '--replay-game', '0'])
+
+        os.remove(replayPath)
+        os.remove(replayPath + replay.INDEX_SUFFIX)
+
+    def test_format(self):
+        replayPath = os.path.join(tempfile.gettempdir(), FORMAT_FILENAME)
+        layout = getLayout('smallClassic', maxGhosts = 1)
+
+        # Enough moves to span several chunks.
+        longGame = [(i % 5, replay.ACTIONS[i % len(replay.ACTIONS)]) for i in range(10000)]
+        shortGame = [(0, Directions.NORTH), (1, Directions.STOP)]
+
+        with replay.ReplayWriter(replayPath) as writer:
+            writer.writeGame(layout, {'name': 'long'}, longGame)
+            writer.writeGame(layout, {'name': 'short'}, shortGame)
+
+            # An unfinished game is not part of the replay.
+            writer.startGame(layout)
+            writer.recordMove(0, Directions.EAST)
+
+        with replay.ReplayWriter(replayPath, append = True) as writer:
+            self.assertRaises(ValueError, writer.recordMove, 0, Directions.EAST)
+            writer.writeGame(layout, {'name': 'empty'}, [])
+
+        # Check reading both with the index and without it (rebuilding it).
+        for useIndex in [True, False]:
+            if (not useIndex):
+                os.remove(replayPath + replay.INDEX_SUFFIX)
+
+            with replay.ReplayReader(replayPath) as reader:
+                self.assertEqual(3, len(reader))
+
+                self.assertEqual({'name': 'empty'}, reader.getInfo(-1))
+                self.assertEqual([], reader.getMoves(2))
+                self.assertEqual(shortGame, reader.getMoves(1))
+                self.assertEqual(longGame, reader.getMoves(0))
+
+                self.assertEqual(1, reader.getLayout(1).getNumGhosts())
+                self.assertEqual(layout.layoutText, reader.getLayout(1).layoutText)
+
+                self.assertRaises(IndexError, reader.getMoves, 3)
+
+        os.remove(replayPath)
+        os.remove(replayPath + replay.INDEX_SUFFIX)
+
+    def test_seeker(self):
+        games = capture.main(['--null-graphics', '--seed', '4321', '--max-moves', '300'])
+        moves = games[0].moveHistory
+
+        states = [CaptureGameState(getLayout('defaultCapture'), 300)]
+        for move in moves:
+            states.append(states[-1].generateSuccessor(*move))
+
+        seeker = replay.ReplaySeeker(states[0], moves, interval = 7)
+        self.assertEqual(len(moves), seeker.getNumPlies())
+
+        # Jump around, both before and after snapshots have been made.
+        plies = list(range(len(states)))
+        random.Random(1).shuffle(plies)
+        for ply in plies[:50] + [len(moves), 0] + plies[50:100]:
+            self.assertEqual(states[ply], seeker.getState(ply))
+
+        self.assertEqual(states[10:21], list(seeker.iterStates(10, 20)))
+        self.assertEqual(states[-3:], list(seeker.iterStates(len(moves) - 2)))
+
+        self.assertRaises(IndexError, seeker.getState, len(moves) + 1)
+
+    def test_crash(self):
+        replayPath = os.path.join(tempfile.gettempdir(), CRASH_FILENAME)
+        layout = getLayout('smallClassic')
+        ghosts = [RandomGhost(i + 1) for i in range(layout.getNumGhosts())]
+
+        # An illegal action is a crash, and is not recorded.
+        games = pacman.runGames(layout, BogusAgent(), ghosts, PacmanNullView(), 1,
+                record = replayPath, catchExceptions = True)
+        self.assertTrue(games[0].agentCrashed)
+        self.assertEqual([], games[0].moveHistory)
+
+        with replay.ReplayReader(replayPath) as reader:
+            self.assertEqual([[]], [reader.getMoves(i) for i in range(len(reader))])
+
+        # A game that raises still leaves a readable replay.
+        self.assertRaises(Exception, pacman.runGames, layout, BogusAgent(), ghosts,
+                PacmanNullView(), 1, record = replayPath)
+
+        with replay.ReplayReader(replayPath) as reader:
+            self.assertEqual(0, len(reader))
+
+        os.remove(replayPath)
+        os.remove(replayPath + replay.INDEX_SUFFIX)
+
+    def test_not_a_replay(self):
+        replayPath = os.path.join(tempfile.gettempdir(), FORMAT_FILENAME)
+
+        with open(replayPath, 'wb') as file:
+            file.write(b'not a replay')
+
+        self.assertRaises(ValueError, replay.ReplayReader, replayPath)
 
         os.remove(replayPath)
 
+class BogusAgent(BaseAgent):
+    def getAction(self, state):
+        return 'Bogus'
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,225 @@
+import unittest
+
+from pacai.bin.pacman import PacmanGameState
+from pacai.core import distanceCalculator
+from pacai.core.actions import Actions
+from pacai.core.layout import Layout
+from pacai.core.layout import getLayout
+from pacai.core.search import engine
+from pacai.core.search import heuristic
+from pacai.core.search import routing
+from pacai.core.search import search
+from pacai.core.search.food import FoodSearchProblem
+from pacai.core.search.position import PositionSearchProblem
+from pacai.core.search.problem import SearchProblem
+
+"""
+Test the search problems.
+"""
+class SearchTest(unittest.TestCase):
+    def test_food_states(self):
+        state = PacmanGameState(getLayout('trickySearch'))
+        problem = FoodSearchProblem(state)
+
+        start = problem.startingState()
+        self.assertEqual(state.getPacmanPosition(), problem.getPosition(start))
+        self.assertEqual(state.getFood(), problem.getFoodGrid(start))
+        self.assertEqual(state.getFood().asList(), problem.getFoodPositions(start))
+        self.assertEqual(state.getNumFood(), problem.getNumFood(start))
+        self.assertFalse(problem.isGoal(start))
+
+        for (successor, action, cost) in problem.successorStates(start):
+            self.assertEqual(1, cost)
+
+            gameState = state.generateSuccessor(0, action)
+            self.assertEqual(gameState.getPacmanPosition(), problem.getPosition(successor))
+            self.assertEqual(gameState.getFood(), problem.getFoodGrid(successor))
+
+        # Only legal moves are successors.
+        actions = [action for (_, action, _) in problem.successorStates(start)]
+        self.assertEqual(sorted(state.getLegalActions()), sorted(actions + ['Stop']))
+
+        for position in [(1, 1), (3, 2), (5, 4)]:
+            self.assertEqual(position, problem.idToPosition(problem.positionToId(position)))
+
+    def test_food_search(self):
+        state = PacmanGameState(getLayout('trickySearch'))
+        problem = FoodSearchProblem(state)
+
+        actions = search.ucs(problem)
+        self.assertEqual(60, problem.actionsCost(actions))
+
+        problem = FoodSearchProblem(state)
+        actions = search.astar(problem, heuristic.numFood)
+        self.assertEqual(60, problem.actionsCost(actions))
+
+        # Following the actions eats all the food.
+        searchState = problem.startingState()
+        for action in actions:
+            successors = {nextAction: nextState
+                    for (nextState, nextAction, _) in problem.successorStates(searchState)}
+            searchState = successors[action]
+
+        self.assertTrue(problem.isGoal(searchState))
+        self.assertEqual(0, problem.getNumFood(searchState))
+
+        self.assertEqual(_followActions(problem.getPosition(problem.startingState()), actions),
+                problem.getPosition(searchState))
+
+    def test_food_mst(self):
+        state = PacmanGameState(getLayout('trickySearch'))
+
+        problem = FoodSearchProblem(state)
+        search.astar(problem, heuristic.numFood)
+        numFoodExpanded = problem.getExpandedCount()
+
+        problem = FoodSearchProblem(state)
+        actions = search.astar(problem, heuristic.foodMST)
+        self.assertEqual(60, problem.actionsCost(actions))
+        self.assertTrue(problem.getExpandedCount() * 10 < numFoodExpanded)
+        self.assertIn(heuristic.FOOD_MST_KEY, problem.heuristicInfo)
+
+        # Check consistency on everything close to the start.
+        problem = FoodSearchProblem(state)
+        frontier = [problem.startingState()]
+        seen = set(frontier)
+        while (len(frontier) > 0 and len(seen) < 2000):
+            searchState = frontier.pop(0)
+            value = heuristic.foodMST(searchState, problem)
+
+            for (successor, _, cost) in problem.successorStates(searchState):
+                self.assertTrue(value <= cost + heuristic.foodMST(successor, problem))
+
+                if (successor not in seen):
+                    seen.add(successor)
+                    frontier.append(successor)
+
+        # The heuristic never overestimates along the optimal path.
+        searchState = problem.startingState()
+        for (i, action) in enumerate(actions):
+            self.assertTrue(heuristic.foodMST(searchState, problem) <= len(actions) - i)
+
+            successors = {nextAction: nextState
+                    for (nextState, nextAction, _) in problem.successorStates(searchState)}
+            searchState = successors[action]
+
+        self.assertEqual(0, heuristic.foodMST(searchState, problem))
+
+    def test_engine(self):
+        for (name, problemClass, searchHeuristic) in [
+                ('trickySearch', FoodSearchProblem, heuristic.numFood),
+                ('trickySearch', FoodSearchProblem, heuristic.foodMST),
+                ('mediumMaze', PositionSearchProblem, heuristic.manhattan),
+                ('bigMaze', PositionSearchProblem, heuristic.null)]:
+            state = PacmanGameState(getLayout(name))
+
+            expectedProblem = problemClass(state)
+            expected = search.astar(expectedProblem, searchHeuristic)
+
+            problem = problemClass(state)
+            actions = engine.astar(problem, searchHeuristic)
+
+            self.assertEqual(expectedProblem.actionsCost(expected), problem.actionsCost(actions))
+            self.assertTrue(problem.getSearchTime() > 0.0)
+            self.assertTrue(problem.getExpansionRate() > 0.0)
+
+        problem = PositionSearchProblem(PacmanGameState(getLayout('tinyMaze')))
+        self.assertEqual(8, len(engine.ucs(problem)))
+
+    def test_engine_decrease_key(self):
+        problem = WeightedProblem()
+        actions = engine.ucs(problem)
+        self.assertEqual(['startToA', 'aToB', 'bToGoal'], actions)
+        self.assertEqual(4, problem.actionsCost(actions))
+        self.assertEqual(3, problem.getExpandedCount())
+
+        # The goal cannot be reached.
+        problem = WeightedProblem(goal = 'z')
+        self.assertEqual([], engine.ucs(problem))
+
+    def test_routing(self):
+        for name in ['openMaze', 'bigMaze', 'mediumClassic', 'trickySearch']:
+            layout = getLayout(name)
+            state = PacmanGameState(layout)
+            distances = distanceCalculator.computeDistances(layout)
+
+            positions = layout.walls.asList(False)
+            for start in positions[::23]:
+                for goal in positions[::17]:
+                    for searchFunction in [routing.bidirectional, routing.jps]:
+                        problem = PositionSearchProblem(state, start = start, goal = goal)
+                        actions = searchFunction(problem)
+
+                        self.assertEqual(distances[(start, goal)], len(actions))
+                        self.assertEqual(len(actions), problem.actionsCost(actions))
+                        self.assertEqual(goal, _followActions(start, actions))
+
+    def test_routing_unreachable(self):
+        layout = Layout([
+            '%%%%%%%',
+            '%P % .%',
+            '%  %  %',
+            '%%%%%%%',
+        ])
+        state = PacmanGameState(layout)
+
+        for searchFunction in [routing.bidirectional, routing.jps]:
+            problem = PositionSearchProblem(state, start = (1, 2), goal = (5, 1))
+            self.assertEqual([], searchFunction(problem))
+
+            problem = PositionSearchProblem(state, start = (1, 2), goal = (2, 1))
+            self.assertEqual(2, len(searchFunction(problem)))
+
+            problem = PositionSearchProblem(state, start = (1, 2), goal = (1, 2))
+            self.assertEqual([], searchFunction(problem))
+
+    def test_routing_fallback(self):
+        # Problems that are not point to point with unit costs fall back to uniform cost search.
+        state = PacmanGameState(getLayout('mediumMaze'))
+
+        for searchFunction in [routing.bidirectional, routing.jps]:
+            problem = PositionSearchProblem(state, costFn = lambda position: 2 ** position[0])
+            expected = search.ucs(PositionSearchProblem(state,
+                    costFn = lambda position: 2 ** position[0]))
+            self.assertEqual(problem.actionsCost(expected),
+                    problem.actionsCost(searchFunction(problem)))
+
+def _followActions(position, actions):
+    x, y = position
+    for action in actions:
+        dx, dy = Actions.directionToVector(action)
+        x, y = int(x + dx), int(y + dy)
+
+    return (x, y)
+
+class WeightedProblem(SearchProblem):
+    """
+    A small weighted graph where the cheapest way to a state is found after a more expensive one.
+    """
+
+    EDGES = {
+        'start': [('b', 'startToB', 10), ('a', 'startToA', 1)],
+        'a': [('b', 'aToB', 2)],
+        'b': [('goal', 'bToGoal', 1)],
+    }
+
+    def __init__(self, goal = 'goal'):
+        super().__init__()
+        self.goal = goal
+
+    def actionsCost(self, actions):
+        costs = {action: cost for edges in self.EDGES.values() for (_, action, cost) in edges}
+        return sum([costs[action] for action in actions])
+
+    def isGoal(self, state):
+        return state == self.goal
+
+    def startingState(self):
+        return 'start'
+
+    def successorStates(self, state):
+        self._numExpanded += 1
+        return self.EDGES.get(state, [])
+
+if __name__ == '__main__':
+    unittest.main()
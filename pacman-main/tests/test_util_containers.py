@@ -1,5 +1,7 @@
 import unittest
 
+from pacai.core.grid import Grid
+from pacai.util import gridCache
 from pacai.util import priorityQueue
 from pacai.util import queue
 from pacai.util import stack
@@ -52,5 +54,63 @@ class UtilContainersTest(unittest.TestCase):
         for val, pri in reversed(val_list):
             self.assertEqual(val, testPriorityQueue.pop())
 
+    def test_indexed_priority_queue(self):
+        testPriorityQueue = priorityQueue.IndexedPriorityQueue()
+        self.assertTrue(testPriorityQueue.isEmpty())
+
+        # Items do not need to be comparable.
+        items = [frozenset([x]) for x in range(10)]
+        for item in items:
+            self.assertTrue(testPriorityQueue.push(item, 5))
+        self.assertEqual(len(items), len(testPriorityQueue))
+
+        # Raising a priority is ignored, lowering it moves the item.
+        self.assertFalse(testPriorityQueue.push(items[2], 7))
+        self.assertTrue(testPriorityQueue.push(items[8], 1))
+        self.assertTrue(testPriorityQueue.push(items[6], 1))
+        self.assertEqual(len(items), len(testPriorityQueue))
+        self.assertEqual(1, testPriorityQueue.getPriority(items[6]))
+        self.assertIn(items[6], testPriorityQueue)
+
+        # Ties are first in, first out.
+        self.assertEqual((items[8], 1), testPriorityQueue.popWithPriority())
+        self.assertEqual(items[6], testPriorityQueue.pop())
+        self.assertNotIn(items[6], testPriorityQueue)
+
+        for i in [0, 1, 2, 3, 4, 5, 7, 9]:
+            self.assertEqual(items[i], testPriorityQueue.pop())
+        self.assertTrue(testPriorityQueue.isEmpty())
+
+        # Many decreases do not pile up entries.
+        for priority in range(1000, 0, -1):
+            testPriorityQueue.push(items[0], priority)
+        self.assertEqual(1, len(testPriorityQueue))
+        self.assertTrue(len(testPriorityQueue._heap) <= 3)
+        self.assertEqual((items[0], 1), testPriorityQueue.popWithPriority())
+
+    def test_grid_cache(self):
+        cache = gridCache.GridCache(2)
+        grids = [Grid(i + 1, 1) for i in range(3)]
+
+        self.assertEqual(1, cache.get(grids[0], lambda: 1))
+        self.assertEqual(2, cache.get(grids[1], lambda: 2))
+
+        # Cached values are not built again.
+        self.assertEqual(1, cache.get(Grid(1, 1), lambda: 10))
+
+        # Keys are copies, changing a grid does not change the cache.
+        grids[1][0][0] = True
+        self.assertNotIn(grids[1], cache)
+        grids[1][0][0] = False
+
+        # grids[1] is now the least recently used, and is dropped first.
+        self.assertEqual(3, cache.get(grids[2], lambda: 3))
+        self.assertEqual(2, len(cache))
+        self.assertNotIn(grids[1], cache)
+        self.assertIn(grids[0], cache)
+
+        cache.clear()
+        self.assertEqual(0, len(cache))
+
 if __name__ == '__main__':
     unittest.main()